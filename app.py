@@ -1,15 +1,26 @@
 import streamlit as st
-import pandas as pd
-import json
-import re
 import datetime
 import os
-import glob
-import requests
 import time
-from google import genai
-from google.genai import types
-from streamlit_gsheets import GSheetsConnection
+import core
+import jobs
+import minutes_schema
+import resources
+import tracing
+from core import (
+    analyze_script_metadata, detect_speaker_count, prepare_script,
+    build_rag_context, generate_minutes, stream_minutes, render_minutes,
+)
+from rag_index import RagIndex
+from user_store import UserStore
+from auth import Authenticator, LoginThrottled
+from response_cache import ResponseCache, make_key
+from archive import MinutesArchive
+from corpus_cache import get_corpus_cache
+from transcript_compact import compact_transcript
+from transcript_index import TranscriptIndex, build_index
+from slack_delivery import SlackDelivery
+from ratelimit import TokenBucket
 
 # ==========================================
 # 1. 디자인 및 설정 (Modern CSS Style)
@@ -141,20 +152,49 @@ else:
     st.error("🚨 Secrets에 GEMINI_API_KEY 설정이 필요합니다.")
     st.stop()
 
-client = genai.Client(api_key=api_key)
-MODEL_NAME = "gemini-flash-latest"
+STREAM_MINUTES = bool(st.secrets.get("STREAM_MINUTES", True))
 
-conn = st.connection("gsheets", type=GSheetsConnection)
+# 회의록 생성 로직(core)에 클라이언트/설정 주입 (RAG_TOP_K, RAG_TOKEN_BUDGET, LONG_SCRIPT_TOKENS ... 은 secrets 로 변경 가능)
+# Gemini 클라이언트는 첫 호출 때 생성되어 프로세스 전체가 공유 (로그인 화면에서는 google-genai 를 import 하지 않음)
+core.set_client_provider(lambda: resources.gemini_client(api_key))
+core.configure(**{k: st.secrets[k] for k in core.SETTINGS if k in st.secrets})
+# 작업별 모델/대체 모델/제한 시간/헤지 ([MODEL_ROUTES.metadata] model = "...", deadline = 10 ...)
+core.configure_routes(st.secrets.get("MODEL_ROUTES", {}))
+
+# 단계별 계측: 시간/토큰/바이트를 JSONL 로 기록 (TRACE_LOG 를 빈 값으로 두면 메모리에만 보관)
+tracing.configure(path=st.secrets.get("TRACE_LOG", os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "trace.jsonl")))
+tracing.set_user((st.session_state.get('user_info') or {}).get('username'))
 
 # ==========================================
 # 2. Helper 함수 (기존 로직 유지)
 # ==========================================
-def get_users_db():
-    return conn.read(worksheet="Sheet1", ttl=0)
-
-def update_user_db(df):
-    conn.update(worksheet="Sheet1", data=df)
-    st.cache_data.clear()
+@st.cache_resource
+def get_response_cache():
+    # 같은 프롬프트/모델/설정이면 Gemini 를 다시 호출하지 않음 (메모리 LRU + SQLite)
+    db_path = st.secrets.get("RESPONSE_CACHE_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "responses.sqlite3"))
+    return ResponseCache(ttl=int(st.secrets.get("RESPONSE_CACHE_TTL", 7 * 24 * 3600)), db_path=db_path or None)
+
+@st.cache_resource
+def get_minutes_archive():
+    # 생성한 회의록 보관소 (SQLite + 전문 검색). MINUTES_DB 를 빈 값으로 두면 보관하지 않음
+    db_path = st.secrets.get("MINUTES_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "minutes.sqlite3"))
+    return MinutesArchive(db_path) if db_path else None
+
+@st.cache_resource
+def get_user_store():
+    # 모든 세션이 공유하는 사용자 인덱스 (TTL 경과 시 백그라운드 갱신)
+    # 시트 커넥터(gspread/pandas)는 로그인 시도 때 처음 import
+    from streamlit_gsheets import GSheetsConnection
+    conn = st.connection("gsheets", type=GSheetsConnection)
+    return UserStore(conn, worksheet="Sheet1", ttl=int(st.secrets.get("USER_CACHE_TTL", 60)))
+
+@st.cache_resource
+def get_authenticator():
+    # 프로세스 공용: 해시 반복수(PASSWORD_HASH_ITERATIONS), 사용자별 연속 실패 잠금(LOGIN_MAX_FAILURES 회 / LOGIN_LOCKOUT 초)
+    return Authenticator(
+        get_user_store(), iterations=int(st.secrets.get("PASSWORD_HASH_ITERATIONS", 200_000)),
+        max_failures=int(st.secrets.get("LOGIN_MAX_FAILURES", 5)), lockout=int(st.secrets.get("LOGIN_LOCKOUT", 300)),
+    )
 
 def check_login():
     if "logged_in" not in st.session_state:
@@ -184,131 +224,339 @@ def check_login():
 
                 if submitted:
                     try:
-                        df = get_users_db()
-                        user_row = df[
-                            (df['username'].astype(str).str.strip() == username.strip()) & 
-                            (df['password'].astype(str).str.strip() == password.strip())
-                        ]
-                        if not user_row.empty:
+                        user = get_authenticator().login(username, password)
+                        if user:
                             st.session_state.logged_in = True
-                            st.session_state.user_info = user_row.iloc[0].to_dict()
+                            st.session_state.user_info = user
                             st.success(f"환영합니다, {st.session_state.user_info.get('name')}님!")
                             time.sleep(0.5)
                             st.rerun()
                         else:
                             st.error("아이디 또는 비밀번호가 일치하지 않습니다.")
+                    except LoginThrottled as e:
+                        st.error(str(e))
                     except Exception as e:
                         st.error(f"시스템 접속 오류: {e}")
     return False
 
 def load_rag_data(personal_files=None):
-    rag_text = ""
-    file_list = []
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    rag_dir = os.path.join(base_dir, 'rag')
-    if os.path.exists(rag_dir):
-        txt_files = glob.glob(os.path.join(rag_dir, "*.txt"))
-        for file_path in txt_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    rag_text += f"\n\n--- [공용: {os.path.basename(file_path)}] ---\n{content}"
-                    file_list.append(f"[공용] {os.path.basename(file_path)}")
-            except: pass
-    if personal_files:
-        for uploaded_file in personal_files:
-            try:
-                string_data = uploaded_file.getvalue().decode("utf-8")
-                rag_text += f"\n\n--- [개인: {uploaded_file.name}] ---\n{string_data}"
-                file_list.append(f"[개인] {uploaded_file.name}")
-            except: pass
-    return rag_text, file_list
-
+    # 공용 자료는 프로세스 공용 캐시(파일 mtime/size 로 무효화), 개인 자료는 세션별 해시 캐시
+    if not personal_files: return core.load_rag_data()
+    with tracing.span("rag.load", personal=len(personal_files)):
+        upload_cache = st.session_state.setdefault('rag_upload_cache', {})
+        chunks, file_list, index_key = core.load_rag_chunks(personal_files, upload_cache)
+        tracing.annotate(bytes_in=sum(len(c['text'].encode('utf-8')) for c in chunks), chunks=len(chunks))
+        # 업로드에서 빠진 파일은 세션 캐시에서도 제거
+        st.session_state['rag_upload_cache'] = {d: upload_cache[d] for d in index_key[1] if d in upload_cache}
+
+        index_cache = st.session_state.get('rag_index_cache')
+        if not index_cache or index_cache[0] != index_key:
+            index_cache = (index_key, RagIndex(chunks))
+            st.session_state['rag_index_cache'] = index_cache
+        return index_cache[1], file_list
+
+@st.cache_resource
+def get_slack_delivery():
+    # 프로세스 공용: 커넥션 풀 + 백그라운드 전송 워커
+    return SlackDelivery(session=lambda: resources.http_session("slack"))
+
+@tracing.traced("slack.send")
 def send_slack_webhook(url, message):
-    try:
-        requests.post(url, json={"text": message})
-        return True
-    except: return False
-
-def analyze_script_metadata(script_text):
-    prompt = f"""
-    아래 회의 스크립트를 분석하여 JSON 형식으로 정보를 추출하세요.
-    [추출 항목] title, date(YYYY-MM-DD), attendees(List[String])
-    - attendees: 실명 위주, 없으면 '참석자 1' 형태 유지.
-    [SCRIPT] {script_text[:5000]}
-    [OUTPUT JSON] {{"title": "주제", "date": "2024-01-01", "attendees": ["이름1", "참석자 2"]}}
-    """
-    try:
-        response = client.models.generate_content(
-            model=MODEL_NAME, contents=prompt,
-            config=types.GenerateContentConfig(response_mime_type="application/json")
+    # 동기 전송 (타임아웃/재시도/분할 포함). 화면에서는 submit_slack_webhook 사용
+    return get_slack_delivery().send(url, message)
+
+def submit_slack_webhook(url, message):
+    msg_id = get_slack_delivery().submit(url, message)
+    st.session_state.setdefault('slack_sends', []).append(msg_id)
+    return msg_id
+
+SLACK_STATE_LABEL = {
+    "queued": "⏳ 대기 중", "sending": "📤 전송 중", "retrying": "🔁 재시도 대기",
+    "sent": "✅ 전송 완료", "failed": "❌ 전송 실패",
+}
+
+def render_slack_status():
+    sends = st.session_state.get('slack_sends', [])[-5:]
+    statuses = [(i, get_slack_delivery().status(i)) for i in sends]
+    pending = any(s and s['state'] in ("queued", "sending", "retrying") for _, s in statuses)
+
+    # 전송이 끝나지 않은 메시지가 있을 때만 1초마다 이 영역만 갱신
+    @st.fragment(run_every=1 if pending else None)
+    def _panel():
+        for msg_id in sends:
+            s = get_slack_delivery().status(msg_id)
+            if not s: continue
+            part_txt = f" ({s['sent_parts']}/{s['parts']})" if s['parts'] > 1 else ""
+            err_txt = f" · {s['error']}" if s['error'] else ""
+            st.caption(f"#{msg_id} {SLACK_STATE_LABEL.get(s['state'], s['state'])}{part_txt}{err_txt}")
+    _panel()
+
+def is_admin(username, user=None):
+    # secrets ADMIN_USERS (목록 또는 쉼표 구분) 또는 시트의 role 열이 admin 인 사용자
+    admins = st.secrets.get("ADMIN_USERS", [])
+    if isinstance(admins, str): admins = [a.strip() for a in admins.split(",")]
+    return username in admins or str((user or {}).get('role', '')).strip().lower() == "admin"
+
+def render_trace_panel():
+    with st.expander("📊 단계별 계측 (관리자)"):
+        records = tracing.get_tracer().snapshot()
+        if not records:
+            st.caption("아직 기록이 없습니다."); return
+        t_stage, t_user, t_recent = st.tabs(["단계별", "사용자별", "최근"])
+        with t_stage: st.dataframe(tracing.summarize(records, by=("stage",)), hide_index=True)
+        with t_user: st.dataframe(tracing.summarize(records, by=("user", "stage")), hide_index=True)
+        with t_recent: st.dataframe(list(reversed(records[-50:])), hide_index=True)
+        st.caption(f"최근 {len(records)}건 (메모리) · 로그: {tracing.get_tracer().path or '기록 안 함'}")
+        res_txt = " · ".join(f"{r['name']} 생성 {r['builds']}회 ({r['build_ms']}ms)" for r in resources.stats() if r['builds'])
+        if res_txt: st.caption(f"🔌 공용 자원: {res_txt}")
+        u, c = get_user_store().stats(), get_corpus_cache().stats()
+        store_txt = f"👤 사용자 시트 읽기 {u['reads']} · 셀 쓰기 {u['cell_writes']} · 전체 쓰기 {u['sheet_writes']} · 📚 자료 캐시 적중 {c['hits']} / 미스 {c['misses']} / 제거 {c['evictions']}"
+        if get_minutes_archive(): store_txt += f" · 🗂️ 보관 회의록 {get_minutes_archive().stats()['minutes']}건"
+        st.caption(store_txt)
+        st.dataframe(core.get_router().stats(), hide_index=True)
+        st.caption("🧭 작업별 모델 라우팅 (paths: primary / hedge / fallback / failed 횟수, p95_s: 기본 모델 최근 지연)")
+        a = get_authenticator().stats()
+        st.caption(f"🔐 로그인 성공 {a['logins']} · 실패 {a['failed']} · 잠금 거절 {a['throttled']} (현재 잠금 {a['locked_users']}명) · 해시 전환 {a['migrated']} (실패 {a['migrate_failed']})")
+
+# ------------------------------------------
+# 백그라운드 작업 (분석 / 생성)
+# ------------------------------------------
+@st.cache_resource
+def get_job_queue():
+    # 프로세스 공용 워커 풀: 동시에 실행되는 생성 작업 수를 JOB_WORKERS 로 제한
+    # 메타데이터 분석은 전용 워커(ANALYSIS_WORKERS)에서 실행 → 긴 생성 작업 뒤에서 기다리지 않음
+    return jobs.JobQueue(
+        workers=int(st.secrets.get("JOB_WORKERS", 2)), max_queued=int(st.secrets.get("JOB_MAX_QUEUED", 50)),
+        lanes={'analysis': int(st.secrets.get("ANALYSIS_WORKERS", 1))},
+    )
+
+@st.cache_resource
+def get_rate_limiter():
+    # 모든 세션이 공유하는 Gemini 호출 한도 (분당 GEMINI_RPM, 순간 GEMINI_BURST)
+    burst = st.secrets.get("GEMINI_BURST")
+    return TokenBucket.per_minute(float(st.secrets.get("GEMINI_RPM", 60)), int(burst) if burst else None)
+
+def analysis_job(source):
+    # 워커 스레드에서 실행 (st.* 사용 금지). source: 붙여넣은 스크립트 또는 업로드 파일 색인(TranscriptIndex)
+    # 화자 수/화자별 발화 수는 본문을 다시 훑지 않고 색인에서 읽는다
+    jobs.report(phase="내용 분석 중")
+    index = source if isinstance(source, TranscriptIndex) else TranscriptIndex.from_text(source)
+    script = index.text if index is source else source
+    return {
+        'meta': analyze_script_metadata(script), 'speakers': detect_speaker_count(source),
+        'speaker_turns': {k: n for k, n in index.speaker_turns().items() if isinstance(k, int)},
+    }
+
+def generation_job(info, script, rag_index, custom_prompt, stream, mapping=None, archive=None):
+    # 워커 스레드에서 실행 (st.* 사용 금지). 스트리밍이면 받은 만큼 partial 로 남겨 화면에서 미리보기
+    # 결과는 화자/제목/날짜 자리표시자가 든 템플릿 → 화면에서 현재 매칭/기본 정보로 채운다 (render_minutes)
+    # archive 가 있으면 완료 즉시 보관 (화면을 닫아도 기록이 남음)
+    started, trace_mark = time.perf_counter(), time.time()
+    # 전처리: 화자 표기 통일([[S1]]), 추임새/타임스탬프/중복 제거, 연속 발화 병합
+    # 긴 회의는 발화 경계로 나눈 구간을 병렬 요약(map) 후 최종 회의록 1회 생성(reduce)
+    jobs.report(phase="스크립트 정리 중")
+    prepared, compact_stats = prepare_script(script, alias=core.SPEAKER_ALIAS)
+    rag_text = build_rag_context(rag_index, f"{info['title']}\n{prepared}")
+    gen_args = (info, prepared, "", rag_text, custom_prompt)
+    jobs.report(phase="AI가 회의록을 작성하고 있습니다", windows=compact_stats['windows'])
+    ttft = None
+    # 구조화 모드: 모델은 JSON 만 보내고 문서/슬랙 메시지는 로컬에서 만든다 (스트리밍 중에도 받은 만큼 변환)
+    structured = core.structured_mode(custom_prompt)
+    if stream:
+        raw = ""
+        for piece in stream_minutes(*gen_args):
+            if ttft is None: ttft = time.perf_counter() - started
+            raw += piece
+            jobs.report(partial=core.minutes_template(raw, structured, partial=True))
+    else:
+        raw = generate_minutes(*gen_args)
+    res = core.minutes_template(raw, structured)
+    failed = res.startswith("Error:") or core.ERROR_MARK in res
+    data = minutes_schema.parse_minutes(raw) if structured and not failed else None
+    user = tracing.current_user()
+    stats = {
+        'ttft': ttft, 'total': time.perf_counter() - started,
+        'tokens_before': compact_stats['before'], 'tokens_after': compact_stats['after'],
+        'windows': compact_stats['windows'],
+        # 이번 실행에서 기록된 단계별 계측
+        'stages': tracing.summarize([
+            r for r in tracing.get_tracer().snapshot() if r['ts'] >= trace_mark and r.get('user') == user
+        ]),
+    }
+    archive_id = None
+    if archive is not None and not failed:
+        doc, slack = render_minutes(res, info, mapping)
+        archive_id = archive.save(
+            user, info, res, doc, slack, script=script, mapping=mapping, prompt=custom_prompt, data=core.render_data(data, mapping),
+            prompt_key=make_key(core.get_router().route("minutes")['model'], core.build_minutes_prompt(*gen_args), core.minutes_config(structured)),
+            model=core.route_model("minutes"), stats={k: v for k, v in stats.items() if k != 'stages'},
         )
-        return json.loads(response.text.strip())
-    except: return {"title": "", "date": str(datetime.date.today()), "attendees": []}
-
-def detect_speaker_count(script):
-    patterns = re.findall(r'참석자\s?(\d+)', script)
-    if patterns: return min(max(map(int, patterns)), 30)
-    return 0
-
-def generate_minutes(info, script, mapping, rag_data="", custom_prompt=""):
-    today = datetime.date.today().strftime("%Y-%m-%d")
-    attendees_str = ", ".join(info['attendees'])
-    output_format = """
-# [OUTPUT FORMAT] (Markdown)
-# 📑 {info['title']}
-> **📅 일시:** {info['date']}    
-> **👥 참석자:** {attendees_str}    
-> **🏢 작성:** AI Assistant
----
-### 1. 요약
-* [내용]
-### 2. 주요 결정사항
-* [내용]
-### 3. Action Item
-| 담당 | 할일 | 기한 |
-| :--- | :--- | :--- |
-| [이름] | [내용] | [날짜] |
----
-# [SLACK MESSAGE]
-🚨 **[공유] {info['title']}**
-> 요약: [내용]
-**✅ 결정:** [내용]
-    """
-    if custom_prompt and len(custom_prompt) > 20: output_format = custom_prompt
-    full_prompt = f"""
-# [ROLE] 전문 회의록 비서. RAG 지식 기반 작성.
-# [RAG] {rag_data}
-# [INPUT] 1. 작성일: {today} / 2. 정보: {info['title']} / {info['date']} / {attendees_str} / 3. 매칭: {mapping} / 4. 스크립트: {script}
-# [RULES] 1. Action Item 담당자 뒤에 팀명 추측 금지. 2. 할루시네이션 금지.
-{output_format}
-    """
+    return {'template': res, 'data': data, 'stats': stats, 'archive_id': archive_id, 'archived_doc': doc if archive_id else None}
+
+def submit_job(key, fn, *args, kind="job"):
     try:
-        response = client.models.generate_content(
-            model=MODEL_NAME, contents=full_prompt,
-            config=types.GenerateContentConfig(temperature=0.2)
-        )
-        return response.text
-    except Exception as e: return f"Error: {e}"
+        st.session_state[key] = get_job_queue().submit(fn, *args, kind=kind)
+    except jobs.QueueFull:
+        st.error("⚠️ 지금 요청이 많습니다. 잠시 후 다시 시도해주세요.")
+
+def job_active(key):
+    s = get_job_queue().status(st.session_state[key]) if key in st.session_state else None
+    return bool(s and s['state'] in jobs.ACTIVE_STATES)
+
+def render_job(key, on_done, preview=None):
+    """session_state[key] 의 작업 상태를 1초마다 갱신 (화면 재실행과 무관하게 작업은 계속)
+    끝나면 on_done(result) 후 전체 화면을 다시 그린다.
+    """
+    if f"{key}_error" in st.session_state: st.error(st.session_state.pop(f"{key}_error"))
+    if key not in st.session_state: return
+
+    @st.fragment(run_every=1)
+    def _poll():
+        s = get_job_queue().status(st.session_state.get(key))
+        if s is None or s['state'] not in jobs.ACTIVE_STATES:
+            st.session_state.pop(key, None)
+            if s is None:
+                # 서버 재시작 등으로 작업 기록이 사라진 경우
+                st.session_state[f"{key}_error"] = "작업 정보를 찾을 수 없습니다. 다시 시도해주세요."
+            elif s['state'] == "failed":
+                st.session_state[f"{key}_error"] = f"작업 실패: {s['error']}"
+            else:
+                on_done(s['result'], s)
+            st.rerun()
+        if s['state'] == "queued":
+            q = get_job_queue().stats()
+            st.info(f"⏳ 대기열 {s['position']}번째 (실행 중 {q['running']}건 / 대기 {q['queued']}건)")
+        else:
+            st.info(f"⚙️ {s['phase'] or '처리 중'}... ({time.time() - s['started']:.0f}초)")
+        if get_rate_limiter().available() < 1:
+            st.caption("⏱️ Gemini 호출 한도에 도달해 순서대로 처리 중입니다.")
+        if preview and s.get('partial'): preview(s['partial'])
+    _poll()
+
+# ------------------------------------------
+# 녹취 파일 (txt / srt / vtt)
+# ------------------------------------------
+TRANSCRIPT_PAGE_SIZE = 50
+
+def load_transcript_index(uploaded):
+    # 업로드 파일은 한 번만 색인해 session_state 에 색인만 보관 (원문을 위젯 값으로 브라우저와 주고받지 않음)
+    if uploaded is None:
+        st.session_state.pop('transcript_index', None)
+        return None
+    cached = st.session_state.get('transcript_index')
+    if cached and cached[0] == uploaded.file_id: return cached[1]
+    with st.spinner("녹취 파일을 읽는 중..."):
+        uploaded.seek(0)
+        index = build_index(uploaded, name=uploaded.name)
+    st.session_state['transcript_index'] = (uploaded.file_id, index)
+    st.session_state['transcript_page'] = 1
+    return index
+
+def render_transcript_preview(index):
+    s = index.stats()
+    st.caption(f"📄 {s['name']} · {s['format'].upper()} · 발화 {s['turns']:,}개 · 화자 {s['speakers']}명 · {s['chars']:,}자")
+    if not len(index):
+        st.warning("읽을 수 있는 발화가 없습니다."); return
+
+    # 페이지 이동은 미리보기만 다시 그린다
+    @st.fragment
+    def _page():
+        pages = (len(index) + TRANSCRIPT_PAGE_SIZE - 1) // TRANSCRIPT_PAGE_SIZE
+        c_page, c_info = st.columns([1, 3])
+        page = c_page.number_input("페이지", min_value=1, max_value=pages, key="transcript_page", label_visibility="collapsed")
+        c_info.caption(f"{page} / {pages} 페이지 (페이지당 {TRANSCRIPT_PAGE_SIZE}개 발화)")
+        st.dataframe(index.page(page, TRANSCRIPT_PAGE_SIZE), hide_index=True, use_container_width=True, height=320, column_config={
+            'no': st.column_config.NumberColumn("#", width="small"), 'time': st.column_config.TextColumn("시간", width="small"),
+            'speaker': st.column_config.TextColumn("화자", width="small"), 'text': st.column_config.TextColumn("내용", width="large"),
+        })
+    _page()
+
+# ------------------------------------------
+# 회의록 보관소 (지난 회의록 목록 / 검색 / 불러오기)
+# ------------------------------------------
+HISTORY_PAGE_SIZE = 5
+
+def open_archived(minutes_id, username):
+    """보관된 회의록을 결과 카드와 기본 정보/화자 매칭 화면으로 불러오기 (모델 호출 없음)"""
+    rec = get_minutes_archive().get(minutes_id, username)
+    if rec is None:
+        st.session_state['history_error'] = "회의록을 찾을 수 없습니다."
+        return
+    attendees, mapping = rec['attendees'], rec['mapping']
+    st.session_state['meta'] = {'title': rec['title'], 'date': rec['meeting_date'], 'attendees': attendees, 'source': "archive"}
+    # 기존 화자 행과 위젯 키가 겹치지 않도록 새 id 로 만든다
+    base, cnt = st.session_state.get('next_id', 0), max(len(attendees), max(mapping, default=0), 2)
+    st.session_state.speaker_rows = [
+        {'id': base + i, 'manual_default': bool(mapping.get(i + 1)) and mapping.get(i + 1) not in attendees, 'name': mapping.get(i + 1, '')}
+        for i in range(cnt)
+    ]
+    st.session_state.next_id = base + cnt
+    st.session_state['res_template'] = rec['template']
+    st.session_state['archive_id'], st.session_state['archived_doc'] = rec['id'], rec['doc']
+    st.session_state.pop('gen_stats', None)
+    st.session_state.pop('res_data', None)
+
+def render_history(username):
+    archive = get_minutes_archive()
+    if archive is None: return
+
+    # 검색/페이지 이동은 이 영역만 다시 그린다
+    @st.fragment
+    def _history():
+        if 'history_error' in st.session_state: st.warning(st.session_state.pop('history_error'))
+        query = st.text_input("검색", key="history_query", placeholder="제목 · 내용 · Action Item 검색 (예: 계약 검토)",
+                              label_visibility="collapsed", on_change=lambda: st.session_state.update(history_page=1))
+        page = st.session_state.get('history_page', 1)
+        items, total = archive.search(username, query, page=page, per_page=HISTORY_PAGE_SIZE)
+        if not total:
+            st.caption("검색 결과가 없습니다." if query.strip() else "아직 보관된 회의록이 없습니다. 회의록을 생성하면 자동으로 저장됩니다.")
+            return
+        for rec in items:
+            c_txt, c_open, c_del = st.columns([6, 1, 0.5])
+            created = datetime.datetime.fromtimestamp(rec['created']).strftime("%Y-%m-%d %H:%M")
+            c_txt.markdown(f"**{rec['title'] or '(제목 없음)'}** · {rec['meeting_date']}")
+            c_txt.caption(f"{rec['snippet']}  \n🗓️ {created} 생성 · 👥 {', '.join(rec['attendees'])} · ✅ Action Item {len(rec['actions'])}건")
+            if c_open.button("열기", key=f"history_open_{rec['id']}"):
+                open_archived(rec['id'], username)
+                st.rerun()
+            if c_del.button("🗑", key=f"history_del_{rec['id']}"):
+                archive.delete(rec['id'], username)
+                st.rerun(scope="fragment")
+        pages = (total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+        c_prev, c_info, c_next = st.columns([1, 2, 1])
+        if c_prev.button("◀ 이전", disabled=page <= 1, key="history_prev"):
+            st.session_state['history_page'] = page - 1; st.rerun(scope="fragment")
+        c_info.caption(f"{page} / {pages} 페이지 · 총 {total}건")
+        if c_next.button("다음 ▶", disabled=page >= pages, key="history_next"):
+            st.session_state['history_page'] = page + 1; st.rerun(scope="fragment")
+
+    with st.expander("🗂️ 지난 회의록"):
+        _history()
 
 # ==========================================
 # 3. 앱 실행 로직
 # ==========================================
 if not check_login(): st.stop()
+core.set_response_cache(get_response_cache())
+core.set_rate_limiter(get_rate_limiter(), on_wait=lambda wait: jobs.report(phase=f"Gemini 호출 한도 대기 ({wait:.0f}초)"))
 
 # 사용자 정보 로드
 user_data = st.session_state.user_info
 current_user = user_data['username']
 user_name = user_data['name']
+tracing.set_user(current_user)
 
 try:
-    df_fresh = get_users_db()
-    my_row = df_fresh[df_fresh['username'] == current_user].iloc[0]
-    saved_webhook = str(my_row.get('webhook', '')) if pd.notna(my_row.get('webhook')) else ""
-    active_prompt = str(my_row.get('prompt', '')) if pd.notna(my_row.get('prompt')) else ""
-    slot1_val = str(my_row.get('prompt_slot1', '')) if pd.notna(my_row.get('prompt_slot1')) else ""
-    slot2_val = str(my_row.get('prompt_slot2', '')) if pd.notna(my_row.get('prompt_slot2')) else ""
-except:
+    my_row = get_user_store().get(current_user) or {}
+    saved_webhook = str(my_row.get('webhook', ''))
+    active_prompt = str(my_row.get('prompt', ''))
+    slot1_val = str(my_row.get('prompt_slot1', ''))
+    slot2_val = str(my_row.get('prompt_slot2', ''))
+except Exception as e:
+    # 시트 조회 실패: 빈 설정으로 계속하고 원인은 계측 로그에 남긴다
+    tracing.get_tracer().emit({'ts': time.time(), 'stage': "users.profile", 'user': current_user, 'ms': 0.0,
+                               'error': f"{type(e).__name__}: {e}"})
+    st.warning("저장된 설정을 불러오지 못했습니다. 잠시 후 새로고침해주세요.")
     saved_webhook, active_prompt, slot1_val, slot2_val = "", "", "", ""
 
 if 'speaker_rows' not in st.session_state:
@@ -349,29 +597,16 @@ with st.sidebar:
             
             c1, c2 = st.columns(2)
             if c1.button("💾 1 저장"):
-                df = get_users_db()
-                idx = df[df['username'] == current_user].index
-                if not idx.empty:
-                    df.at[idx[0], 'prompt_slot1'] = new_prompt
-                    update_user_db(df)
+                if get_user_store().update(current_user, prompt_slot1=new_prompt):
                     st.toast("저장완료 (슬롯1)"); time.sleep(1); st.rerun()
             if c2.button("💾 2 저장"):
-                df = get_users_db()
-                idx = df[df['username'] == current_user].index
-                if not idx.empty:
-                    df.at[idx[0], 'prompt_slot2'] = new_prompt
-                    update_user_db(df)
+                if get_user_store().update(current_user, prompt_slot2=new_prompt):
                     st.toast("저장완료 (슬롯2)"); time.sleep(1); st.rerun()
 
         st.markdown("<br>", unsafe_allow_html=True)
         if st.button("✅ 전체 설정 저장", type="primary", use_container_width=True):
             with st.spinner("저장 중..."):
-                df = get_users_db()
-                idx = df[df['username'] == current_user].index
-                if not idx.empty:
-                    df.at[idx[0], 'webhook'] = new_webhook
-                    df.at[idx[0], 'prompt'] = new_prompt
-                    update_user_db(df)
+                if get_user_store().update(current_user, webhook=new_webhook, prompt=new_prompt):
                     st.session_state.editor_prompt = new_prompt
                     st.session_state.user_info['webhook'] = new_webhook
                     st.session_state.user_info['prompt'] = new_prompt
@@ -390,20 +625,23 @@ with st.sidebar:
             elif new_pw[0].isdigit():
                 st.error("⚠️ 비밀번호는 숫자로 시작할 수 없습니다. (영문자로 시작해주세요)")
             else:
-                df = get_users_db()
-                user_row = df[(df['username'] == current_user) & (df['password'].astype(str) == curr_pw)]
-                if not user_row.empty:
-                    idx = user_row.index[0]
-                    df.at[idx, 'password'] = new_pw 
-                    update_user_db(df)
-                    st.success("변경완료. 재로그인 필요."); st.session_state.logged_in = False; time.sleep(1); st.rerun()
-                else: st.error("현재 비밀번호가 틀렸습니다.")
+                try:
+                    if get_authenticator().change_password(current_user, curr_pw, new_pw):
+                        st.success("변경완료. 재로그인 필요."); st.session_state.logged_in = False; time.sleep(1); st.rerun()
+                    else: st.error("현재 비밀번호가 틀렸습니다.")
+                except LoginThrottled as e: st.error(str(e))
+                except Exception as e: st.error(f"비밀번호 변경 실패: {e}")
 
     st.markdown("---")
     st.markdown("**📂 참고 자료 (휘발성)**")
     personal_files = st.file_uploader("파일 업로드", type=["txt"], accept_multiple_files=True, label_visibility="collapsed")
-    rag_text, rag_file_names = load_rag_data(personal_files)
+    rag_index, rag_file_names = load_rag_data(personal_files)
     if rag_file_names: st.caption(f"{len(rag_file_names)}개 참조 중")
+    cache_stats = get_response_cache().stats()
+    if cache_stats['mem_hits'] + cache_stats['disk_hits'] + cache_stats['misses']:
+        st.caption(f"♻️ 응답 캐시 적중률 {cache_stats['hit_rate']:.0%} (적중 {cache_stats['mem_hits'] + cache_stats['disk_hits']} / 미스 {cache_stats['misses']})")
+
+    if is_admin(current_user, user_data): render_trace_panel()
 
     if st.button("로그아웃"): st.session_state.logged_in = False; st.rerun()
 
@@ -418,25 +656,56 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+render_history(current_user)
+
 # STEP 1. 입력 (Card)
 with st.container(border=True):
     st.subheader("1. 📝 스크립트 입력")
-    script_text = st.text_area("회의 녹취록을 여기에 붙여넣으세요.", height=200, key="input_script", placeholder="참석자 1: 안녕하세요...\n참석자 2: 오늘 회의는...")
+    tab_paste, tab_file = st.tabs(["✍️ 직접 입력", "📁 파일 업로드 (txt / srt / vtt)"])
+    with tab_file:
+        transcript_file = st.file_uploader("녹취 파일", type=["txt", "srt", "vtt"], key="transcript_file", label_visibility="collapsed")
+        transcript_index = load_transcript_index(transcript_file)
+        if transcript_index is not None: render_transcript_preview(transcript_index)
+    with tab_paste:
+        if transcript_index is not None: st.info(f"📁 업로드한 파일({transcript_index.name})을 사용 중입니다. 파일을 지우면 아래 입력 내용을 사용합니다.")
+        pasted_text = st.text_area("회의 녹취록을 여기에 붙여넣으세요.", height=200, key="input_script", placeholder="참석자 1: 안녕하세요...\n참석자 2: 오늘 회의는...")
+    script_text = transcript_index.text if transcript_index is not None else pasted_text
     
     col_empty, col_btn = st.columns([4, 1])
+    if script_text.strip():
+        # 압축 전/후 토큰 수 (같은 스크립트면 다시 계산하지 않음)
+        digest = hash(script_text)
+        if st.session_state.get('compact_preview', (None,))[0] != digest:
+            st.session_state['compact_preview'] = (digest, compact_transcript(script_text)[1])
+        cs = st.session_state['compact_preview'][1]
+        col_empty.caption(f"🧮 예상 입력 토큰 {cs['before']:,} → 압축 후 {cs['after']:,} ({cs['turns']}개 발화)")
+        # 같은 스크립트로 만든 회의록이 있으면 다시 생성하지 않고 불러올 수 있게
+        prev = get_minutes_archive().find_by_script(current_user, script_text) if get_minutes_archive() else None
+        if prev and st.session_state.get('archive_id') != prev['id']:
+            created = datetime.datetime.fromtimestamp(prev['created']).strftime("%Y-%m-%d %H:%M")
+            col_empty.info(f"📚 이 스크립트로 {created}에 만든 회의록이 있습니다: **{prev['title'] or '(제목 없음)'}**")
+            col_empty.button("📂 보관된 회의록 불러오기", on_click=open_archived, args=(prev['id'], current_user))
     with col_btn:
-        if st.button("🔍 1차 분석", type="primary", use_container_width=True):
+        if st.button("🔍 1차 분석", type="primary", use_container_width=True, disabled=job_active('analysis_job')):
             if not script_text.strip():
                 st.warning("내용을 입력해주세요.")
             else:
-                with st.spinner("내용 분석 중..."):
-                    meta = analyze_script_metadata(script_text)
-                    st.session_state['meta'] = meta
-                    extracted = meta.get('attendees', [])
-                    cnt = len(extracted) if len(extracted) > 0 else max(detect_speaker_count(script_text), 2)
-                    st.session_state.speaker_rows = [{'id': i, 'manual_default': False} for i in range(cnt)]
-                    st.session_state.next_id = cnt
-                    st.success("분석 완료")
+                submit_job('analysis_job', analysis_job, transcript_index or script_text, kind="analysis")
+        if 'analysis_note' in st.session_state: st.success(st.session_state.pop('analysis_note'))
+
+    def on_analysis_done(result, job):
+        meta = result['meta']
+        st.session_state['meta'] = meta
+        extracted = meta.get('attendees', [])
+        cnt = len(extracted) if len(extracted) > 0 else max(result['speakers'], 2)
+        st.session_state.speaker_rows = [{'id': i, 'manual_default': False} for i in range(cnt)]
+        st.session_state.next_id = cnt
+        st.session_state['speaker_turns'] = result.get('speaker_turns', {})
+        if meta.get('error'):
+            st.session_state['analysis_note'] = f"분석 완료 (AI 분석 실패로 로컬 추출 결과 사용: {meta['error']})"
+        else:
+            st.session_state['analysis_note'] = "분석 완료" + (" (로컬 추출, AI 호출 생략)" if meta.get('source') == "local" else "")
+    render_job('analysis_job', on_analysis_done)
 
 # STEP 2 & 3. 정보 확인 및 매칭
 if 'meta' in st.session_state:
@@ -469,7 +738,7 @@ if 'meta' in st.session_state:
             
             if 'final_info' in st.session_state:
                 opts = st.session_state['final_info']['attendees'] + ["직접 입력"]
-                mapping_list = []
+                mapping_dict = {}
                 
                 # 스크롤 영역
                 with st.container(height=260):
@@ -477,44 +746,94 @@ if 'meta' in st.session_state:
                         rid = row['id']
                         c_label, c_sel, c_inp, c_del = st.columns([0.8, 1.3, 1.3, 0.4])
                         
-                        c_label.markdown(f"<div style='padding-top:12px; font-weight:600; font-size:14px; color:#475569;'>참석자 {i+1}</div>", unsafe_allow_html=True)
+                        turns = st.session_state.get('speaker_turns', {}).get(i + 1)
+                        turns_txt = f"<br><span style='font-weight:400; font-size:12px;'>발화 {turns}회</span>" if turns else ""
+                        c_label.markdown(f"<div style='padding-top:12px; font-weight:600; font-size:14px; color:#475569;'>참석자 {i+1}{turns_txt}</div>", unsafe_allow_html=True)
                         
                         d_idx = len(opts)-1 if row['manual_default'] else (i if i < len(opts)-1 else 0)
+                        if row.get('name') in opts[:-1]: d_idx = opts.index(row['name'])   # 보관된 회의록의 매칭
                         
                         sel = c_sel.selectbox("label", opts, index=d_idx, label_visibility="collapsed", key=f"s_{rid}")
                         real = sel
                         if sel == "직접 입력":
-                            real = c_inp.text_input("label", label_visibility="collapsed", key=f"t_{rid}", placeholder="이름 입력")
+                            real = c_inp.text_input("label", value=row.get('name', ''), label_visibility="collapsed", key=f"t_{rid}", placeholder="이름 입력")
                         
-                        if real: mapping_list.append(f"- 참석자 {i+1} → {real}")
+                        if real:
+                            mapping_dict[i+1] = real
                         
                         if c_del.button("✕", key=f"d_{rid}"):
                             remove_speaker_row(rid)
                             st.rerun()
                 
+                st.session_state['final_mapping'] = mapping_dict
+
                 st.markdown("<div style='height:10px;'></div>", unsafe_allow_html=True)
                 if st.button("➕ 화자 추가 (직접 입력)", on_click=add_speaker_row, use_container_width=True): pass
 
     # STEP 4. 생성 버튼
     st.markdown("<br>", unsafe_allow_html=True)
-    if st.button("✨ AI 회의록 생성 시작", type="primary", use_container_width=True):
-        with st.spinner("AI가 회의록을 작성하고 있습니다..."):
-            res = generate_minutes(
-                st.session_state['final_info'], script_text, "\n".join(mapping_list), 
-                rag_text, saved_prompt
-            )
-            
-            if "# [SLACK MESSAGE]" in res: d, s = res.split("# [SLACK MESSAGE]")
-            else: d, s = res, "파싱 실패 (또는 슬랙 메시지 없음)"
-            
-            st.session_state['res_doc'] = d.strip()
-            st.session_state['res_slack'] = s.strip()
+    if st.button("✨ AI 회의록 생성 시작", type="primary", use_container_width=True, disabled=job_active('gen_job')):
+        # 백그라운드 작업으로 실행: 화면을 다시 그리거나 이동해도 생성은 계속되고, 완료 후 결과 카드에 표시
+        submit_job(
+            'gen_job', generation_job, dict(st.session_state['final_info']), script_text,
+            rag_index, active_prompt, STREAM_MINUTES, dict(st.session_state.get('final_mapping') or {}),
+            get_minutes_archive(), kind="minutes",
+        )
+
+    def on_generation_done(result, job):
+        st.session_state['res_template'] = result['template']
+        st.session_state['res_data'] = result['data']       # 자리표시자 그대로 (보관본 갱신 때 현재 매칭으로 채움)
+        st.session_state['gen_stats'] = dict(result['stats'], queued=job['started'] - job['created'])
+        st.session_state['archive_id'] = result.get('archive_id')
+        st.session_state['archived_doc'] = result.get('archived_doc')
+
+    def preview_minutes(partial):
+        # 스트리밍: 도착하는 대로 미리보기 갱신, 슬랙 마커가 나오면 슬랙 탭도 바로 채움
+        # 구조화 모드에서는 slack_summary 가 스키마의 마지막 항목이라 슬랙 탭은 문서 본문이 다 온 뒤부터 채워진다
+        with st.container(border=True):
+            st.subheader("4. ⏳ 작성 중...")
+            t1, t2 = st.tabs(["📄 회의록 문서", "💬 슬랙 메시지"])
+            d, s = render_minutes(partial, st.session_state['final_info'], st.session_state.get('final_mapping'), partial=True)
+            t1.markdown(d)
+            if s: t2.text(s)
+    render_job('gen_job', on_generation_done, preview_minutes)
 
 # STEP 5. 결과 확인 (Card)
+render_ms = None
+if 'res_template' in st.session_state:
+    # 화자 매칭/기본 정보가 바뀌면 모델 호출 없이 템플릿만 다시 채운다
+    render_started = time.perf_counter()
+    st.session_state['res_doc'], st.session_state['res_slack'] = render_minutes(
+        st.session_state['res_template'], st.session_state.get('final_info', {}), st.session_state.get('final_mapping'),
+    )
+    render_ms = (time.perf_counter() - render_started) * 1000
+    # 매칭/기본 정보 수정도 보관본에 반영 (바뀐 경우에만 저장)
+    if st.session_state.get('archive_id') and get_minutes_archive() and st.session_state['res_doc'] != st.session_state.get('archived_doc'):
+        get_minutes_archive().update(
+            st.session_state['archive_id'], current_user, st.session_state.get('final_info', {}),
+            st.session_state['res_doc'], st.session_state['res_slack'], st.session_state.get('final_mapping'),
+            data=core.render_data(st.session_state.get('res_data'), st.session_state.get('final_mapping')),
+        )
+        st.session_state['archived_doc'] = st.session_state['res_doc']
+
 if 'res_doc' in st.session_state:
     st.markdown("<br>", unsafe_allow_html=True)
     with st.container(border=True):
         st.subheader("4. ✅ 생성 결과")
+        stats = st.session_state.get('gen_stats')
+        if stats:
+            ttft_txt = f"첫 토큰 {stats['ttft']:.1f}초 · " if stats.get('ttft') is not None else ""
+            tok_txt = f" · 스크립트 토큰 {stats['tokens_before']:,} → {stats['tokens_after']:,}" if 'tokens_before' in stats else ""
+            if stats.get('windows'): tok_txt += f" · {stats['windows']}개 구간 병렬 요약"
+            queued_txt = f"대기 {stats['queued']:.1f}초 · " if stats.get('queued', 0) >= 0.5 else ""
+            st.caption(f"⏱️ {queued_txt}{ttft_txt}전체 {stats['total']:.1f}초{tok_txt}")
+            if render_ms is not None: st.caption(f"🔁 화자 매칭·기본 정보를 고치면 AI 재호출 없이 바로 반영됩니다 (재구성 {render_ms:.1f}ms)")
+            if stats.get('stages'):
+                st.caption(" · ".join(
+                    f"{r['stage']} {r['mean_ms'] * r['n'] / 1000:.2f}초"
+                    + (f" (입력 {r['prompt_tokens']:,} / 출력 {r['response_tokens']:,} 토큰)" if r['prompt_tokens'] else "")
+                    for r in stats['stages']
+                ))
         
         t1, t2 = st.tabs(["📄 회의록 문서", "💬 슬랙 메시지"])
         
@@ -531,8 +850,8 @@ if 'res_doc' in st.session_state:
             st.text_area("slack_msg", value=st.session_state['res_slack'], height=200, label_visibility="collapsed")
             if saved_webhook:
                 if st.button("🚀 저장된 Webhook으로 전송", type="primary"):
-                    if send_slack_webhook(saved_webhook, st.session_state['res_slack']):
-                        st.success("전송되었습니다!")
-                    else: st.error("전송 실패")
+                    submit_slack_webhook(saved_webhook, st.session_state['res_slack'])
+                    st.toast("전송을 시작했습니다.")
+                render_slack_status()
             else:
                 st.warning("설정 탭에서 Webhook URL을 저장하면 바로 전송 가능합니다.")
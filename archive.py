@@ -0,0 +1,208 @@
+"""
+회의록 보관소 (SQLite + FTS5 전문 검색)
+- 생성된 회의록을 메타데이터(제목/일시/참석자/화자 매칭), 템플릿, 스크립트 해시, 프롬프트 키, 모델과 함께 저장
+  (구조화 모드면 모델이 준 JSON(data)도 그대로 보관 → Action Item 등을 다시 파싱하지 않고 재사용)
+- 문서 본문 / Action Item 전문 검색 (FTS5 trigram: 한글 부분 문자열도 검색, 3자 미만 검색어는 LIKE)
+- 사용자별 목록(페이지 단위), 같은 스크립트로 만든 회의록 조회 → 다시 생성하지 않고 불러오기
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+ACTION_HEADER_RE = re.compile(r'^#{1,6}\s*.*action\s*item', re.IGNORECASE)
+TABLE_SEP_RE = re.compile(r'^\|?\s*:?-{2,}')
+
+
+def script_hash(script):
+    return hashlib.sha256(script.strip().encode('utf-8')).hexdigest()
+
+def extract_action_items(doc):
+    """문서의 Action Item 표 → [{'owner', 'task', 'due'}]"""
+    items, in_section = [], False
+    for line in doc.splitlines():
+        s = line.strip()
+        if s.startswith("#"):
+            in_section = bool(ACTION_HEADER_RE.match(s))
+            continue
+        if not in_section or not s.startswith("|") or TABLE_SEP_RE.match(s): continue
+        cells = [c.strip() for c in s.strip("|").split("|")]
+        if cells[:2] == ["담당", "할일"]: continue      # 헤더 행
+        cells += [""] * (3 - len(cells))
+        items.append({'owner': cells[0], 'task': cells[1], 'due': cells[2]})
+    return items
+
+def _actions_text(items):
+    return "\n".join(" ".join(x for x in (a['owner'], a['task'], a['due']) if x) for a in items)
+
+
+class MinutesArchive:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.trigram = True
+        self._init_db()
+
+    @contextmanager
+    def _db(self):
+        con = sqlite3.connect(self.db_path, timeout=5)
+        con.row_factory = sqlite3.Row
+        try:
+            con.execute("PRAGMA journal_mode=WAL")
+            with con: yield con
+        finally:
+            con.close()
+
+    def _init_db(self):
+        with self._db() as con:
+            con.execute("""CREATE TABLE IF NOT EXISTS minutes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT NOT NULL, created REAL NOT NULL, updated REAL NOT NULL,
+                title TEXT, meeting_date TEXT, attendees TEXT, mapping TEXT,
+                template TEXT, doc TEXT, slack TEXT, actions TEXT,
+                script_hash TEXT, prompt TEXT, prompt_key TEXT, model TEXT, stats TEXT, data TEXT)""")
+            # 이전 버전 DB 에 없는 열 추가
+            columns = {row[1] for row in con.execute("PRAGMA table_info(minutes)")}
+            if 'data' not in columns: con.execute("ALTER TABLE minutes ADD COLUMN data TEXT")
+            con.execute("CREATE INDEX IF NOT EXISTS minutes_user ON minutes(username, created)")
+            con.execute("CREATE INDEX IF NOT EXISTS minutes_script ON minutes(username, script_hash)")
+            try:
+                con.execute("CREATE VIRTUAL TABLE IF NOT EXISTS minutes_fts USING fts5(title, doc, actions, tokenize='trigram')")
+            except sqlite3.OperationalError:
+                # trigram 토크나이저가 없는 SQLite(3.34 미만)는 기본 토크나이저 (어절 단위 검색)
+                con.execute("CREATE VIRTUAL TABLE IF NOT EXISTS minutes_fts USING fts5(title, doc, actions)")
+                self.trigram = False
+
+    # ------------------------------------------
+    # 저장
+    # ------------------------------------------
+    def save(self, username, info, template, doc, slack, script="", mapping=None,
+             prompt="", prompt_key="", model="", stats=None, data=None):
+        """반환: 새 회의록 id. data: 구조화 결과 (summary / decisions / action_items / slack_summary)"""
+        now = time.time()
+        items = extract_action_items(doc)
+        with self._lock, self._db() as con:
+            cur = con.execute(
+                """INSERT INTO minutes (username, created, updated, title, meeting_date, attendees, mapping,
+                   template, doc, slack, actions, script_hash, prompt, prompt_key, model, stats, data)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (username, now, now, info.get('title', ''), info.get('date', ''),
+                 json.dumps(info.get('attendees', []), ensure_ascii=False),
+                 json.dumps({str(k): v for k, v in (mapping or {}).items()}, ensure_ascii=False),
+                 template, doc, slack, json.dumps(items, ensure_ascii=False),
+                 script_hash(script) if script else "", prompt, prompt_key, model,
+                 json.dumps(stats or {}, ensure_ascii=False, default=str),
+                 json.dumps(data, ensure_ascii=False) if data is not None else None),
+            )
+            con.execute("INSERT INTO minutes_fts (rowid, title, doc, actions) VALUES (?, ?, ?, ?)",
+                        (cur.lastrowid, info.get('title', ''), doc, _actions_text(items)))
+            return cur.lastrowid
+
+    def update(self, minutes_id, username, info, doc, slack, mapping=None, data=None):
+        """화자 매칭/기본 정보 수정으로 다시 그린 결과 반영 (검색 색인 포함). data 가 없으면 기존 값 유지"""
+        items = extract_action_items(doc)
+        with self._lock, self._db() as con:
+            cur = con.execute(
+                """UPDATE minutes SET updated=?, title=?, meeting_date=?, attendees=?, mapping=?, doc=?, slack=?, actions=?,
+                   data=COALESCE(?, data) WHERE id=? AND username=?""",
+                (time.time(), info.get('title', ''), info.get('date', ''),
+                 json.dumps(info.get('attendees', []), ensure_ascii=False),
+                 json.dumps({str(k): v for k, v in (mapping or {}).items()}, ensure_ascii=False),
+                 doc, slack, json.dumps(items, ensure_ascii=False),
+                 json.dumps(data, ensure_ascii=False) if data is not None else None, minutes_id, username),
+            )
+            if not cur.rowcount: return False
+            con.execute("DELETE FROM minutes_fts WHERE rowid=?", (minutes_id,))
+            con.execute("INSERT INTO minutes_fts (rowid, title, doc, actions) VALUES (?, ?, ?, ?)",
+                        (minutes_id, info.get('title', ''), doc, _actions_text(items)))
+            return True
+
+    def delete(self, minutes_id, username):
+        with self._lock, self._db() as con:
+            cur = con.execute("DELETE FROM minutes WHERE id=? AND username=?", (minutes_id, username))
+            if cur.rowcount: con.execute("DELETE FROM minutes_fts WHERE rowid=?", (minutes_id,))
+            return bool(cur.rowcount)
+
+    # ------------------------------------------
+    # 조회
+    # ------------------------------------------
+    @staticmethod
+    def _record(row):
+        rec = dict(row)
+        for k, default in (('attendees', []), ('mapping', {}), ('actions', []), ('stats', {}), ('data', None)):
+            if k in rec:
+                try: rec[k] = json.loads(rec[k]) if rec[k] else default
+                except ValueError: rec[k] = default
+        if isinstance(rec.get('mapping'), dict): rec['mapping'] = {int(k): v for k, v in rec['mapping'].items()}
+        return rec
+
+    def get(self, minutes_id, username):
+        with self._db() as con:
+            row = con.execute("SELECT * FROM minutes WHERE id=? AND username=?", (minutes_id, username)).fetchone()
+        return self._record(row) if row else None
+
+    def find_by_script(self, username, script):
+        """같은 스크립트로 만든 가장 최근 회의록 (없으면 None)"""
+        with self._db() as con:
+            row = con.execute(
+                "SELECT id, created, title, meeting_date FROM minutes WHERE username=? AND script_hash=? ORDER BY created DESC LIMIT 1",
+                (username, script_hash(script)),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def _match_clause(self, query):
+        """검색어 → (WHERE 절, 파라미터). trigram 에서 3자 미만 단어는 LIKE 로 검색"""
+        terms = [t for t in query.split() if t]
+        fts_terms = [t for t in terms if not self.trigram or len(t) >= 3]
+        like_terms = [t for t in terms if t not in fts_terms]
+        clauses, params = [], []
+        if fts_terms:
+            clauses.append("m.id IN (SELECT rowid FROM minutes_fts WHERE minutes_fts MATCH ?)")
+            params.append(" ".join('"' + t.replace('"', '""') + '"' for t in fts_terms))
+        for t in like_terms:
+            clauses.append("m.id IN (SELECT rowid FROM minutes_fts WHERE title LIKE ? ESCAPE '\\' OR doc LIKE ? ESCAPE '\\' OR actions LIKE ? ESCAPE '\\')")
+            params += ["%" + re.sub(r'([%_\\])', r'\\\1', t) + "%"] * 3
+        return " AND ".join(clauses), params
+
+    def search(self, username, query="", page=1, per_page=10):
+        """반환: (목록, 전체 건수). 목록 항목: id, created, title, meeting_date, attendees, actions, snippet"""
+        where, params = "m.username=?", [username]
+        if query.strip():
+            clause, extra = self._match_clause(query.strip())
+            where += " AND " + clause
+            params += extra
+        offset = max(0, (page - 1) * per_page)
+        with self._db() as con:
+            total = con.execute(f"SELECT COUNT(*) FROM minutes m WHERE {where}", params).fetchone()[0]
+            rows = con.execute(
+                f"""SELECT m.id, m.created, m.title, m.meeting_date, m.attendees, m.actions, m.doc
+                    FROM minutes m WHERE {where} ORDER BY m.created DESC LIMIT ? OFFSET ?""",
+                params + [per_page, offset],
+            ).fetchall()
+        items = []
+        for row in rows:
+            rec = self._record(row)
+            rec['snippet'] = _snippet(rec.pop('doc') or "", query)
+            items.append(rec)
+        return items, total
+
+    def stats(self):
+        with self._db() as con:
+            n, size = con.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(doc)), 0) FROM minutes").fetchone()
+        return {'minutes': n, 'doc_chars': size}
+
+
+def _snippet(doc, query, width=60):
+    """검색어 주변 문맥 (검색어가 없으면 요약 첫 줄)"""
+    text = re.sub(r'\s+', ' ', doc)
+    for term in query.split():
+        pos = text.lower().find(term.lower())
+        if pos >= 0:
+            start = max(0, pos - width)
+            return ("…" if start else "") + text[start:pos + len(term) + width] + "…"
+    m = re.search(r'요약\s*\*?\s*(.{0,%d})' % (width * 2), text)
+    return (m.group(1) if m else text[:width * 2]).strip()
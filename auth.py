@@ -0,0 +1,158 @@
+"""
+로그인 / 비밀번호 (UserStore 앞단)
+- 사용자 조회는 UserStore 의 username 색인 한 번 (시트 전체 비교 없음 → 사용자 수와 무관)
+- 비밀번호는 'pbkdf2_sha256$반복수$salt$hash' 로 저장 (반복수는 PASSWORD_HASH_ITERATIONS 로 조정)
+  · 평문으로 남아 있는 기존 행, 반복수가 바뀐 해시는 다음 로그인 성공 때 새 해시로 바꿔 기록 (해당 셀만)
+- 사용자별 연속 실패가 max_failures 회를 넘으면 lockout 초 동안 조회/검증 없이 바로 거절
+- 없는 아이디도 같은 비용의 검증을 거쳐 응답 시간으로 아이디 존재 여부가 드러나지 않게 한다
+
+    auth = Authenticator(store)
+    user = auth.login("kim", "pw")       # 실패 None, 잠금 중이면 LoginThrottled
+"""
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import deque
+
+from tracing import annotate, traced
+
+SCHEME = "pbkdf2_sha256"
+DEFAULT_ITERATIONS = 200_000
+SALT_BYTES = 16
+MAX_TRACKED = 10_000        # 실패 기록을 보관할 최대 사용자 수 (넘으면 오래된 기록부터 정리)
+
+
+class LoginThrottled(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f"로그인 시도가 너무 많습니다. {retry_after:.0f}초 후 다시 시도해주세요.")
+        self.retry_after = retry_after
+
+
+# ==========================================
+# 해시
+# ==========================================
+def hash_password(password, iterations=DEFAULT_ITERATIONS, salt=None):
+    salt = salt or os.urandom(SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac('sha256', password.strip().encode('utf-8'), salt, iterations)
+    return f"{SCHEME}${iterations}${salt.hex()}${digest.hex()}"
+
+def is_hashed(stored):
+    return str(stored).startswith(SCHEME + "$")
+
+def verify_password(password, stored, iterations=DEFAULT_ITERATIONS):
+    """반환: (일치 여부, 다시 해시해야 하는지). 해시가 아닌 값은 기존 평문 비교 (앞뒤 공백 무시)"""
+    stored = str(stored or "").strip()
+    if not stored: return False, False
+    if not is_hashed(stored):
+        ok = hmac.compare_digest(stored.encode('utf-8'), password.strip().encode('utf-8'))
+        return ok, ok
+    try:
+        _, rounds, salt, digest = stored.split("$")
+        rounds, salt = int(rounds), bytes.fromhex(salt)
+    except ValueError:
+        return False, False
+    ok = hmac.compare_digest(hash_password(password, rounds, salt), stored)
+    return ok, ok and rounds != iterations
+
+
+class Authenticator:
+    def __init__(self, store, iterations=DEFAULT_ITERATIONS, max_failures=5, window=300, lockout=300):
+        self.store = store
+        self.iterations = int(iterations)
+        self.max_failures, self.window, self.lockout = max_failures, window, lockout
+        self._failures = {}         # username -> deque[실패 시각]
+        self._lock = threading.Lock()
+        self._dummy = hash_password("", self.iterations)
+        self.logins = self.failed = self.throttled = self.migrated = self.migrate_failed = 0
+
+    # ------------------------------------------
+    # 실패 제한
+    # ------------------------------------------
+    def retry_after(self, username):
+        """잠금 중이면 남은 초, 아니면 0"""
+        now = time.monotonic()
+        with self._lock:
+            times = self._failures.get(username)
+            if not times or len(times) < self.max_failures: return 0.0
+            return max(0.0, times[-1] + self.lockout - now)
+
+    def _fail(self, username):
+        now = time.monotonic()
+        with self._lock:
+            self.failed += 1
+            times = self._failures.setdefault(username, deque(maxlen=self.max_failures))
+            while times and now - times[0] > self.window: times.popleft()
+            times.append(now)
+            if len(self._failures) > MAX_TRACKED:
+                for name in [n for n, t in self._failures.items() if now - t[-1] > max(self.window, self.lockout)]:
+                    del self._failures[name]
+
+    def _check(self, username):
+        wait = self.retry_after(username)
+        if wait > 0:
+            with self._lock: self.throttled += 1
+            annotate(result="throttled")
+            raise LoginThrottled(wait)
+
+    # ------------------------------------------
+    # 로그인 / 변경
+    # ------------------------------------------
+    def _verify(self, username, password, migrate=True):
+        """반환: 비밀번호 열을 뺀 사용자 레코드 (불일치 None). migrate 면 평문/옛 해시를 새 해시로 교체"""
+        user = self.store.get(username)
+        if user is None:
+            verify_password(password, self._dummy, self.iterations)
+            return None
+        ok, rehash = verify_password(password, user.get('password', ''), self.iterations)
+        if not ok: return None
+        if rehash and migrate:
+            # 기록 실패는 로그인에 영향 없음 (횟수/원인만 남기고 다음 로그인 때 다시 시도)
+            try:
+                ok = self.store.update(username, password=hash_password(password, self.iterations))
+                error = None if ok else "사용자 없음"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            with self._lock:
+                if error: self.migrate_failed += 1
+                else: self.migrated += 1
+            annotate(migrated=not error, migrate_error=error)
+        user.pop('password', None)
+        return user
+
+    @traced("auth.login")
+    def login(self, username, password):
+        """반환: 사용자 레코드 (비밀번호 열 제외) 또는 None. 잠금 중이면 LoginThrottled"""
+        username = str(username).strip()
+        self._check(username)
+        user = self._verify(username, password)
+        if user is None:
+            self._fail(username)
+            annotate(result="fail")
+            return None
+        with self._lock:
+            self._failures.pop(username, None)
+            self.logins += 1
+        annotate(result="ok")
+        return user
+
+    @traced("auth.change_password")
+    def change_password(self, username, current, new):
+        """현재 비밀번호가 맞으면 새 해시로 기록. 반환: 성공 여부 (틀리면 실패 횟수에 포함)"""
+        username = str(username).strip()
+        self._check(username)
+        if self._verify(username, current, migrate=False) is None:
+            self._fail(username)
+            return False
+        return bool(self.store.update(username, password=hash_password(new, self.iterations)))
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            locked = sum(1 for t in self._failures.values() if len(t) >= self.max_failures and now - t[-1] < self.lockout)
+            return {
+                'iterations': self.iterations, 'logins': self.logins, 'failed': self.failed,
+                'throttled': self.throttled, 'migrated': self.migrated, 'migrate_failed': self.migrate_failed,
+                'locked_users': locked,
+            }
@@ -0,0 +1,210 @@
+"""
+벤치마크용 가짜 백엔드 (네트워크 없이 지연 시간만 흉내)
+- FakeGenaiClient: google.genai.Client 대체. 호출 수/프롬프트 토큰 기록, usage_metadata 제공
+- FakeGSheetsConnection: GSheetsConnection 대체. 읽기 횟수/바이트, 쓰기 횟수 기록
+- install(): 실제 모듈을 미리 import 하지 않고, 앱이 처음 import 하는 순간 가짜로 교체 (콜드 스타트 측정용)
+모든 측정값은 METRICS 에 누적되며 run_bench 가 단계별로 차이를 계산한다.
+"""
+import importlib.machinery
+import json
+import re
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+from streamlit.connections import BaseConnection
+
+from rag_index import estimate_tokens
+
+_lock = threading.Lock()
+METRICS = {
+    'llm_calls': 0, 'prompt_tokens': 0, 'response_tokens': 0,
+    'sheet_reads': 0, 'sheet_read_bytes': 0, 'sheet_writes': 0, 'sheet_write_bytes': 0, 'cell_writes': 0,
+}
+CONFIG = {'llm_latency': 0.5, 'llm_ttft': 0.2, 'sheet_latency': 0.2, 'users': 20}
+
+MINUTES_TEXT = """# 📑 벤치마크 회의
+> **📅 일시:** 2024-03-05
+---
+### 1. 요약
+* 실사 일정과 밸류에이션 검토
+### 2. 주요 결정사항
+* CDD 킥오프 다음 주 진행
+### 3. Action Item
+| 담당 | 할일 | 기한 |
+| :--- | :--- | :--- |
+| 참석자 1 | 티저 검토 | 2024-03-12 |
+---
+# [SLACK MESSAGE]
+🚨 **[공유] 벤치마크 회의**
+> 요약: 실사 일정 확정
+**✅ 결정:** CDD 킥오프
+"""
+MINUTES_JSON = json.dumps({
+    "summary": ["실사 일정과 밸류에이션 검토"], "decisions": ["CDD 킥오프 다음 주 진행"],
+    "action_items": [{"owner": "[[S1]]", "task": "티저 검토", "due": "2024-03-12"}],
+    "slack_summary": "실사 일정 확정",
+}, ensure_ascii=False)
+
+
+def _add(**kw):
+    with _lock:
+        for k, v in kw.items(): METRICS[k] += v
+
+def snapshot():
+    with _lock: return dict(METRICS)
+
+def reset():
+    with _lock:
+        for k in METRICS: METRICS[k] = 0
+
+
+# ==========================================
+# Gemini
+# ==========================================
+def _usage(prompt, text):
+    p, r = estimate_tokens(prompt), estimate_tokens(text)
+    return SimpleNamespace(prompt_token_count=p, candidates_token_count=r, total_token_count=p + r)
+
+def _response_for(contents, config):
+    if getattr(config, 'response_schema', None) is not None:
+        return MINUTES_JSON         # 구조화 회의록
+    if getattr(config, 'response_mime_type', None) == "application/json":
+        if "구간" in contents:
+            return json.dumps({"summary": ["구간 요약"], "decisions": ["결정"], "action_items": []}, ensure_ascii=False)
+        return json.dumps({"title": "벤치마크 회의", "date": "2024-03-05", "attendees": ["참석자 1", "참석자 2"]}, ensure_ascii=False)
+    return MINUTES_TEXT
+
+
+class _FakeModels:
+    def generate_content(self, model, contents, config=None):
+        time.sleep(CONFIG['llm_latency'])
+        text = _response_for(contents, config)
+        usage = _usage(contents, text)
+        _add(llm_calls=1, prompt_tokens=usage.prompt_token_count, response_tokens=usage.candidates_token_count)
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+    def generate_content_stream(self, model, contents, config=None):
+        text = _response_for(contents, config)
+        usage = _usage(contents, text)
+        _add(llm_calls=1, prompt_tokens=usage.prompt_token_count, response_tokens=usage.candidates_token_count)
+        time.sleep(CONFIG['llm_ttft'])
+        pieces = [text[i:i + 80] for i in range(0, len(text), 80)]
+        rest = max(0.0, CONFIG['llm_latency'] - CONFIG['llm_ttft']) / max(1, len(pieces))
+        for i, piece in enumerate(pieces):
+            if i: time.sleep(rest)
+            yield SimpleNamespace(text=piece, usage_metadata=usage if i == len(pieces) - 1 else None)
+
+
+class FakeGenaiClient:
+    def __init__(self, *args, **kwargs):
+        self.models = _FakeModels()
+
+
+# ==========================================
+# Google Sheets
+# ==========================================
+def make_users(n):
+    import pandas as pd
+    return pd.DataFrame({
+        'username': [f"user{i}" for i in range(n)],
+        'password': [f"pw{i}" for i in range(n)],
+        'name': [f"사용자{i}" for i in range(n)],
+        'webhook': [""] * n,
+        'prompt': [""] * n,
+        'prompt_slot1': [""] * n,
+        'prompt_slot2': [""] * n,
+    })
+
+
+class _FakeCell:
+    def __init__(self, value):
+        self.value = value
+
+
+class _FakeWorksheet:
+    # gspread Worksheet 중 UserStore 가 쓰는 부분 (1행은 헤더, 행/열 번호는 1부터)
+    def cell(self, row, col):
+        frame = FakeGSheetsConnection.frame
+        return _FakeCell(frame.iat[row - 2, col - 1])
+
+    def batch_update(self, data, **kwargs):
+        # 여러 셀을 요청 한 번으로 ('B3' 같은 단일 셀 범위만)
+        time.sleep(CONFIG['sheet_latency'])
+        frame = FakeGSheetsConnection.frame
+        for item in data:
+            match = re.fullmatch(r"([A-Z]+)(\d+)", item['range'])
+            col = 0
+            for ch in match.group(1): col = col * 26 + ord(ch) - 64
+            row = int(match.group(2))
+            column = frame.columns[col - 1]
+            frame[column] = frame[column].astype(object)
+            frame.iat[row - 2, col - 1] = item['values'][0][0]
+        _add(cell_writes=len(data))
+
+
+class _FakeSheetClient:
+    def _select_worksheet(self, worksheet=None, **kwargs):
+        return _FakeWorksheet()
+
+
+class FakeGSheetsConnection(BaseConnection[None]):
+    frame = None
+
+    def _connect(self, **kwargs):
+        return None
+
+    @property
+    def client(self):
+        # 서비스 계정 연결처럼 셀 단위 쓰기 가능
+        return _FakeSheetClient()
+
+    @classmethod
+    def reset_sheet(cls, users):
+        cls.frame = make_users(users)
+
+    def read(self, worksheet=None, ttl=None, **kwargs):
+        time.sleep(CONFIG['sheet_latency'])
+        if type(self).frame is None: type(self).reset_sheet(CONFIG['users'])
+        df = type(self).frame.copy()
+        _add(sheet_reads=1, sheet_read_bytes=len(df.to_csv(index=False).encode('utf-8')))
+        return df
+
+    def update(self, worksheet=None, data=None, **kwargs):
+        time.sleep(CONFIG['sheet_latency'])
+        type(self).frame = data.copy()
+        _add(sheet_writes=1, sheet_write_bytes=len(data.to_csv(index=False).encode('utf-8')))
+        return data
+
+
+# ==========================================
+# 지연 교체 (import hook)
+# ==========================================
+PATCHES = {
+    "google.genai": ("Client", FakeGenaiClient),
+    "streamlit_gsheets": ("GSheetsConnection", FakeGSheetsConnection),
+}
+
+
+class _PatchFinder:
+    # 대상 모듈이 import 될 때 원래 로더로 실행한 뒤 속성을 가짜로 바꾼다
+    def find_spec(self, name, path=None, target=None):
+        if name not in PATCHES: return None
+        spec = importlib.machinery.PathFinder.find_spec(name, path)
+        if spec is None or spec.loader is None: return None
+        attr, fake = PATCHES[name]
+        exec_module = spec.loader.exec_module
+
+        def patched(module):
+            exec_module(module)
+            setattr(module, attr, fake)
+        spec.loader.exec_module = patched
+        return spec
+
+
+def install():
+    for name, (attr, fake) in PATCHES.items():
+        if name in sys.modules: setattr(sys.modules[name], attr, fake)
+    if not any(isinstance(f, _PatchFinder) for f in sys.meta_path):
+        sys.meta_path.insert(0, _PatchFinder())
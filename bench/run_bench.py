@@ -0,0 +1,282 @@
+"""
+오프라인 벤치마크 (가짜 Gemini / Google Sheets + Streamlit AppTest)
+
+    python bench/run_bench.py                              # 기본 시나리오
+    python bench/run_bench.py --users 10 --turns 50,800 --corpus 1,20
+    python bench/run_bench.py --compare bench/results/abc1234.json
+
+시뮬레이션 사용자마다 새 세션(AppTest)으로 전체 흐름을 실행한다.
+  login_page → login → analysis → mapping → generation → settings_save
+콜드 스타트는 새 프로세스에서 따로 잰다 (import + 첫 로그인 화면, 그 시점에 로드된 무거운 모듈).
+단계별 p50/p95 지연, 시트 읽기 횟수/바이트, LLM 호출 수/프롬프트 토큰을 집계해
+bench/results/<commit>.json 으로 저장하므로 커밋 간 비교가 가능하다.
+사용자는 한 프로세스 안에서 순서대로 실행되므로 프로세스 공용 캐시는 사용자 간에 공유된다 (실서버와 동일).
+"""
+import argparse
+import glob
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+STARTED = time.perf_counter()
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import core
+from bench import fakes
+from corpus_cache import get_corpus_cache
+
+APP_PATH = os.path.join(ROOT, "app.py")
+STAGES = ("login_page", "login", "analysis", "mapping", "generation", "settings_save")
+HEAVY_MODULES = ("pandas", "google.genai", "streamlit_gsheets", "gspread")
+FILLERS = ["음, ", "어 ", "그, ", ""]
+TOPICS = [
+    "다음 주 CDD 킥오프 일정", "밸류에이션 갭 조정", "CPO 가동률 개선", "OCPP 2.0.1 대응",
+    "로밍 연동 테스트", "급속 충전기 포트폴리오", "PMI 플랜", "CAPEX 집행 계획",
+]
+
+
+# ==========================================
+# 입력 데이터 생성
+# ==========================================
+def make_transcript(turns, seed=0, speakers=4):
+    lines = [f"회의명: 주간 전략회의 {seed}", "일시: 2024-03-05"]
+    for i in range(turns):
+        topic = TOPICS[(i + seed) % len(TOPICS)]
+        lines.append(f"참석자 {i % speakers + 1}: {FILLERS[i % len(FILLERS)]}{topic} 관련해서 말씀드리면, 이번 분기 안에 정리가 필요합니다. ({seed}-{i})")
+    return "\n".join(lines)
+
+def make_corpus(multiplier):
+    """실제 rag/*.txt 를 multiplier 배로 복제한 임시 코퍼스 디렉터리"""
+    tmp = tempfile.mkdtemp(prefix="bench_rag_")
+    for src in glob.glob(os.path.join(ROOT, "rag", "*.txt")):
+        with open(src, 'r', encoding='utf-8') as f: text = f.read()
+        base = os.path.splitext(os.path.basename(src))[0]
+        for n in range(multiplier):
+            body = text if n == 0 else text.replace("[Term] ", f"[Term] V{n}-")
+            with open(os.path.join(tmp, f"{base}_{n}.txt"), 'w', encoding='utf-8') as f: f.write(body)
+    return tmp
+
+
+# ==========================================
+# 실행
+# ==========================================
+def _button(at, label):
+    for b in at.button:
+        if b.label == label: return b
+    raise LookupError(f"버튼 없음: {label}")
+
+def _text_input(at, label):
+    for w in at.text_input:
+        if w.label == label: return w
+    raise LookupError(f"입력 없음: {label}")
+
+def _wait_job(at, key, timeout):
+    # 분석/생성은 백그라운드 작업이므로 끝날 때까지 화면을 다시 실행하며 기다린다
+    deadline = time.perf_counter() + timeout
+    while key in at.session_state:
+        if at.exception or time.perf_counter() > deadline: break
+        time.sleep(0.02)
+        at.run()
+
+def run_user(idx, script, timeout):
+    """사용자 1명의 전체 흐름. 반환: {stage: (초, 지표 변화량)}"""
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.secrets["GEMINI_API_KEY"] = "bench"
+    at.secrets["RESPONSE_CACHE_DB"] = ""
+    at.secrets["MINUTES_DB"] = ""
+    at.secrets["TRACE_LOG"] = ""
+    result = {}
+
+    def stage(name, action):
+        before, t0 = fakes.snapshot(), time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - t0
+        if at.exception: raise RuntimeError(f"{name}: {at.exception[0].value}")
+        after = fakes.snapshot()
+        result[name] = (elapsed, {k: after[k] - before[k] for k in after})
+
+    stage("login_page", at.run)
+
+    def login():
+        _text_input(at, "아이디").input(f"user{idx}")
+        _text_input(at, "비밀번호").input(f"pw{idx}")
+        _button(at, "로그인").click().run()
+    stage("login", login)
+
+    def analysis():
+        at.text_area(key="input_script").input(script)
+        _button(at, "🔍 1차 분석").click().run()
+        _wait_job(at, "analysis_job", timeout)
+    stage("analysis", analysis)
+
+    def mapping():
+        sel = at.selectbox(key="s_0")
+        sel.select(sel.options[min(1, len(sel.options) - 1)]).run()
+    stage("mapping", mapping)
+
+    def generation():
+        _button(at, "✨ AI 회의록 생성 시작").click().run()
+        _wait_job(at, "gen_job", timeout)
+        if "res_doc" not in at.session_state: raise RuntimeError("generation: 결과 없음")
+    stage("generation", generation)
+    stage("settings_save", lambda: _button(at, "✅ 전체 설정 저장").click().run())
+    return result
+
+def _percentile(values, q):
+    values = sorted(values)
+    if not values: return 0.0
+    pos = (len(values) - 1) * q
+    lo, hi = int(pos), min(int(pos) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+def cold_child(timeout):
+    """새 프로세스에서 첫 로그인 화면까지 (--cold-child 로 실행되어 JSON 한 줄 출력)"""
+    imported = time.perf_counter() - STARTED
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.secrets["GEMINI_API_KEY"] = "bench"
+    at.secrets["RESPONSE_CACHE_DB"] = ""
+    at.secrets["MINUTES_DB"] = ""
+    at.secrets["TRACE_LOG"] = ""
+    t0 = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - t0
+    if at.exception: raise RuntimeError(at.exception[0].value)
+    t0 = time.perf_counter()
+    at.run()
+    rerun = time.perf_counter() - t0
+    print(json.dumps({
+        'import': imported, 'login_page': first, 'rerun': rerun, 'total': time.perf_counter() - STARTED,
+        'heavy_modules': [m for m in HEAVY_MODULES if m in sys.modules],
+    }))
+
+def run_cold(runs, timeout):
+    samples = []
+    for _ in range(runs):
+        out = subprocess.check_output(
+            [sys.executable, os.path.abspath(__file__), "--cold-child", "--timeout", str(timeout)], cwd=ROOT, text=True,
+            stderr=subprocess.DEVNULL,
+        )
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    cold = {'n': len(samples), 'heavy_modules': samples[-1]['heavy_modules'] if samples else []}
+    for k in ('import', 'login_page', 'rerun', 'total'):
+        values = [x[k] for x in samples]
+        cold[k] = {'p50': round(_percentile(values, 0.5), 4), 'p95': round(_percentile(values, 0.95), 4)}
+    return cold
+
+def run_scenario(users, turns, corpus, timeout):
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    get_corpus_cache().clear()
+    fakes.FakeGSheetsConnection.reset_sheet(max(users, fakes.CONFIG['users']))
+    rag_dir = make_corpus(corpus)
+    core.RAG_DIR = rag_dir
+    per_stage = {s: [] for s in STAGES}
+    totals = {s: {} for s in STAGES}
+    try:
+        for idx in range(users):
+            for name, (elapsed, delta) in run_user(idx, make_transcript(turns, seed=idx), timeout).items():
+                per_stage[name].append(elapsed)
+                for k, v in delta.items(): totals[name][k] = totals[name].get(k, 0) + v
+    finally:
+        shutil.rmtree(rag_dir, ignore_errors=True)
+    stages = {}
+    for name in STAGES:
+        times = per_stage[name]
+        stages[name] = {
+            'n': len(times), 'p50': round(_percentile(times, 0.5), 4), 'p95': round(_percentile(times, 0.95), 4),
+            'mean': round(sum(times) / len(times), 4) if times else 0.0,
+            **{k: v for k, v in totals[name].items() if v},
+        }
+    return {'params': {'users': users, 'turns': turns, 'corpus': corpus}, 'stages': stages}
+
+
+# ==========================================
+# 보고
+# ==========================================
+def _commit():
+    try:
+        sha = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+        dirty = subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, text=True).strip()
+        return sha + ("-dirty" if dirty else "")
+    except Exception:
+        return "unknown"
+
+def print_report(report, baseline=None):
+    cold = report.get('cold_start')
+    if cold:
+        old = (baseline or {}).get('cold_start')
+        print(f"\n== cold start (새 프로세스 {cold['n']}회) ==")
+        for k in ('import', 'login_page', 'rerun', 'total'):
+            line = f"{k:<14}p50 {cold[k]['p50']:>7.3f}s  p95 {cold[k]['p95']:>7.3f}s"
+            if old and old.get(k, {}).get('p50'):
+                line += f"   p50 {(cold[k]['p50'] / old[k]['p50'] - 1) * 100:+.0f}% vs {baseline['commit']}"
+            print(line)
+        print(f"{'heavy_modules':<14}{', '.join(cold['heavy_modules']) or '-'}")
+    base = {json.dumps(s['params'], sort_keys=True): s for s in (baseline or {}).get('scenarios', [])}
+    for sc in report['scenarios']:
+        p = sc['params']
+        print(f"\n== users={p['users']} turns={p['turns']} corpus=x{p['corpus']} ==")
+        print(f"{'stage':<14}{'p50(s)':>9}{'p95(s)':>9}{'sheet_reads':>13}{'sheet_KB':>10}{'writes(s/c)':>13}{'llm_calls':>11}{'prompt_tok':>12}")
+        old = base.get(json.dumps(p, sort_keys=True))
+        for name, m in sc['stages'].items():
+            line = (f"{name:<14}{m['p50']:>9.3f}{m['p95']:>9.3f}{m.get('sheet_reads', 0):>13}"
+                    f"{m.get('sheet_read_bytes', 0) / 1024:>10.1f}{str(m.get('sheet_writes', 0)) + '/' + str(m.get('cell_writes', 0)):>13}"
+                    f"{m.get('llm_calls', 0):>11}{m.get('prompt_tokens', 0):>12}")
+            if old and name in old['stages'] and old['stages'][name]['p50']:
+                line += f"   p50 {(m['p50'] / old['stages'][name]['p50'] - 1) * 100:+.0f}% vs {baseline['commit']}"
+            print(line)
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="가짜 백엔드로 앱 전체 흐름 벤치마크")
+    p.add_argument("--users", default="5", help="시뮬레이션 사용자 수 (쉼표로 여러 값)")
+    p.add_argument("--turns", default="50,400", help="스크립트 발화 수 (쉼표로 여러 값)")
+    p.add_argument("--corpus", default="1,10", help="RAG 코퍼스 배수 (쉼표로 여러 값)")
+    p.add_argument("--llm-latency", type=float, default=0.5)
+    p.add_argument("--llm-ttft", type=float, default=0.2)
+    p.add_argument("--sheet-latency", type=float, default=0.2)
+    p.add_argument("--timeout", type=float, default=120)
+    p.add_argument("--out", default=None, help="결과 JSON 경로 (기본 bench/results/<commit>.json)")
+    p.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    p.add_argument("--cold-runs", type=int, default=3, help="콜드 스타트 측정 횟수 (0 이면 생략)")
+    p.add_argument("--cold-child", action="store_true", help=argparse.SUPPRESS)
+    args = p.parse_args(argv)
+
+    fakes.CONFIG.update(llm_latency=args.llm_latency, llm_ttft=args.llm_ttft, sheet_latency=args.sheet_latency)
+    # 실제 모듈은 앱이 처음 import 할 때 가짜로 교체 (미리 import 하면 콜드 스타트 측정이 왜곡됨)
+    fakes.install()
+    if args.cold_child:
+        cold_child(args.timeout)
+        return
+
+    ints = lambda s: [int(x) for x in s.split(",") if x.strip()]
+    report = {
+        'commit': _commit(), 'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'config': dict(fakes.CONFIG), 'scenarios': [],
+    }
+    if args.cold_runs: report['cold_start'] = run_cold(args.cold_runs, args.timeout)
+    for users, turns, corpus in itertools.product(ints(args.users), ints(args.turns), ints(args.corpus)):
+        fakes.reset()
+        report['scenarios'].append(run_scenario(users, turns, corpus, args.timeout))
+
+    out = args.out or os.path.join(ROOT, "bench", "results", f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f: json.dump(report, f, ensure_ascii=False, indent=2)
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f: baseline = json.load(f)
+    print_report(report, baseline)
+    print(f"\n결과 저장: {out}")
+
+
+if __name__ == "__main__":
+    main()
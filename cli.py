@@ -0,0 +1,190 @@
+"""
+회의록 일괄 생성 CLI (Streamlit 없이 실행)
+
+    python cli.py transcripts/ -o minutes/ --concurrency 4 --rpm 30
+    python cli.py backlog.jsonl -o minutes/
+
+- 입력: *.txt/*.md 가 든 디렉터리, 또는 JSONL ({"id", "script", "title", "date", "attendees", "mapping"})
+- 출력: <id>.md (회의록), <id>.slack.txt (슬랙 메시지), <id>.json (구조화 결과: 요약/결정/Action Item), manifest.jsonl (처리 기록)
+- 중단 후 다시 실행하면 manifest 에 성공으로 기록된(같은 내용의) 항목은 건너뛴다
+- --archive-db 를 주면 생성한 회의록을 앱의 '지난 회의록' 보관소에도 저장 (--user 사용자로)
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import core
+import resources
+from archive import MinutesArchive
+from ratelimit import TokenBucket
+from response_cache import ResponseCache
+
+TEXT_EXTS = (".txt", ".md")
+MANIFEST = "manifest.jsonl"
+
+
+# ==========================================
+# 입력 / 출력
+# ==========================================
+def _safe_id(value):
+    return re.sub(r'[^\w.\-가-힣]+', '_', str(value)).strip('._') or "meeting"
+
+def load_jobs(path):
+    """반환: [{'id', 'script', 'info', 'mapping'}]"""
+    jobs = []
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if not name.lower().endswith(TEXT_EXTS): continue
+            with open(os.path.join(path, name), 'r', encoding='utf-8') as f:
+                jobs.append({'id': _safe_id(os.path.splitext(name)[0]), 'script': f.read(), 'info': {}, 'mapping': {}})
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            for no, line in enumerate(f, 1):
+                if not line.strip(): continue
+                rec = json.loads(line)
+                info = {k: rec[k] for k in ('title', 'date', 'attendees') if rec.get(k)}
+                jobs.append({
+                    'id': _safe_id(rec.get('id') or f"line{no:05d}"),
+                    'script': rec.get('script') or rec.get('text') or "",
+                    'info': info, 'mapping': rec.get('mapping') or {},
+                })
+    seen = set()
+    for job in jobs:
+        # 같은 id 가 여러 번 나오면 뒤에 번호를 붙인다
+        base, n = job['id'], 1
+        while job['id'] in seen:
+            n += 1
+            job['id'] = f"{base}_{n}"
+        seen.add(job['id'])
+        job['hash'] = hashlib.sha256(json.dumps([job['script'], job['info'], job['mapping']], ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+    return jobs
+
+def load_done(out_dir):
+    """manifest 에서 성공한 항목 {id: hash}"""
+    done, path = {}, os.path.join(out_dir, MANIFEST)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try: rec = json.loads(line)
+                except ValueError: continue     # 중단으로 잘린 마지막 줄
+                if rec.get('status') == "ok": done[rec['id']] = rec.get('hash')
+                else: done.pop(rec.get('id'), None)
+    return done
+
+def _write_atomic(path, text):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f: f.write(text)
+    os.replace(tmp, path)
+
+
+# ==========================================
+# 실행
+# ==========================================
+def run(args):
+    jobs = load_jobs(args.input)
+    os.makedirs(args.out, exist_ok=True)
+    done = {} if args.force else load_done(args.out)
+    pending = [
+        j for j in jobs
+        if not (done.get(j['id']) == j['hash'] and os.path.exists(os.path.join(args.out, f"{j['id']}.md")))
+    ]
+    print(f"총 {len(jobs)}건 / 완료 {len(jobs) - len(pending)}건 건너뜀 / 처리 {len(pending)}건", file=sys.stderr)
+    if not pending: return 0
+
+    custom_prompt = ""
+    if args.prompt_file:
+        with open(args.prompt_file, 'r', encoding='utf-8') as f: custom_prompt = f.read()
+    rag_index, rag_files = core.load_rag_data(rag_dir=args.rag_dir)
+    print(f"RAG 자료 {len(rag_files)}개, 용어 {len(rag_index.glossary)}개, 청크 {len(rag_index)}개", file=sys.stderr)
+
+    archive = MinutesArchive(args.archive_db) if args.archive_db else None
+    manifest_lock = threading.Lock()
+    manifest = open(os.path.join(args.out, MANIFEST), 'a', encoding='utf-8')
+    failures = 0
+
+    def process(job):
+        started = time.perf_counter()
+        result = core.run_minutes(job['script'], job['info'], job['mapping'], custom_prompt, rag_index)
+        _write_atomic(os.path.join(args.out, f"{job['id']}.md"), result['doc'] + "\n")
+        _write_atomic(os.path.join(args.out, f"{job['id']}.slack.txt"), result['slack'] + "\n")
+        if result['data'] is not None:
+            _write_atomic(os.path.join(args.out, f"{job['id']}.json"), json.dumps(result['data'], ensure_ascii=False, indent=2) + "\n")
+        if archive is not None:
+            archive.save(args.user, result['info'], result['template'], result['doc'], result['slack'],
+                         script=job['script'], mapping=job['mapping'], prompt=custom_prompt,
+                         prompt_key=result['prompt_key'], model=result['model'], data=result['data'])
+        return result, time.perf_counter() - started
+
+    pool = ThreadPoolExecutor(max_workers=args.concurrency)
+    futures = {pool.submit(process, job): job for job in pending}
+    try:
+        for n, fut in enumerate(as_completed(futures), 1):
+            job = futures[fut]
+            rec = {'id': job['id'], 'hash': job['hash'], 'finished': time.strftime("%Y-%m-%dT%H:%M:%S")}
+            try:
+                result, elapsed = fut.result()
+                rec.update(status="ok", elapsed=round(elapsed, 2), title=result['info'].get('title', ''),
+                           tokens_before=result['stats']['before'], tokens_after=result['stats']['after'])
+                print(f"[{n}/{len(pending)}] ok   {job['id']} ({elapsed:.1f}s)", file=sys.stderr)
+            except Exception as e:
+                failures += 1
+                rec.update(status="error", error=f"{type(e).__name__}: {e}")
+                print(f"[{n}/{len(pending)}] FAIL {job['id']}: {e}", file=sys.stderr)
+            with manifest_lock:
+                manifest.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                manifest.flush()
+    except KeyboardInterrupt:
+        print("\n중단됨 - 다시 실행하면 남은 항목부터 이어서 처리합니다.", file=sys.stderr)
+        pool.shutdown(wait=False, cancel_futures=True)
+        manifest.close()
+        return 130
+    pool.shutdown()
+    manifest.close()
+    print(f"완료: 성공 {len(pending) - failures}건, 실패 {failures}건", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def _api_key(args):
+    if args.api_key: return args.api_key
+    if os.environ.get("GEMINI_API_KEY"): return os.environ["GEMINI_API_KEY"]
+    # Streamlit 앱과 같은 secrets 파일 사용
+    if os.path.exists(args.secrets):
+        import tomllib
+        with open(args.secrets, 'rb') as f: return tomllib.load(f).get("GEMINI_API_KEY")
+    return None
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="녹취록 디렉터리/JSONL 로부터 회의록 일괄 생성")
+    p.add_argument("input", help="*.txt/*.md 디렉터리 또는 JSONL 파일")
+    p.add_argument("-o", "--out", required=True, help="결과 디렉터리")
+    p.add_argument("--concurrency", type=int, default=4, help="동시 처리 건수 (기본 4)")
+    p.add_argument("--rpm", type=float, default=30, help="분당 최대 Gemini 호출 수 (기본 30)")
+    p.add_argument("--burst", type=int, default=None, help="순간 허용 호출 수 (기본 rpm/10)")
+    p.add_argument("--prompt-file", help="출력 형식 커스텀 프롬프트 파일")
+    p.add_argument("--rag-dir", default=None, help="RAG 자료 디렉터리 (기본 rag/)")
+    p.add_argument("--cache-db", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "responses.sqlite3"),
+                   help="응답 캐시 SQLite 경로 (빈 값이면 메모리만)")
+    p.add_argument("--archive-db", default="", help="회의록 보관소 SQLite 경로 (앱의 MINUTES_DB, 기본: 저장 안 함)")
+    p.add_argument("--user", default="cli", help="보관소에 기록할 사용자 아이디 (기본 cli)")
+    p.add_argument("--secrets", default=os.path.join(".streamlit", "secrets.toml"))
+    p.add_argument("--api-key", default=None)
+    p.add_argument("--force", action="store_true", help="manifest 를 무시하고 모두 다시 생성")
+    args = p.parse_args(argv)
+
+    api_key = _api_key(args)
+    if not api_key:
+        p.error("GEMINI_API_KEY 가 필요합니다 (환경변수, --api-key 또는 secrets.toml)")
+    core.set_client_provider(lambda: resources.gemini_client(api_key))
+    core.set_response_cache(ResponseCache(db_path=args.cache_db or None))
+    core.set_rate_limiter(TokenBucket.per_minute(args.rpm, args.burst))
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
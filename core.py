@@ -0,0 +1,509 @@
+"""
+회의록 생성 핵심 로직 (Streamlit 비의존)
+app.py(웹)와 cli.py(일괄 처리)가 함께 사용한다.
+- set_client(_provider) / set_response_cache / set_rate_limiter 로 외부 자원을 주입
+- configure(...) 로 RAG/긴 회의록/메타데이터 설정 변경, configure_routes(...) 로 작업별 모델/제한 시간 변경
+"""
+import datetime
+import json
+import os
+import re
+import time
+
+import model_router
+import resources
+import tracing
+from corpus_cache import get_corpus_cache
+from long_transcript import condense_script, is_long, metadata_excerpt
+from meta_extract import extract_metadata
+import minutes_schema
+from glossary import format_glossary
+from rag_index import RagIndex, estimate_tokens, format_context
+from response_cache import ResponseCache, make_key
+from transcript_compact import compact_transcript
+from transcript_index import TranscriptIndex
+
+MINUTES_CONFIG = {"temperature": 0.2}
+RAG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rag')
+
+SETTINGS = {
+    # RAG 검색 (상위 k개 청크, 프롬프트에 넣을 최대 토큰)
+    "RAG_TOP_K": 8,
+    "RAG_TOKEN_BUDGET": 2000,
+    # 용어집: 스크립트에 언급된 용어 정의만 넣되 이 토큰 수까지
+    "GLOSSARY_TOKEN_BUDGET": 1500,
+    # 긴 회의록 map-reduce (이 토큰 수를 넘으면 구간 분할 후 병렬 요약)
+    "LONG_SCRIPT_TOKENS": 12000,
+    "MAP_WINDOW_TOKENS": 6000,
+    "MAP_WORKERS": 4,
+    # 로컬 메타데이터 추출 신뢰도가 이 값 이상이면 LLM 호출 생략
+    "META_CONFIDENCE": 0.8,
+    # 회의록을 JSON 스키마로 받아 로컬에서 문서/슬랙 메시지 생성 (커스텀 출력 형식을 쓰면 기존 마크다운 방식)
+    "STRUCTURED_MINUTES": True,
+}
+
+_client = None
+_client_provider = None
+_response_cache = None
+_rate_limiter = None
+_on_throttle = None
+_router = model_router.ModelRouter()
+
+
+def configure(**overrides):
+    """SETTINGS 값 변경 (기본값과 같은 타입으로 변환, 모르는 키는 무시)"""
+    for key, value in overrides.items():
+        if key in SETTINGS: SETTINGS[key] = type(SETTINGS[key])(value)
+
+def configure_routes(routes):
+    # {"metadata": {"model": ..., "fallback": ..., "deadline": 초, "hedge": bool, "hedge_after": 초}, ...}
+    for task, options in (routes or {}).items(): _router.configure(task, **options)
+
+def get_router():
+    return _router
+
+def route_model(task):
+    # 이번 컨텍스트에서 task 호출에 실제로 쓰인 모델 (캐시 적중 등으로 기록이 없으면 기본 모델)
+    last = model_router.last_route()
+    return last['model'] if last and last['task'] == task else _router.route(task)['model']
+
+def set_client(client):
+    global _client
+    _client = client
+
+def set_client_provider(provider):
+    # 호출할 때마다 provider() 로 클라이언트를 얻는다 (resources.gemini_client: 최초 사용 시 생성 + health check)
+    global _client_provider
+    _client_provider = provider
+
+def get_client():
+    # 주입된 클라이언트가 없으면 환경변수 GEMINI_API_KEY 로 프로세스 공용 클라이언트 사용 (CLI)
+    if _client is not None: return _client
+    if _client_provider is not None: return _client_provider()
+    return resources.gemini_client(os.environ["GEMINI_API_KEY"])
+
+def set_response_cache(cache):
+    global _response_cache
+    _response_cache = cache
+
+def get_response_cache():
+    global _response_cache
+    if _response_cache is None: _response_cache = ResponseCache()
+    return _response_cache
+
+def set_rate_limiter(limiter, on_wait=None):
+    # 실제 API 호출 직전에 limiter.acquire() (캐시 적중은 제한 대상 아님)
+    # on_wait(초): 토큰이 없어 기다려야 할 때 호출 (진행 상황 표시용)
+    global _rate_limiter, _on_throttle
+    _rate_limiter, _on_throttle = limiter, on_wait
+
+def _can_hedge():
+    # 헤지 요청은 호출 한도에 여유가 있을 때만 (기다려서까지 보내지 않음)
+    return _rate_limiter is None or _rate_limiter.available() >= 1
+
+def _throttle():
+    if _rate_limiter is None: return
+    wait = _rate_limiter.try_acquire()
+    if wait == 0.0: return
+    if _on_throttle is not None: _on_throttle(wait)
+    with tracing.span("llm.throttle", wait_s=round(wait, 2)):
+        _rate_limiter.acquire()
+
+
+# ==========================================
+# LLM 호출
+# ==========================================
+def _generate_config(types, config, timeout):
+    # 호출 제한 시간은 HTTP 요청 timeout 으로 (ms)
+    return types.GenerateContentConfig(**config, http_options=types.HttpOptions(timeout=int(timeout * 1000)))
+
+def call_model(prompt, stage="llm.call", validate=None, **config):
+    # generate_content 단일 진입점 (응답 캐시 + 작업별 모델 라우팅). 반환: (text, cache_hit)
+    # stage: 계측 단계 이름 (llm.metadata / llm.map / llm.minutes ...), "llm." 뒤가 라우팅 작업 이름
+    # validate(text): 응답이 쓸 수 없으면 예외 → 대체 모델로 재시도, 캐시에 저장하지 않음
+    from google.genai import types
+
+    task = stage.split(".", 1)[-1]
+    route = _router.route(task)
+
+    def send(model, timeout):
+        _throttle()
+        response = get_client().models.generate_content(
+            model=model, contents=prompt, config=_generate_config(types, config, timeout)
+        )
+        tracing.annotate_usage(getattr(response, 'usage_metadata', None))
+        if not response.text: raise ValueError(f"{model}: 빈 응답")
+        if validate: validate(response.text)
+        return response.text
+    # 캐시 키는 작업의 기본 모델 기준 (대체 모델 응답도 같은 요청의 답으로 저장)
+    with tracing.span(stage, model=route['model']) as rec:
+        text, hit = get_response_cache().get_or_call(
+            route['model'], prompt, config, lambda: _router.call(task, send, try_hedge=_can_hedge)
+        )
+        rec['cache_hit'] = hit
+        tracing.annotate(bytes_out=len(prompt.encode('utf-8')), bytes_in=len((text or "").encode('utf-8')))
+    return text, hit
+
+def summarize_window(prompt):
+    # map 단계: 구간 하나를 JSON 으로 요약 (long_transcript.condense_script 에서 병렬 호출)
+    text, _ = call_model(prompt, stage="llm.map", response_mime_type="application/json", temperature=0.2)
+    return text
+
+
+# ==========================================
+# RAG
+# ==========================================
+def _upload_parts(f):
+    # Streamlit UploadedFile 또는 (name, bytes) 튜플
+    return (f.name, f.getvalue()) if hasattr(f, "getvalue") else (f[0], f[1])
+
+def load_rag_chunks(personal_files=None, upload_cache=None, rag_dir=None):
+    """공용 자료(프로세스 캐시) + 개인 자료(upload_cache 에 해시별 캐시)
+    반환: (chunks, file_list, key) — key 가 같으면 같은 색인
+    """
+    cache = get_corpus_cache()
+    chunks, file_list, key = cache.load_dir(rag_dir or RAG_DIR)
+    digests = []
+    for f in personal_files or []:
+        try:
+            name, data = _upload_parts(f)
+            digest, up_chunks = cache.load_upload(name, data, upload_cache if upload_cache is not None else {})
+            chunks = chunks + up_chunks
+            digests.append(digest)
+            file_list.append(f"[개인] {name}")
+        except UnicodeDecodeError:
+            tracing.annotate(skipped_upload=name)   # 텍스트(UTF-8)가 아닌 파일은 건너뜀
+    return chunks, file_list, (key, tuple(digests))
+
+@tracing.traced("rag.load")
+def load_rag_data(personal_files=None, upload_cache=None, rag_dir=None):
+    """반환: (RagIndex, file_list). 공용 자료만이면 프로세스 공용 색인을 재사용"""
+    chunks, file_list, key = load_rag_chunks(personal_files, upload_cache, rag_dir)
+    tracing.annotate(bytes_in=sum(len(c['text'].encode('utf-8')) for c in chunks), chunks=len(chunks))
+    if not key[1]: return get_corpus_cache().get_index(key[0], chunks), file_list
+    return RagIndex(chunks), file_list
+
+@tracing.traced("rag.select")
+def select_terms(rag_index, query):
+    # 스크립트에 언급된 용어 정의만 (많이 언급된 순으로 예산까지)
+    picked, used = [], 0
+    for entry, _ in rag_index.glossary.match(query):
+        cost = estimate_tokens(entry['text'])
+        if used + cost > SETTINGS["GLOSSARY_TOKEN_BUDGET"]: continue
+        picked.append(entry)
+        used += cost
+    tracing.annotate(terms=len(picked), term_tokens=used)
+    return picked
+
+def build_rag_context(rag_index, query):
+    # 용어집은 언급된 용어만, 그 외 자료는 스크립트와 관련된 상위 청크만 토큰 예산 내에서 선택
+    terms = select_terms(rag_index, query)
+    chunks = rag_index.select(query, k=SETTINGS["RAG_TOP_K"], token_budget=SETTINGS["RAG_TOKEN_BUDGET"])
+    return "\n\n".join(p for p in (format_glossary(terms), format_context(chunks)) if p)
+
+
+# ==========================================
+# 메타데이터 분석
+# ==========================================
+META_FIELDS = {
+    "title": ('title', '"주제"'),
+    "date": ('date(YYYY-MM-DD)', '"2024-01-01"'),
+    "attendees": ("attendees(List[String])", '["이름1", "참석자 2"]'),
+}
+
+def analyze_script_metadata(script_text):
+    # 1) 정규식 기반 로컬 추출 (ms 단위). 신뢰도가 충분하면 LLM 생략
+    local = extract_metadata(script_text)
+    meta = {k: local[k] for k in META_FIELDS}
+    if local['confidence'] >= SETTINGS["META_CONFIDENCE"] and not local['missing']:
+        return dict(meta, source="local")
+
+    # 2) 신뢰도가 낮으면 빈 필드만 LLM 에 요청 (모두 비었으면 전체)
+    fields = local['missing'] or list(META_FIELDS)
+    prompt = f"""
+    아래 회의 스크립트를 분석하여 JSON 형식으로 정보를 추출하세요.
+    [추출 항목] {", ".join(META_FIELDS[f][0] for f in fields)}
+    - attendees: 실명 위주, 없으면 '참석자 1' 형태 유지.
+    [SCRIPT] {metadata_excerpt(compact_transcript(script_text, alias="참석자 {n}")[0])}
+    [OUTPUT JSON] {{{", ".join(f'"{f}": {META_FIELDS[f][1]}' for f in fields)}}}
+    """
+    error = ""
+    try:
+        text, _ = call_model(prompt, stage="llm.metadata", response_mime_type="application/json")
+        found = json.loads(text.strip())
+        for f in fields:
+            if found.get(f): meta[f] = found[f]
+        source = "llm" if len(fields) == len(META_FIELDS) else "mixed"
+    except Exception as e:
+        # 기본/대체 모델 모두 실패하면 로컬 추출 결과로 진행하되 원인은 남긴다
+        source, error = "local", f"{type(e).__name__}: {e}"
+    if not meta['date']: meta['date'] = str(datetime.date.today())
+    return dict(meta, source=source, **({'error': error} if error else {}))
+
+def detect_speaker_count(script):
+    # script: 문자열 또는 TranscriptIndex (파일 업로드 시 이미 만든 색인을 그대로 사용)
+    if isinstance(script, TranscriptIndex): return script.speaker_count()
+    patterns = re.findall(r'참석자\s?(\d+)', script)
+    if patterns: return min(max(map(int, patterns)), 30)
+    return 0
+
+
+# ==========================================
+# 회의록 생성
+# ==========================================
+@tracing.traced("script.prepare")
+def prepare_script(script, mapping=None, mapping_str="", alias="S{n}"):
+    """압축(화자 매칭 로컬 적용, 추임새/타임스탬프 제거) 후 길면 map-reduce 요약
+    반환: (프롬프트용 스크립트, {'before', 'after', 'turns', 'windows'})
+    """
+    prepared, stats = compact_transcript(script, mapping, alias=alias)
+    stats['windows'] = 0
+    if is_long(prepared, SETTINGS["LONG_SCRIPT_TOKENS"]):
+        prepared, stats['windows'] = condense_script(
+            prepared, summarize_window, mapping_str, SETTINGS["MAP_WINDOW_TOKENS"], 2, SETTINGS["MAP_WORKERS"]
+        )
+    tracing.annotate(tokens_before=stats['before'], tokens_after=stats['after'], windows=stats['windows'])
+    return prepared, stats
+
+# 회의록은 화자/헤더 자리표시자가 들어간 "템플릿"으로 생성하고, 이름·제목·날짜는 render_minutes 에서 채운다
+# → 화자 매칭이나 기본 정보를 고쳐도 모델을 다시 호출하지 않고 즉시 다시 그릴 수 있다
+SPEAKER_ALIAS = "[[S{n}]]"
+# 자리표시자 바로 뒤의 조사도 함께 읽어 채운 이름의 받침에 맞춘다 ("[[S1]]이" → "김철수가" / "박영훈이")
+PLACEHOLDER_RE = re.compile(r'\[\[\s*(S\s?\d+|TITLE|DATE|ATTENDEES)\s*\]\](이나|이랑|으로|[이가은는을를과와로])?', re.IGNORECASE)
+PARTICLE_PAIRS = (("이나", "나"), ("이랑", "랑"), ("으로", "로"), ("이", "가"), ("은", "는"), ("을", "를"), ("과", "와"))
+ATTENDEE_LABEL_RE = re.compile(r'^참석자\s?(\d+)$')
+
+def structured_mode(custom_prompt=""):
+    # 커스텀 출력 형식(20자 초과)은 자유 마크다운이므로 구조화 출력을 쓰지 않는다
+    return SETTINGS["STRUCTURED_MINUTES"] and not (custom_prompt and len(custom_prompt) > 20)
+
+def minutes_config(structured):
+    if not structured: return MINUTES_CONFIG
+    return dict(MINUTES_CONFIG, response_mime_type="application/json", response_schema=minutes_schema.MINUTES_SCHEMA)
+
+@tracing.traced("prompt.build")
+def build_minutes_prompt(info, script, mapping="", rag_data="", custom_prompt=""):
+    today = datetime.date.today().strftime("%Y-%m-%d")
+    attendees_str = ", ".join(info['attendees'])
+    output_format = """
+# [OUTPUT FORMAT] (Markdown)
+# 📑 [[TITLE]]
+> **📅 일시:** [[DATE]]    
+> **👥 참석자:** [[ATTENDEES]]    
+> **🏢 작성:** AI Assistant
+---
+### 1. 요약
+* [내용]
+### 2. 주요 결정사항
+* [내용]
+### 3. Action Item
+| 담당 | 할일 | 기한 |
+| :--- | :--- | :--- |
+| [이름 또는 [[S1]]] | [내용] | [날짜] |
+---
+# [SLACK MESSAGE]
+🚨 **[공유] [[TITLE]]**
+> 요약: [내용]
+**✅ 결정:** [내용]
+    """
+    if custom_prompt and len(custom_prompt) > 20: output_format = custom_prompt
+    structured = structured_mode(custom_prompt)
+    # 구조화 출력: 제목/일시/참석자는 로컬에서 채우므로 내용 필드만 요청
+    if structured: output_format = minutes_schema.OUTPUT_GUIDE
+    mapping_txt = f" / 3. 매칭: {mapping}" if mapping else ""
+    full_prompt = f"""
+# [ROLE] 전문 회의록 비서. RAG 지식 기반 작성.
+# [RAG] {rag_data}
+# [INPUT] 1. 작성일: {today} / 2. 정보: {info['title']} / {info['date']} / {attendees_str}{mapping_txt} / {4 if mapping else 3}. 스크립트: {script}
+# [RULES] 1. Action Item 담당자 뒤에 팀명 추측 금지. 2. 할루시네이션 금지.
+3. 스크립트의 [[S1]] 같은 화자 표기는 실명으로 바꾸지 말고 그대로 쓸 것.{"" if structured else " 4. 회의 제목/일시/참석자 명단 자리에는 [[TITLE]] / [[DATE]] / [[ATTENDEES]] 를 그대로 쓸 것."}
+{output_format}
+    """
+    return full_prompt
+
+def generate_minutes(info, script, mapping, rag_data="", custom_prompt=""):
+    # 반환: 모델 응답 원문 (구조화 모드면 JSON) → minutes_template 으로 템플릿 변환
+    full_prompt = build_minutes_prompt(info, script, mapping, rag_data, custom_prompt)
+    structured = structured_mode(custom_prompt)
+    try:
+        text, _ = call_model(full_prompt, stage="llm.minutes", validate=minutes_schema.validate_minutes if structured else None,
+                             **minutes_config(structured))
+        return text
+    except Exception as e: return f"Error: {e}"
+
+def stream_minutes(info, script, mapping, rag_data="", custom_prompt=""):
+    # generate_minutes 의 스트리밍 버전: 도착하는 텍스트 조각을 순서대로 yield
+    # 캐시 적중 시 저장된 전체 결과를 한 번에 반환, 미스면 스트리밍 완료 후 저장
+    # 첫 조각이 오기 전에 실패하면 대체 모델로 다시 스트리밍 (이미 일부를 보냈으면 전환하지 않음)
+    from google.genai import types
+
+    route = _router.route("minutes")
+    structured = structured_mode(custom_prompt)
+    config = minutes_config(structured)
+    full_prompt = build_minutes_prompt(info, script, mapping, rag_data, custom_prompt)
+    cache = get_response_cache()
+    key = make_key(route['model'], full_prompt, config)
+    cached = cache.get(key)
+    if cached is not None:
+        tracing.get_tracer().emit({'ts': time.time(), 'stage': "llm.stream", 'user': tracing.current_user(),
+                                   'model': route['model'], 'cache_hit': True, 'ms': 0.0})
+        yield cached; return
+    # 제너레이터는 호출자 쪽에서 yield 사이에 다른 span 이 열릴 수 있으므로 레코드를 직접 만든다
+    rec = {'ts': time.time(), 'stage': "llm.stream", 'user': tracing.current_user(), 'model': route['model'],
+           'cache_hit': False, 'bytes_out': len(full_prompt.encode('utf-8')), 'bytes_in': 0}
+    started = time.perf_counter()
+    buf, usage, first_error = "", None, None
+    models = [route['model']] + ([route['fallback']] if route['fallback'] and route['fallback'] != route['model'] else [])
+    try:
+        for model in models:
+            try:
+                _throttle()
+                # 스트리밍의 timeout 은 조각 사이 최대 대기 시간으로 작동
+                for chunk in get_client().models.generate_content_stream(
+                    model=model, contents=full_prompt, config=_generate_config(types, config, route['deadline'])
+                ):
+                    usage = getattr(chunk, 'usage_metadata', None) or usage
+                    if chunk.text:
+                        if not buf: rec['ttft_ms'] = round((time.perf_counter() - started) * 1000, 2)
+                        buf += chunk.text
+                        yield chunk.text
+                info = _router.mark("minutes", model, "fallback" if first_error else "primary", first_error)
+                rec.update(route_path=info['path'], model_used=model, primary_error=info.get('primary_error'))
+                # 읽을 수 없는 구조화 응답은 저장하지 않고 오류로 끝낸다 (이미 보낸 조각이 있어 재시도 없음)
+                if structured: minutes_schema.validate_minutes(buf)
+                if buf: cache.put(key, buf)
+                break
+            except Exception as e:
+                if buf or model == models[-1]: raise
+                first_error = e
+    except Exception as e:
+        rec['error'] = f"{type(e).__name__}: {e}"
+        yield f"{ERROR_MARK}{e}"
+    finally:
+        rec['ms'] = round((time.perf_counter() - started) * 1000, 2)
+        rec['bytes_in'] = len(buf.encode('utf-8'))
+        if usage is not None:
+            rec.update(prompt_tokens=getattr(usage, 'prompt_token_count', None) or 0,
+                       response_tokens=getattr(usage, 'candidates_token_count', None) or 0)
+        tracing.get_tracer().emit({k: v for k, v in rec.items() if v is not None})
+
+SLACK_MARKER = "# [SLACK MESSAGE]"
+
+def split_minutes(res, partial=False):
+    # 문서 / 슬랙 메시지 분리. partial=True 면 스트리밍 도중: 끝에 걸친 마커 일부는 숨긴다.
+    if SLACK_MARKER in res:
+        d, s = res.split(SLACK_MARKER, 1)
+        return d.strip(), s.strip()
+    if partial:
+        for n in range(len(SLACK_MARKER) - 1, 0, -1):
+            if res.endswith(SLACK_MARKER[:n]): return res[:-n].strip(), ""
+        return res.strip(), ""
+    return res.strip(), "파싱 실패 (또는 슬랙 메시지 없음)"
+
+ERROR_MARK = "\n\nError: "
+
+def minutes_template(raw, structured, partial=False):
+    """모델 응답 → 자리표시자가 든 마크다운 템플릿 (render_minutes 입력)
+    구조화 모드면 JSON(스트리밍 중이면 미완성 JSON)을 읽어 로컬에서 문서/슬랙 메시지를 만든다.
+    """
+    if not structured or raw.startswith("Error:"): return raw
+    body, sep, error = raw.partition(ERROR_MARK)
+    if partial or sep:
+        template = minutes_schema.render_template(minutes_schema.parse_minutes(body), SLACK_MARKER, partial=True)
+        return template + (ERROR_MARK + error if sep else "")
+    try:
+        return minutes_schema.render_template(minutes_schema.validate_minutes(body), SLACK_MARKER)
+    except ValueError as e:
+        return f"Error: {e}"
+
+def format_mapping(mapping):
+    return "\n".join(f"- 참석자 {n} → {name}" for n, name in sorted(mapping.items()) if name)
+
+def _final_consonant(word):
+    """마지막 글자의 받침 번호 (0: 없음, 8: ㄹ). 한글 음절이 아니면 None"""
+    ch = word.rstrip()[-1:]
+    return (ord(ch) - 0xAC00) % 28 if '가' <= ch <= '힣' else None
+
+def attach_particle(word, particle, next_char=""):
+    """word 뒤에 받침에 맞는 조사를 붙인다 (이/가, 은/는, 을/를, 과/와, 이나/나, 이랑/랑, 으로/로)
+    받침을 알 수 없는 단어(영문, 숫자 등)는 모델이 쓴 조사를 그대로 둔다.
+    """
+    final = _final_consonant(word)
+    if not particle or final is None: return word + (particle or "")
+    if particle == "이" and '가' <= next_char <= '힣':
+        # 서술격 조사 '이다/이고/이며' 는 받침이 없으면 생략 ("철수이고" → "철수고")
+        return word + ("이" if final else "")
+    for full, short in PARTICLE_PAIRS:
+        if particle in (full, short):
+            if full == "으로": return word + (short if final in (0, 8) else full)
+            return word + (full if final else short)
+    return word + particle
+
+def _fill_placeholders(text, speaker, values=None):
+    # values 가 없으면 화자 자리표시자만 채운다
+    def repl(m):
+        key = m.group(1).upper().replace(" ", "")
+        if key.startswith("S"): word = speaker(int(key[1:]))
+        elif values is None: return m.group(0)
+        else: word = values[key]
+        return attach_particle(word, m.group(2), m.string[m.end():m.end() + 1])
+    return PLACEHOLDER_RE.sub(repl, text)
+
+def _speaker_names(mapping):
+    mapping = {int(k): v for k, v in (mapping or {}).items() if v}
+    return lambda n: mapping.get(n) or f"참석자 {n}"
+
+def render_data(data, mapping=None):
+    """구조화 결과(dict)의 화자 자리표시자([[S1]])를 이름으로 바꾼 사본 (JSON 저장/보관용, 없으면 None)"""
+    if data is None: return None
+    speaker = _speaker_names(mapping)
+
+    def fill(value):
+        if isinstance(value, str):
+            return _fill_placeholders(value, speaker)
+        if isinstance(value, list): return [fill(v) for v in value]
+        if isinstance(value, dict): return {k: fill(v) for k, v in value.items()}
+        return value
+    return fill(data)
+
+def render_minutes(template, info, mapping=None, partial=False):
+    """템플릿의 자리표시자를 현재 화자 매칭/기본 정보로 채워 (문서, 슬랙 메시지) 반환 (모델 호출 없음)
+    mapping: {번호: 이름} — 매칭이 없는 화자는 '참석자 N'
+    """
+    speaker = _speaker_names(mapping)
+
+    def attendee(name):
+        m = ATTENDEE_LABEL_RE.match(name.strip())
+        return speaker(int(m.group(1))) if m else name
+
+    values = {
+        'TITLE': info.get('title', ''), 'DATE': info.get('date', ''),
+        'ATTENDEES': ", ".join(attendee(a) for a in info.get('attendees', [])),
+    }
+
+    # 스트리밍 도중이면 끝에 걸친 미완성 자리표시자('[[S')는 숨긴다
+    if partial: template = re.sub(r'\[\[[^\]\n]{0,12}\]?$', '', template)
+    return split_minutes(_fill_placeholders(template, speaker, values), partial=partial)
+
+def run_minutes(script, info=None, mapping=None, custom_prompt="", rag_index=None):
+    """분석 → 전처리 → RAG → 생성을 한 번에 (CLI 용, 오류는 예외로 전달)
+    반환: {'info', 'doc', 'slack', 'template', 'stats', 'data', 'model', 'prompt_key'}
+    data: 구조화 모드의 JSON 결과 (summary / decisions / action_items / slack_summary, 담당자는 이름으로), 아니면 None
+    """
+    info = dict(info or {})
+    if not all(info.get(k) for k in META_FIELDS):
+        meta = analyze_script_metadata(script)
+        for k in META_FIELDS:
+            if not info.get(k): info[k] = meta[k]
+    prepared, stats = prepare_script(script, alias=SPEAKER_ALIAS)
+    if rag_index is None: rag_index, _ = load_rag_data()
+    rag_text = build_rag_context(rag_index, f"{info['title']}\n{prepared}")
+    structured = structured_mode(custom_prompt)
+    config = minutes_config(structured)
+    full_prompt = build_minutes_prompt(info, prepared, "", rag_text, custom_prompt)
+    raw, _ = call_model(full_prompt, stage="llm.minutes", validate=minutes_schema.validate_minutes if structured else None, **config)
+    data = minutes_schema.validate_minutes(raw) if structured else None
+    template = minutes_template(raw, structured)
+    doc, slack = render_minutes(template, info, mapping)
+    return {'info': info, 'doc': doc, 'slack': slack, 'template': template, 'stats': stats, 'data': render_data(data, mapping),
+            'model': route_model("minutes"), 'prompt_key': make_key(_router.route("minutes")['model'], full_prompt, config)}
@@ -0,0 +1,136 @@
+"""
+RAG 코퍼스 캐시 (프로세스 공용)
+- rag/*.txt 파일은 (mtime, size) 가 바뀐 파일만 다시 읽고 청크로 분할
+- 개인 업로드는 세션별로 내용 해시 기준 캐시
+- 메모리 상한을 넘으면 가장 오래 안 쓴 항목부터 제거 (LRU)
+Streamlit 은 스크립트만 매번 재실행하고 import 된 모듈은 유지하므로
+모듈 전역 인스턴스가 모든 세션에서 공유된다.
+"""
+import glob
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from rag_index import RagIndex, chunk_document
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+MAX_INDEXES = 8
+
+
+def _entry_bytes(content, chunks):
+    return sys.getsizeof(content) + sum(sys.getsizeof(c['text']) + 200 for c in chunks)
+
+
+class CorpusCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._files = OrderedDict()     # path -> {'sig', 'content', 'chunks', 'nbytes'}
+        self._indexes = OrderedDict()   # 파일 시그니처 튜플 -> RagIndex
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = self.misses = self.evictions = 0
+
+    # ------------------------------------------
+    # 공용 파일
+    # ------------------------------------------
+    def load_file(self, path, source):
+        """파일 하나의 캐시 항목 반환. 변경된 경우에만 다시 읽는다."""
+        st_ = os.stat(path)
+        sig = (st_.st_mtime_ns, st_.st_size)
+        with self._lock:
+            entry = self._files.get(path)
+            if entry and entry['sig'] == sig:
+                self._files.move_to_end(path)
+                self.hits += 1
+                return entry
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        chunks = chunk_document(content, source)
+        entry = {
+            'sig': sig, 'content': content, 'chunks': chunks,
+            'nbytes': _entry_bytes(content, chunks),
+        }
+        with self._lock:
+            old = self._files.pop(path, None)
+            if old: self._bytes -= old['nbytes']
+            self._files[path] = entry
+            self._bytes += entry['nbytes']
+            self.misses += 1
+            self._evict()
+        return entry
+
+    def load_dir(self, rag_dir, label="공용"):
+        """디렉터리의 *.txt 전체. 반환: (chunks, file_list, key)
+        key 는 (path, mtime, size) 튜플로, 색인 캐시 키로 쓴다.
+        """
+        chunks, file_list, key = [], [], []
+        if not os.path.isdir(rag_dir): return chunks, file_list, tuple(key)
+        for file_path in sorted(glob.glob(os.path.join(rag_dir, "*.txt"))):
+            name = os.path.basename(file_path)
+            try:
+                entry = self.load_file(file_path, f"{label}: {name}")
+            except (OSError, UnicodeDecodeError):
+                continue
+            chunks += entry['chunks']
+            file_list.append(f"[{label}] {name}")
+            key.append((file_path,) + entry['sig'])
+        return chunks, file_list, tuple(key)
+
+    def get_index(self, key, chunks):
+        """같은 파일 구성이면 BM25 색인을 다시 만들지 않는다."""
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+        index = RagIndex(chunks)
+        with self._lock:
+            self._indexes[key] = index
+            while len(self._indexes) > MAX_INDEXES:
+                self._indexes.popitem(last=False)
+        return index
+
+    # ------------------------------------------
+    # 개인 업로드 (세션별)
+    # ------------------------------------------
+    @staticmethod
+    def load_upload(name, data, session_cache, label="개인"):
+        """session_cache: 세션 전용 dict (st.session_state 안에 둔다)
+        반환: (digest, chunks). 디코딩 실패 시 UnicodeDecodeError.
+        """
+        digest = hashlib.sha1(data).hexdigest()
+        chunks = session_cache.get(digest)
+        if chunks is None:
+            chunks = chunk_document(data.decode("utf-8"), f"{label}: {name}")
+            session_cache[digest] = chunks
+        return digest, chunks
+
+    # ------------------------------------------
+    # 메모리 관리
+    # ------------------------------------------
+    def _evict(self):
+        while self._bytes > self.max_bytes and len(self._files) > 1:
+            _, old = self._files.popitem(last=False)
+            self._bytes -= old['nbytes']
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._files.clear()
+            self._indexes.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'files': len(self._files), 'indexes': len(self._indexes), 'bytes': self._bytes,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+            }
+
+
+_cache = CorpusCache()
+
+def get_corpus_cache():
+    return _cache
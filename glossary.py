@@ -0,0 +1,167 @@
+"""
+용어집 매처
+- [Term]/[Group] 청크를 용어 사전으로 변환
+  · [Term] CPO (Charge Point Operator / 충전 사업자) → 이름 CPO, 별칭 Charge Point Operator, 충전 사업자
+  · 하위 항목 "- CDD (Commercial DD): ..." 의 약어도 상위 용어의 별칭
+  · [Group] 목록은 줄마다 별도 항목 ("- SK일렉링크 (에스케이일렉링크, 구 SSCharger)")
+- 모든 별칭으로 Aho-Corasick 오토마톤을 한 번 만들고 스크립트를 한 번만 훑어 언급된 용어를 찾는다
+- 프롬프트에는 실제로 언급된 용어의 정의만 넣는다
+"""
+import re
+from collections import deque
+
+BLOCK_RE = re.compile(r'^\[(Term|Group)\]\s*', re.IGNORECASE)
+PAREN_RE = re.compile(r'^(.*?)\s*\((.*)\)\s*$')
+SUBITEM_RE = re.compile(r'^\s+-\s*([^:()]+?)\s*(?:\(([^)]*)\))?\s*:')
+ITEM_RE = re.compile(r'^-\s*(.+?)\s*$')
+MIN_ALIAS = 2
+SHORT_HANGUL = 2        # 이 길이 이하 한글 별칭은 뒤쪽 경계 확인 (앞은 합성어 "현장실사" 가 있어 확인하지 않음)
+HANGUL_RE = re.compile(r'[가-힣]+')
+# 짧은 한글 별칭 뒤에 허용하는 조사 / '하다'·'되다' 활용 ("실사를", "실사에서도", "실사했다" / "실사용자" 는 제외)
+TRAILING_RE = re.compile(
+    r'(?:에서|으로|까지|부터|에게|한테|처럼|보다|이나|이랑|이라고|라고|하고|은|는|이|가|을|를|의|에|로|와|과|도|만|나|랑)*'
+    r'(?:[하했해한할함합되된됐돼][가-힣]*)?(?![가-힣])'
+)
+
+
+def is_glossary_chunk(chunk):
+    return bool(BLOCK_RE.match(chunk['text']))
+
+def _is_word(ch):
+    return ch.isascii() and ch.isalnum()
+
+def _names(text, sep=r'/'):
+    out = []
+    for part in re.split(rf'\s*[{sep}]\s*', text):
+        part = re.sub(r'^구\s+', '', part.strip())       # "구 SSCharger" (옛 이름)
+        if len(part) >= MIN_ALIAS: out.append(part)
+    return out
+
+def _split_title(title, sep=r'/'):
+    """'이름 (별칭 / 별칭)' → (이름 목록, 괄호 안 목록)"""
+    m = PAREN_RE.match(title)
+    if not m: return _names(title), []
+    return _names(m.group(1)), _names(m.group(2), sep)
+
+
+# ==========================================
+# 사전 구성
+# ==========================================
+def parse_chunk(chunk):
+    """[Term]/[Group] 청크 → 용어 항목 리스트 (청크와 같은 필드 + 'name', 'aliases')"""
+    lines = chunk['text'].splitlines()
+    m = BLOCK_RE.match(lines[0])
+    if not m: return []
+    title = BLOCK_RE.sub('', lines[0]).strip()
+    base = {'source': chunk['source'], 'header': chunk['header']}
+
+    if m.group(1).lower() == "term":
+        names, aliases = _split_title(title)
+        for line in lines[1:]:
+            sub = SUBITEM_RE.match(line)
+            if sub:
+                # 하위 유형 약어 (CDD/FDD/LDD 등) — 괄호 안 풀이는 상위 용어와 겹치므로 제외
+                aliases += [a for a in _names(sub.group(1)) if re.fullmatch(r'[A-Za-z0-9&\-]+', a)]
+        if not names: return []
+        return [dict(base, title=title, name=names[0], aliases=names[1:] + aliases, text=chunk['text'])]
+
+    # [Group]: 목록 한 줄 = 항목 하나. 괄호 안 여러 단어짜리 설명("현대오일뱅크 브랜드")은 별칭이 아님
+    entries = []
+    for line in lines[1:]:
+        item = ITEM_RE.match(line.strip())
+        if not item: continue
+        names, inner = _split_title(item.group(1), sep=r'/,')
+        aliases = [a for a in inner if " " not in a]
+        if not names: continue
+        entries.append(dict(base, title=title, name=names[0], aliases=names[1:] + aliases,
+                            text=f"{item.group(1)} — {title}"))
+    return entries
+
+
+class Automaton:
+    """Aho-Corasick 다중 패턴 매처 (소문자 기준)"""
+
+    def __init__(self, patterns):
+        self.goto, self.fail, self.out = [{}], [0], [[]]
+        for key, payload in patterns:
+            node = 0
+            for ch in key:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({}); self.fail.append(0); self.out.append([])
+                node = nxt
+            self.out[node].append((len(key), payload))
+        # 실패 링크 (BFS)
+        todo = deque(self.goto[0].values())
+        while todo:
+            node = todo.popleft()
+            for ch, nxt in self.goto[node].items():
+                todo.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]: f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def __len__(self):
+        return len(self.goto)
+
+    def finditer(self, text):
+        """(시작, 끝, payload) — text 는 이미 소문자"""
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self.goto[node]: node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for length, payload in self.out[node]:
+                yield i + 1 - length, i + 1, payload
+
+
+class Glossary:
+    def __init__(self, chunks):
+        self.entries = [e for c in chunks if is_glossary_chunk(c) for e in parse_chunk(c)]
+        patterns = []
+        for idx, entry in enumerate(self.entries):
+            seen = set()
+            for alias in [entry['name']] + entry['aliases']:
+                variants = [alias]
+                # 한글 별칭은 띄어쓰기 없는 표기도 ("듀 딜리전스" / "듀딜리전스")
+                if " " in alias and re.search(r'[가-힣]', alias): variants.append(alias.replace(" ", ""))
+                for v in variants:
+                    key = v.lower()
+                    if key in seen: continue
+                    seen.add(key)
+                    patterns.append((key, (idx, v)))
+        self._automaton = Automaton(patterns)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def match(self, text):
+        """스크립트에서 언급된 용어. 반환: [(entry, 언급 횟수)] (많이 언급된 순, 같으면 먼저 나온 순)"""
+        if not text or not self.entries: return []
+        counts, first, hits = {}, {}, set()
+        for start, end, (idx, alias) in self._automaton.finditer(text.lower()):
+            # 영문/숫자 경계: "DD" 가 "CDD" 안에서, "IM" 이 "SIM" 안에서 잡히지 않도록
+            if _is_word(alias[0]) and start > 0 and _is_word(text[start - 1]): continue
+            if _is_word(alias[-1]) and end < len(text) and _is_word(text[end]): continue
+            # 짧은 한글 별칭: 앞은 한글이 아니고 뒤는 조사/활용만 ("실사" 가 "실사용자" 안에서 잡히지 않도록)
+            if len(alias) <= SHORT_HANGUL and HANGUL_RE.fullmatch(alias):
+                if not TRAILING_RE.match(text, end): continue
+            # 3자 이하 영문 약어는 대소문자까지 일치해야 함 (im, pnc 같은 일반 단어 오탐 방지)
+            if len(alias) <= 3 and alias.isascii() and text[start:end] != alias: continue
+            # 같은 위치에서 겹치는 별칭("밸류" / "밸류에이션")은 한 번만
+            if (idx, start) in hits: continue
+            hits.add((idx, start))
+            counts[idx] = counts.get(idx, 0) + 1
+            first.setdefault(idx, start)
+        ranked = sorted(counts, key=lambda i: (-counts[i], first[i]))
+        return [(self.entries[i], counts[i]) for i in ranked]
+
+
+def format_glossary(entries):
+    """선택된 용어 정의를 프롬프트용 텍스트로 (자료별로 묶음)"""
+    by_source = {}
+    for e in entries:
+        by_source.setdefault(e['source'], []).append(e['text'])
+    return "\n\n".join(f"--- [용어집: {src}] ---\n" + "\n\n".join(texts) for src, texts in by_source.items())
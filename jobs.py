@@ -0,0 +1,140 @@
+"""
+백그라운드 작업 큐 (회의록 생성 / 메타데이터 분석)
+- 고정 크기 워커 풀이 FIFO 로 실행 → 프로세스 전체의 동시 Gemini 작업 수 제한
+- lanes={'analysis': 1} 처럼 kind 별 전용 워커를 두면 그 작업은 별도 대기열에서 실행
+  (짧은 분석이 긴 회의록 생성 뒤에서 기다리지 않음, 나머지 kind 는 기본 대기열)
+- submit() 은 즉시 job id 를 반환하고, 화면 재실행/페이지 이동과 무관하게 작업은 끝까지 실행
+- status(job_id): state(queued/running/done/failed), position(대기 순번), 진행 상황, result/error
+- 작업 함수 안에서 report(phase=..., partial=...) 로 진행 상황을 남길 수 있다
+- 대기열이 max_queued 를 넘으면 submit 이 QueueFull 을 던진다 (백프레셔)
+"""
+import contextvars
+import itertools
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+ACTIVE_STATES = ("queued", "running")
+
+_current = contextvars.ContextVar("current_job", default=None)
+
+
+class QueueFull(Exception):
+    pass
+
+
+class JobQueue:
+    def __init__(self, workers=2, max_queued=50, keep_seconds=3600, max_jobs=500, lanes=None):
+        self.workers = workers
+        self.lanes = {"": workers, **(lanes or {})}     # 대기열 이름 -> 워커 수 ("" 는 기본)
+        self.max_queued = max_queued
+        self.keep_seconds = keep_seconds
+        self.max_jobs = max_jobs
+        self._queues = {lane: queue.Queue() for lane in self.lanes}
+        self._jobs = OrderedDict()
+        self._waiting = []          # 대기 중인 job id (순번 계산용)
+        self._threads = {lane: [] for lane in self.lanes}
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+
+    # ------------------------------------------
+    # 제출 / 조회
+    # ------------------------------------------
+    def submit(self, fn, *args, kind="job", **kwargs):
+        """작업 예약 후 job id 반환. 호출 시점의 컨텍스트(계측 사용자 등)에서 실행된다."""
+        with self._lock:
+            if len(self._waiting) >= self.max_queued:
+                raise QueueFull(f"대기 중인 작업이 {len(self._waiting)}건입니다.")
+            job_id = uuid.uuid4().hex[:12]
+            lane = kind if kind in self.lanes else ""
+            self._jobs[job_id] = {
+                'id': job_id, 'kind': kind, 'lane': lane, 'seq': next(self._seq), 'state': "queued", 'phase': "",
+                'created': time.time(), 'started': None, 'finished': None, 'result': None, 'error': "",
+            }
+            self._waiting.append(job_id)
+            self._prune()
+        self._ensure_workers(lane)
+        self._queues[lane].put((job_id, contextvars.copy_context(), fn, args, kwargs))
+        return job_id
+
+    def status(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None: return None
+            s = dict(job)
+            # 순번은 같은 대기열 안에서
+            ahead = self._waiting[:self._waiting.index(job_id)] if job_id in self._waiting else None
+            s['position'] = sum(1 for j in ahead if self._jobs[j]['lane'] == job['lane']) + 1 if ahead is not None else 0
+            return s
+
+    def cancel(self, job_id):
+        # 대기 중인 작업만 취소 가능
+        with self._lock:
+            if job_id not in self._waiting: return False
+            self._waiting.remove(job_id)
+            self._jobs[job_id].update(state="failed", error="취소됨", finished=time.time())
+            return True
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            if job_id in self._jobs: self._jobs[job_id].update(fields)
+
+    def stats(self):
+        with self._lock:
+            states = [j['state'] for j in self._jobs.values()]
+            return {
+                'workers': sum(self.lanes.values()), 'queued': len(self._waiting), 'running': states.count("running"),
+                'done': states.count("done"), 'failed': states.count("failed"),
+            }
+
+    def _prune(self):
+        # 끝난 지 keep_seconds 가 지났거나 max_jobs 를 넘는 오래된 완료 작업 정리
+        now = time.time()
+        for job_id in [j for j, v in self._jobs.items()
+                       if v['finished'] and now - v['finished'] > self.keep_seconds]:
+            del self._jobs[job_id]
+        for job_id in [j for j, v in self._jobs.items() if v['state'] not in ACTIVE_STATES]:
+            if len(self._jobs) <= self.max_jobs: break
+            del self._jobs[job_id]
+
+    # ------------------------------------------
+    # 워커
+    # ------------------------------------------
+    def _ensure_workers(self, lane):
+        with self._lock:
+            threads = self._threads[lane] = [t for t in self._threads[lane] if t.is_alive()]
+            while len(threads) < self.lanes[lane]:
+                name = f"job-{lane}-{len(threads) + 1}" if lane else f"job-worker-{len(threads) + 1}"
+                t = threading.Thread(target=self._run, args=(lane,), daemon=True, name=name)
+                t.start()
+                threads.append(t)
+
+    def _run(self, lane):
+        q = self._queues[lane]
+        while True:
+            job_id, ctx, fn, args, kwargs = q.get()
+            try:
+                with self._lock:
+                    if job_id not in self._waiting: continue      # 취소됨
+                    self._waiting.remove(job_id)
+                    self._jobs[job_id].update(state="running", started=time.time())
+                try:
+                    result = ctx.run(self._call, job_id, fn, args, kwargs)
+                    self.update(job_id, state="done", result=result, finished=time.time())
+                except Exception as e:
+                    self.update(job_id, state="failed", error=f"{type(e).__name__}: {e}", finished=time.time())
+            finally:
+                q.task_done()
+
+    def _call(self, job_id, fn, args, kwargs):
+        token = _current.set((self, job_id))
+        try: return fn(*args, **kwargs)
+        finally: _current.reset(token)
+
+
+def report(**fields):
+    """실행 중인 작업의 진행 상황 기록 (작업 밖에서 호출하면 무시)"""
+    current = _current.get()
+    if current is not None: current[0].update(current[1], **fields)
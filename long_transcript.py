@@ -0,0 +1,158 @@
+"""
+긴 회의록 처리 (map-reduce)
+- 스크립트를 화자 발화('참석자 N:', 'S1:', '이름:') 경계로 나누고, 토큰 한도 안에서 겹침(overlap)을 둔 구간으로 묶는다
+- 각 구간을 스레드 풀에서 동시에 요약 (요약/결정사항/Action Item JSON)
+- 구간 결과를 합쳐 최종 회의록 프롬프트(reduce 1회)의 입력으로 사용
+"""
+import contextvars
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from rag_index import estimate_tokens
+
+# '참석자 N:' 외에 압축 후 별칭('S1:', '[[S1]]:')과 실명 화자('홍길동:')도 발화 경계로 본다
+TURN_RE = re.compile(r'^\s*\[{0,2}(참석자\s?\d+|S\d+|[가-힣]{2,4}(?:\s?[가-힣]{1,3}님?)?|[A-Z][a-zA-Z]{1,15})\]{0,2}\s*[:：]', re.MULTILINE)
+SPEAKER_RE = re.compile(r'참석자\s?(\d+)')
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.?!。…])\s+')
+
+MAP_PROMPT = """
+# [ROLE] 회의록 비서. 긴 회의의 일부 구간({no}/{total})만 보고 핵심을 추출한다.
+# [MAPPING] {mapping}
+# [RULES] 구간에 없는 내용 추측 금지. 화자는 매칭된 이름으로 표기 ([[S1]] 같은 표기는 그대로 유지). 앞뒤 구간과 겹치는 발화가 있을 수 있음.
+# [SCRIPT]
+{text}
+# [OUTPUT JSON] {{"summary": ["핵심 논의"], "decisions": ["결정사항"], "action_items": [{{"owner": "이름", "task": "할일", "due": "기한"}}]}}
+"""
+
+
+# ==========================================
+# 분할
+# ==========================================
+def split_turns(script):
+    """발화 단위 리스트 [{'speaker', 'text'}]. 첫 화자 앞의 텍스트는 speaker=''"""
+    turns, matches = [], list(TURN_RE.finditer(script))
+    head = script[:matches[0].start() if matches else len(script)].strip()
+    if head: turns.append({'speaker': '', 'text': head})
+    for i, m in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(script)
+        label = SPEAKER_RE.sub(lambda n: f"참석자 {n.group(1)}", m.group(1))
+        turns.append({'speaker': label, 'text': script[m.start():end].strip()})
+    return turns
+
+def _hard_split(text, max_tokens):
+    """문장 하나가 한도보다 길면 가운데 근처 공백(없으면 글자)에서 반으로 나누기를 반복"""
+    if estimate_tokens(text) <= max_tokens or len(text) < 2: return [text]
+    mid = len(text) // 2
+    cut = text.rfind(" ", 0, mid)
+    if cut <= 0: cut = mid
+    return _hard_split(text[:cut].strip(), max_tokens) + _hard_split(text[cut:].strip(), max_tokens)
+
+def _pieces(text, max_tokens):
+    """(조각, 앞 구분자). 줄 → 한도 초과 줄은 문장 → 그래도 길면 글자 단위"""
+    for line in text.splitlines():
+        if estimate_tokens(line) <= max_tokens:
+            yield line, "\n"; continue
+        sep = "\n"
+        for sentence in SENTENCE_SPLIT_RE.split(line):
+            for part in _hard_split(sentence, max_tokens):
+                if part:
+                    yield part, sep
+                    sep = " "
+
+def _split_oversized(turn, max_tokens):
+    """한 발화가 구간 한도보다 길면 줄 단위로 쪼갠다 (줄 하나가 넘치면 문장/글자 단위, 예: 줄바꿈 없는 STT)"""
+    pieces, buf, used = [], "", 0
+    for piece, sep in _pieces(turn['text'], max_tokens):
+        cost = estimate_tokens(piece) + 1
+        if buf and used + cost > max_tokens:
+            pieces.append({'speaker': turn['speaker'], 'text': buf})
+            buf, used = "", 0
+        buf, used = (buf + sep + piece if buf else piece), used + cost
+    if buf: pieces.append({'speaker': turn['speaker'], 'text': buf})
+    return pieces
+
+def make_windows(turns, max_tokens=6000, overlap_turns=2):
+    """발화를 토큰 한도 내 구간으로 묶음. 다음 구간은 직전 구간의 마지막 overlap_turns 발화로 시작."""
+    units = []
+    for t in turns:
+        units += _split_oversized(t, max_tokens) if estimate_tokens(t['text']) > max_tokens else [t]
+    windows, cur, cur_tokens = [], [], 0
+    for unit in units:
+        cost = estimate_tokens(unit['text'])
+        if cur and cur_tokens + cost > max_tokens:
+            windows.append(cur)
+            cur = cur[-overlap_turns:] if overlap_turns else []
+            cur_tokens = sum(estimate_tokens(u['text']) for u in cur)
+            # 겹침만으로 한도를 넘으면 겹침을 포기
+            if cur_tokens + cost > max_tokens: cur, cur_tokens = [], 0
+        cur.append(unit)
+        cur_tokens += cost
+    if cur: windows.append(cur)
+    return ["\n".join(u['text'] for u in w) for w in windows]
+
+def is_long(script, threshold_tokens):
+    return estimate_tokens(script) > threshold_tokens
+
+def metadata_excerpt(script, head_chars=5000):
+    """메타데이터 분석용 발췌: 앞부분 + 전체 스크립트에서 찾은 화자 목록"""
+    if len(script) <= head_chars: return script
+    labels = sorted({int(n) for n in SPEAKER_RE.findall(script)})
+    roster = ", ".join(f"참석자 {n}" for n in labels)
+    return f"{script[:head_chars]}\n...(중략)...\n[전체 발화자] {roster}" if roster else script[:head_chars]
+
+
+# ==========================================
+# map / reduce
+# ==========================================
+def _parse_partial(raw):
+    try:
+        data = json.loads(raw.strip())
+        if isinstance(data, dict): return data
+    except (ValueError, AttributeError):
+        pass
+    return {'summary': [raw.strip()] if raw and raw.strip() else [], 'decisions': [], 'action_items': []}
+
+def summarize_windows(windows, llm, mapping="", max_workers=4):
+    """각 구간을 동시에 요약. llm(prompt) -> JSON 문자열. 반환: 구간 순서대로 dict 리스트"""
+    total = len(windows)
+
+    def run(i):
+        prompt = MAP_PROMPT.format(no=i + 1, total=total, mapping=mapping or "-", text=windows[i])
+        try:
+            return _parse_partial(llm(prompt))
+        except Exception as e:
+            # 구간 요약이 실패하면 원문을 그대로 넘겨 reduce 단계에서 다루게 한다
+            return {'summary': [], 'decisions': [], 'action_items': [], 'raw': windows[i], 'error': str(e)}
+
+    # 호출한 쪽의 컨텍스트(계측 사용자/상위 단계)를 구간마다 복사해 워커에서 실행
+    contexts = [contextvars.copy_context() for _ in range(total)]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total))) as pool:
+        return list(pool.map(lambda i: contexts[i].run(run, i), range(total)))
+
+def merge_partials(partials):
+    """구간 결과를 reduce 프롬프트용 노트로 합침 (겹침 구간에서 중복된 결정/할일 제거)"""
+    def norm(x): return re.sub(r'\s+', ' ', str(x)).strip().lower()
+    seen_dec, seen_act, lines = set(), set(), []
+    for i, p in enumerate(partials, 1):
+        lines.append(f"## 구간 {i}/{len(partials)}")
+        for item in p.get('summary', []): lines.append(f"- 논의: {item}")
+        for item in p.get('decisions', []):
+            if norm(item) in seen_dec: continue
+            seen_dec.add(norm(item))
+            lines.append(f"- 결정: {item}")
+        for a in p.get('action_items', []):
+            if not isinstance(a, dict): a = {'task': a}
+            key = (norm(a.get('owner', '')), norm(a.get('task', '')))
+            if key in seen_act: continue
+            seen_act.add(key)
+            lines.append(f"- 할일: {a.get('owner', '')} | {a.get('task', '')} | {a.get('due', '')}")
+        if p.get('raw'): lines.append(f"- 원문(요약 실패):\n{p['raw']}")
+    return "\n".join(lines)
+
+def condense_script(script, llm, mapping="", max_tokens=6000, overlap_turns=2, max_workers=4):
+    """긴 스크립트를 구간 요약 노트로 압축. 반환: (notes, 구간 수)"""
+    windows = make_windows(split_turns(script), max_tokens, overlap_turns)
+    partials = summarize_windows(windows, llm, mapping, max_workers)
+    notes = "[구간별 요약 노트 - 원문이 길어 구간별로 요약됨. 이 노트를 종합해 최종 회의록 작성]\n" + merge_partials(partials)
+    return notes, len(windows)
@@ -0,0 +1,100 @@
+"""
+회의 메타데이터 로컬 추출기 (LLM 호출 전 fast-path)
+- 날짜: 2024년 3월 5일 / 2024-03-05 / 2024.03.05 / 2024/3/5 / 24.03.05
+- 제목: '회의명:', '제목:', '주제:', '안건:' 줄 또는 '회의' 가 들어간 첫 줄
+- 참석자: '참석자: A, B' 명단 줄, 줄머리의 '이름:' 화자 (여러 번, 화자 줄의 일정 비율 이상 발화한 경우만), '참석자 N' 라벨
+  '참석자 N' 라벨뿐이면 실명을 모르는 것이므로 비어 있는 필드로 본다 (LLM 에 실명 요청)
+필드별 가중치로 confidence(0~1)를 계산하고, 비어 있는 필드 목록을 함께 돌려준다.
+"""
+import datetime
+import re
+
+DATE_PATTERNS = [
+    re.compile(r'(\d{4})\s*년\s*(\d{1,2})\s*월\s*(\d{1,2})\s*일'),
+    re.compile(r'(?<!\d)(\d{4})\s*[-./]\s*(\d{1,2})\s*[-./]\s*(\d{1,2})(?!\d)'),
+    re.compile(r'(?<![\d.])(\d{2})\.(\d{1,2})\.(\d{1,2})(?![\d.])'),
+]
+TITLE_RE = re.compile(r'^\s*[#\[]*\s*(?:회의명|회의\s*제목|제목|주제|안건)\s*[\]:：]\s*(.+)$', re.MULTILINE)
+ROSTER_RE = re.compile(r'^\s*(?:참석자|참석|참석 인원|Attendees?)\s*[:：]\s*(.+)$', re.MULTILINE | re.IGNORECASE)
+LABEL_RE = re.compile(r'참석자\s?(\d+)')
+ANY_SPEAKER_RE = re.compile(r'^\s*\[?\S{1,10}(?:\s?\d+)?\]?\s*(?:[\[(][\d:.,]+[\])])?\s*[:：]')
+# 이름 뒤에는 직함/호칭만 허용 ('김철수 팀장:', '홍길동님:'). '예를 들어:' 같은 두 어절 문구는 화자가 아님
+TITLES = r'(?:님|팀장|부장|차장|과장|대리|주임|사원|실장|본부장|상무|전무|이사|대표|사장|매니저|책임|선임|수석|프로|위원|교수|박사|변호사|회계사)님?'
+SPEAKER_RE = re.compile(r'^\s*\[?([가-힣]{2,4}(?:\s?' + TITLES + r')?|[A-Z][a-zA-Z]{1,15}(?: [A-Z][a-zA-Z]{1,15})?)\]?\s*[:：]', re.MULTILINE)
+MIN_SPEAKER_TURNS = 2
+MIN_SPEAKER_SHARE = 0.1     # 화자 줄 중 이 비율 이상 발화해야 실명 화자 ('그래서:' 같은 말버릇 배제)
+NOT_NAMES = {
+    '일시', '날짜', '일자', '시간', '장소', '제목', '주제', '안건', '회의명', '회의', '작성자', '작성',
+    '참석', '참석자', '불참', '요약', '결정', '결론', '비고', '내용', '기타', '사회', '서기', '메모', '참고',
+    # 질의응답 / 진행 역할 (사람 이름 자리에 오지만 실명이 아님)
+    '질문', '답변', '질의', '응답', '사회자', '진행자', '발표자', '청중',
+    'Date', 'Time', 'Title', 'Agenda', 'Note', 'Notes', 'Summary', 'Speaker', 'Question', 'Answer', 'Moderator',
+}
+
+WEIGHTS = {'title': 0.3, 'date': 0.3, 'attendees': 0.4}
+
+
+def _valid_date(y, m, d):
+    y = int(y)
+    if y < 100: y += 2000
+    try:
+        return datetime.date(y, int(m), int(d))
+    except ValueError:
+        return None
+
+def find_date(text):
+    """본문에서 가장 먼저 나오는 유효한 날짜 (YYYY-MM-DD) 또는 None"""
+    best = None
+    for pat in DATE_PATTERNS:
+        for m in pat.finditer(text):
+            date = _valid_date(*m.groups())
+            if date and (best is None or m.start() < best[0]):
+                best = (m.start(), date)
+                break
+    return best[1].isoformat() if best else None
+
+def find_title(text):
+    """명시적 제목 줄이면 (제목, True), 추정이면 (제목, False), 없으면 ('', False)"""
+    m = TITLE_RE.search(text)
+    if m: return m.group(1).strip().strip('#[] '), True
+    for line in text.splitlines()[:5]:
+        line = line.strip().strip('#[] ')
+        if line and '회의' in line and len(line) <= 60 and not ANY_SPEAKER_RE.match(line):
+            return line, False
+    return '', False
+
+def find_attendees(text):
+    """(참석자 목록, 실명 여부)"""
+    roster = ROSTER_RE.search(text)
+    if roster:
+        names = [n.strip() for n in re.split(r'[,/·、]', roster.group(1)) if n.strip()]
+        if names: return names, True
+    counts, total = {}, 0
+    for m in SPEAKER_RE.finditer(text):
+        total += 1
+        name = m.group(1).strip()
+        if name in NOT_NAMES or name.startswith('참석자'): continue
+        counts[name] = counts.get(name, 0) + 1
+    total += len(re.findall(r'^\s*\[?참석자\s?\d+', text, re.MULTILINE))
+    # 여러 번, 화자 줄의 일정 비율 이상 발화한 이름만 (우연히 '이름:' 형태가 된 문장 / 말버릇 배제)
+    named = [n for n, c in counts.items() if c >= max(MIN_SPEAKER_TURNS, MIN_SPEAKER_SHARE * total)]
+    labels = [f"참석자 {n}" for n in sorted({int(x) for x in LABEL_RE.findall(text)})]
+    if named: return named + labels, True
+    return labels, False
+
+def extract_metadata(text, head_chars=8000):
+    """반환: {'title', 'date', 'attendees', 'confidence', 'missing'}"""
+    head = text[:head_chars]
+    title, explicit_title = find_title(head)
+    date = find_date(head)
+    attendees, named = find_attendees(text)
+    score = 0.0
+    if title: score += WEIGHTS['title'] * (1.0 if explicit_title else 0.6)
+    if date: score += WEIGHTS['date']
+    if named: score += WEIGHTS['attendees']
+    # '참석자 N' 라벨만 있으면 실명은 빈 것으로 (값은 라벨 그대로 두어 LLM 실패 시에도 사용)
+    missing = [k for k, v in (('title', title), ('date', date), ('attendees', named)) if not v]
+    return {
+        'title': title, 'date': date or '', 'attendees': attendees,
+        'confidence': round(score, 2), 'missing': missing,
+    }
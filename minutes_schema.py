@@ -0,0 +1,161 @@
+"""
+구조화 회의록 (JSON 스키마 출력)
+- 모델은 MINUTES_SCHEMA 형태의 JSON 만 생성 (요약 / 결정사항 / Action Item(담당, 할일, 기한) / 슬랙 요약)
+- 마크다운 문서와 슬랙 메시지는 여기서 로컬로 만든다 → 형식이 흐트러져 생기는 "파싱 실패" 재생성이 없음
+- 스트리밍 도중의 미완성 JSON 도 parse_partial 로 지금까지 받은 만큼 읽어 미리보기
+- 화자/제목/날짜는 기존과 같은 자리표시자([[S1]], [[TITLE]] ...)로 남겨 core.render_minutes 가 채운다
+"""
+import json
+import re
+
+PARTIAL_PLACEHOLDER_RE = re.compile(r'\[\[[^\]\n]{0,12}\]?$')
+
+# google-genai response_schema (OpenAPI 부분집합, dict 로 두어 응답 캐시 키에도 그대로 사용)
+MINUTES_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "summary": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "decisions": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "action_items": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "owner": {"type": "STRING"},
+                    "task": {"type": "STRING"},
+                    "due": {"type": "STRING"},
+                },
+                "required": ["owner", "task"],
+                "propertyOrdering": ["owner", "task", "due"],
+            },
+        },
+        "slack_summary": {"type": "STRING"},
+    },
+    "required": ["summary", "decisions", "action_items", "slack_summary"],
+    "propertyOrdering": ["summary", "decisions", "action_items", "slack_summary"],
+}
+
+OUTPUT_GUIDE = """
+# [OUTPUT] JSON (스키마 고정)
+- summary: 요약 bullet 문장 목록
+- decisions: 주요 결정사항 문장 목록 (없으면 빈 목록)
+- action_items: [{owner: 담당자 이름 또는 [[S1]], task: 할일, due: 기한 (언급 없으면 빈 문자열)}]
+- slack_summary: 슬랙 공유용 한두 문장 요약
+"""
+
+
+# ==========================================
+# 미완성 JSON 파싱 (스트리밍)
+# ==========================================
+def _closers(stack):
+    return "".join("}" if c == "{" else "]" for c in reversed(stack))
+
+def parse_partial(text):
+    """스트리밍 중인 JSON 앞부분 → 지금까지 완성된 만큼의 dict (읽을 수 없으면 {})
+    쓰는 중인 문자열 값은 받은 데까지 포함하고, 값이 없는 키나 쓰다 만 숫자는 버린다.
+    """
+    text = text[text.find("{"):] if "{" in text else ""       # 앞에 붙은 ```json 등은 무시
+    stack, in_str, esc, key_str, expect_key = [], False, False, False, False
+    safe = None         # (위치, 그때의 괄호 스택): 여기서 자르고 괄호만 닫으면 올바른 JSON
+    for i, ch in enumerate(text):
+        if in_str:
+            if esc: esc = False
+            elif ch == "\\": esc = True
+            elif ch == '"':
+                in_str = False
+                if not key_str: safe = (i + 1, list(stack))
+            continue
+        if ch == '"':
+            in_str, key_str = True, bool(stack) and stack[-1] == "{" and expect_key
+        elif ch in "{[":
+            stack.append(ch)
+            expect_key = ch == "{"
+            safe = (i + 1, list(stack))
+        elif ch in "}]":
+            if stack: stack.pop()
+            expect_key = False
+            safe = (i + 1, list(stack))
+        elif ch == ":":
+            expect_key = False
+        elif ch == ",":
+            safe = (i, list(stack))
+            expect_key = bool(stack) and stack[-1] == "{"
+    candidates = []
+    if in_str and not key_str:
+        body = text[:-1] if esc else text
+        candidates.append(body + '"' + _closers(stack))
+    if safe: candidates.append(text[:safe[0]] + _closers(safe[1]))
+    for candidate in candidates:
+        try:
+            data = json.loads(candidate)
+        except ValueError:
+            continue
+        return data if isinstance(data, dict) else {}
+    return {}
+
+def parse_minutes(text):
+    """완성된(또는 잘린) JSON 응답 → dict. 잘렸어도 읽을 수 있는 만큼은 살린다 (미리보기용)"""
+    try:
+        data = json.loads(text)
+        if isinstance(data, dict): return data
+    except ValueError:
+        pass
+    return parse_partial(text)
+
+def validate_minutes(text):
+    """최종 응답 → dict. 요약/슬랙 요약이 없으면 (잘림, JSON 아님) ValueError
+    빈 회의록이 정상 결과처럼 캐시/보관되지 않도록 생성 직후와 렌더링 전에 확인한다.
+    """
+    data = parse_minutes(text)
+    missing = [k for k in ('summary', 'slack_summary') if k not in data]
+    if missing: raise ValueError(f"구조화 응답을 읽을 수 없습니다 (잘렸거나 JSON 아님, 없는 항목: {', '.join(missing)})")
+    return data
+
+
+# ==========================================
+# 로컬 렌더링
+# ==========================================
+def _cell(value):
+    return str(value or "").replace("|", "\\|").replace("\n", " ").strip()
+
+def _items(values):
+    return [" ".join(str(v).split()) for v in values or [] if str(v).strip()]
+
+def action_items(data):
+    """[{'owner', 'task', 'due'}] (빈 항목 제외)"""
+    out = []
+    for a in data.get('action_items') or []:
+        if isinstance(a, dict) and (a.get('task') or a.get('owner')):
+            out.append({'owner': str(a.get('owner') or ""), 'task': str(a.get('task') or ""), 'due': str(a.get('due') or "")})
+    return out
+
+def render_template(data, slack_marker, partial=False):
+    """구조화 결과 → 자리표시자가 든 마크다운 템플릿 (문서 + 슬랙 마커 + 슬랙 메시지)
+    partial=True 면 아직 도착하지 않은 섹션은 생략
+    """
+    lines = [
+        "# 📑 [[TITLE]]",
+        "> **📅 일시:** [[DATE]]    ",
+        "> **👥 참석자:** [[ATTENDEES]]    ",
+        "> **🏢 작성:** AI Assistant",
+        "---",
+    ]
+    sections = (("summary", "### 1. 요약"), ("decisions", "### 2. 주요 결정사항"))
+    for key, title in sections:
+        if partial and key not in data: break
+        lines.append(title)
+        lines += [f"* {x}" for x in _items(data.get(key))] or ([] if partial else ["* 없음"])
+    if not partial or 'action_items' in data:
+        lines += ["### 3. Action Item", "| 담당 | 할일 | 기한 |", "| :--- | :--- | :--- |"]
+        for a in action_items(data):
+            # 스트리밍 도중 표 안에서 쓰다 만 자리표시자('[[S')는 숨김
+            cells = [PARTIAL_PLACEHOLDER_RE.sub('', _cell(a[k])) if partial else _cell(a[k]) for k in ('owner', 'task', 'due')]
+            lines.append(f"| {cells[0]} | {cells[1]} | {cells[2]} |")
+    # 스트리밍 도중에는 쓰는 중인 내용이 템플릿 끝에 오도록 (render_minutes 가 미완성 자리표시자를 숨김)
+    if partial and 'slack_summary' not in data: return "\n".join(lines)
+    lines.append("---")
+
+    decisions = _items(data.get('decisions'))
+    slack = [slack_marker, "🚨 **[공유] [[TITLE]]**", f"> 요약: {str(data.get('slack_summary') or '').strip()}"]
+    if decisions: slack.append(f"**✅ 결정:** {' / '.join(decisions)}")
+    return "\n".join(lines + slack)
@@ -0,0 +1,157 @@
+"""
+작업별 모델 라우팅 (Streamlit / google-genai 비의존)
+- 작업(metadata / map / minutes)마다 기본 모델, 대체(fallback) 모델, 호출 제한 시간(deadline)을 지정
+- 기본 모델이 실패하거나 제한 시간을 넘기면 대체 모델로 한 번 더 호출
+- hedge=True 인 작업(메타데이터 추출)은 최근 p95 지연이 지나도 응답이 없으면 같은 요청을 한 번 더 보내
+  먼저 도착한 응답을 쓴다 (꼬리 지연 완화, 늦게 온 응답은 버림)
+- 실제로 거친 경로(primary / hedge / fallback)는 현재 계측 단계에 route_path / model_used 로 기록
+
+    router.call("metadata", send)      # send(model, timeout_s) -> text
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import tracing
+
+DEFAULT_MODEL = "gemini-flash-latest"
+
+ROUTES = {
+    # 짧은 JSON 추출: 가볍고 빠른 모델 + 헤지 (첫 분석 클릭의 꼬리 지연)
+    "metadata": {'model': "gemini-flash-lite-latest", 'fallback': DEFAULT_MODEL, 'deadline': 15.0,
+                 'hedge': True, 'hedge_after': 4.0},
+    # 긴 회의 구간 요약 (map)
+    "map": {'model': "gemini-flash-lite-latest", 'fallback': DEFAULT_MODEL, 'deadline': 60.0},
+    # 최종 회의록
+    "minutes": {'model': DEFAULT_MODEL, 'fallback': "gemini-flash-lite-latest", 'deadline': 180.0},
+}
+ROUTE_DEFAULTS = {'model': DEFAULT_MODEL, 'fallback': "", 'deadline': 120.0, 'hedge': False, 'hedge_after': 4.0}
+MIN_HEDGE_SAMPLES = 20      # 이 수 이상 성공 기록이 쌓이면 hedge_after 대신 실측 p95 사용
+MIN_HEDGE_DELAY = 0.5
+
+_last_route = contextvars.ContextVar("last_route", default=None)
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+def _p95(values):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+
+class ModelRouter:
+    def __init__(self, routes=None, hedge_workers=16):
+        self.routes = {task: dict(ROUTE_DEFAULTS, **opts) for task, opts in (routes or ROUTES).items()}
+        self._latency = {}            # (task, model) -> 최근 성공 지연(초)
+        self._counts = {}             # (task, path) -> 횟수
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=hedge_workers, thread_name_prefix="llm-hedge")
+
+    def configure(self, task, **options):
+        """작업별 설정 변경 (모르는 키는 무시, 없는 작업은 기본값으로 새로 만듦)"""
+        route = self.routes.setdefault(task, dict(ROUTE_DEFAULTS))
+        for key, value in options.items():
+            if key in ROUTE_DEFAULTS: route[key] = type(ROUTE_DEFAULTS[key])(value)
+
+    def route(self, task):
+        return self.routes.get(task) or dict(ROUTE_DEFAULTS)
+
+    # ------------------------------------------
+    # 지연 기록 / 통계
+    # ------------------------------------------
+    def _record(self, task, model, seconds):
+        with self._lock:
+            self._latency.setdefault((task, model), deque(maxlen=200)).append(seconds)
+
+    def _count(self, task, path):
+        with self._lock:
+            self._counts[(task, path)] = self._counts.get((task, path), 0) + 1
+
+    def hedge_delay(self, task):
+        """헤지 요청을 보낼 시점(초): 최근 p95, 기록이 적으면 설정값"""
+        route = self.route(task)
+        with self._lock: samples = list(self._latency.get((task, route['model']), ()))
+        if len(samples) < MIN_HEDGE_SAMPLES: return route['hedge_after']
+        return max(MIN_HEDGE_DELAY, _p95(samples))
+
+    def stats(self):
+        with self._lock:
+            latency = {k: list(v) for k, v in self._latency.items()}
+            counts = dict(self._counts)
+        rows = []
+        for task, route in self.routes.items():
+            samples = latency.get((task, route['model']), [])
+            rows.append({
+                'task': task, 'model': route['model'], 'fallback': route['fallback'], 'deadline': route['deadline'],
+                'hedge': route['hedge'], 'n': len(samples), 'p95_s': round(_p95(samples), 2) if samples else None,
+                'paths': {p: n for (t, p), n in counts.items() if t == task},
+            })
+        return rows
+
+    # ------------------------------------------
+    # 호출
+    # ------------------------------------------
+    def _timed(self, task, model, send, timeout):
+        started = time.perf_counter()
+        text = send(model, timeout)
+        self._record(task, model, time.perf_counter() - started)
+        return text
+
+    def _hedged(self, task, model, send, deadline, try_hedge):
+        """기본 요청 후 p95 가 지나도 응답이 없으면 같은 요청을 한 번 더. 반환: (text, 'primary' | 'hedge')"""
+        end = time.monotonic() + deadline
+        ctx = contextvars.copy_context()
+        futures = {self._pool.submit(ctx.run, self._timed, task, model, send, deadline): "primary"}
+        done, _ = wait(futures, timeout=self.hedge_delay(task))
+        if not done and try_hedge():
+            remaining = max(0.1, end - time.monotonic())
+            futures[self._pool.submit(contextvars.copy_context().run, self._timed, task, model, send, remaining)] = "hedge"
+        error = None
+        while futures:
+            done, _ = wait(futures, timeout=max(0.0, end - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done: break
+            for fut in done:
+                path = futures.pop(fut)
+                try: return fut.result(), path
+                except Exception as e: error = e      # 다른 요청이 남아 있으면 그 결과를 기다린다
+        # 남은 요청은 버린다 (HTTP 호출은 자체 timeout 으로 정리됨)
+        raise error or DeadlineExceeded(f"{task}: {deadline:.0f}초 안에 응답 없음")
+
+    def call(self, task, send, try_hedge=lambda: True):
+        """send(model, timeout_s) -> text 를 라우팅 규칙대로 호출. 반환: text
+        try_hedge(): 헤지 요청을 보내도 되면 True (호출 한도 여유 확인용)
+        """
+        route = self.route(task)
+        model, path, first_error = route['model'], "primary", None
+        try:
+            if route['hedge']:
+                text, path = self._hedged(task, model, send, route['deadline'], try_hedge)
+            else:
+                text = self._timed(task, model, send, route['deadline'])
+        except Exception as e:
+            if not route['fallback'] or route['fallback'] == model:
+                self._count(task, "failed"); raise
+            first_error, model, path = e, route['fallback'], "fallback"
+            try: text = self._timed(task, model, send, route['deadline'])
+            except Exception:
+                self._count(task, "failed"); raise
+        info = self.mark(task, model, path, first_error)
+        tracing.annotate(route_path=path, model_used=model, primary_error=info.get('primary_error'))
+        return text
+
+    def mark(self, task, model, path, first_error=None):
+        """거친 경로 기록 (직접 호출하는 스트리밍 등). 반환: last_route() 와 같은 dict"""
+        self._count(task, path)
+        info = {'task': task, 'model': model, 'path': path}
+        if first_error is not None: info['primary_error'] = f"{type(first_error).__name__}: {first_error}"
+        _last_route.set(info)
+        return info
+
+
+def last_route():
+    """현재 컨텍스트에서 마지막으로 라우팅된 호출 {'task', 'model', 'path'[, 'primary_error']} (없으면 None)"""
+    return _last_route.get()
@@ -0,0 +1,153 @@
+"""
+RAG 검색 엔진
+- rag/*.txt 및 개인 업로드 자료를 [Term]/[Group] 블록과 섹션 헤더(#) 단위 청크로 분할
+- [Term]/[Group] 블록은 용어집(glossary.Glossary)으로 분리해 스크립트에 언급된 용어만 사용
+- 나머지 청크는 한글(어절 + 음절 bigram) / 영문(소문자 단어) 토큰 기반 BM25 역색인
+- 스크립트와 관련된 상위 k개 청크만 토큰 예산 안에서 골라 프롬프트에 넣는다
+"""
+import math
+import re
+from collections import Counter, defaultdict
+
+from glossary import Glossary, is_glossary_chunk
+
+BLOCK_RE = re.compile(r'^\[(Term|Group)\]\s*', re.IGNORECASE)
+HEADER_RE = re.compile(r'^(#{1,6})\s+(.*)$')
+LATIN_RE = re.compile(r'[a-z0-9]+(?:[&.\-][a-z0-9]+)*')
+HANGUL_RE = re.compile(r'[가-힣]+')
+MAX_CHUNK_CHARS = 1200
+
+
+# ==========================================
+# 토큰화 / 토큰 수 추정
+# ==========================================
+def tokenize(text):
+    """영문은 소문자 단어, 한글은 어절 + 음절 bigram (조사가 붙어도 매칭되도록)"""
+    text = text.lower()
+    tokens = LATIN_RE.findall(text)
+    for word in HANGUL_RE.findall(text):
+        tokens.append(word)
+        if len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+def estimate_tokens(text):
+    """Gemini 토크나이저 근사치: 한글 1.5자, 그 외 4자당 1토큰"""
+    if not text: return 0
+    hangul = sum(len(w) for w in HANGUL_RE.findall(text))
+    return int(math.ceil(hangul / 1.5 + (len(text) - hangul) / 4))
+
+
+# ==========================================
+# 청크 분할
+# ==========================================
+def _split_long(lines, max_chars):
+    """큰 블록(기업 목록 등)은 줄 단위로 다시 쪼개되, 블록 제목을 각 조각 앞에 유지"""
+    head, body = lines[0], lines[1:]
+    parts, buf, size = [], [], len(head)
+    for line in body:
+        if buf and size + len(line) > max_chars:
+            parts.append([head] + buf)
+            buf, size = [], len(head)
+        buf.append(line)
+        size += len(line) + 1
+    if buf or not parts: parts.append([head] + buf)
+    return parts
+
+def chunk_document(text, source, max_chars=MAX_CHUNK_CHARS):
+    """문서를 [Term]/[Group] 블록 및 섹션 헤더 기준으로 분할
+    반환: [{'source', 'header', 'title', 'text'}, ...]
+    """
+    chunks = []
+    headers = {}
+    state = {'lines': [], 'title': ''}
+
+    def flush():
+        lines = state['lines']
+        while lines and not lines[-1].strip(): lines.pop()
+        if any(l.strip() for l in lines):
+            header = " > ".join(headers[k] for k in sorted(headers))
+            for part in _split_long(lines, max_chars) if len("\n".join(lines)) > max_chars else [lines]:
+                chunks.append({
+                    'source': source, 'header': header,
+                    'title': state['title'], 'text': "\n".join(part).strip(),
+                })
+        state['lines'], state['title'] = [], ''
+
+    for line in text.splitlines():
+        m = HEADER_RE.match(line)
+        if m:
+            flush()
+            level = len(m.group(1))
+            for k in [k for k in headers if k >= level]: del headers[k]
+            headers[level] = m.group(2).strip()
+            continue
+        if BLOCK_RE.match(line):
+            flush()
+            state['title'] = BLOCK_RE.sub('', line).strip()
+        if not state['lines'] and not line.strip(): continue
+        state['lines'].append(line)
+    flush()
+    return chunks
+
+
+# ==========================================
+# BM25 색인
+# ==========================================
+class RagIndex:
+    def __init__(self, chunks, k1=1.5, b=0.75):
+        chunks = list(chunks)
+        # 용어 정의는 Aho-Corasick 매칭으로 (glossary.match), BM25 는 그 외 자료만
+        self.glossary = Glossary(chunks)
+        self.chunks = [c for c in chunks if not is_glossary_chunk(c)]
+        self.k1, self.b = k1, b
+        self.postings = defaultdict(list)   # term -> [(chunk_idx, tf)]
+        self.doc_len = []
+        for i, chunk in enumerate(self.chunks):
+            # 제목/섹션 헤더도 색인에 포함 (용어명 매칭 가중)
+            tf = Counter(tokenize(f"{chunk['title']} {chunk['title']} {chunk['header']}\n{chunk['text']}"))
+            for term, cnt in tf.items():
+                self.postings[term].append((i, cnt))
+            self.doc_len.append(sum(tf.values()))
+        n = len(self.chunks)
+        self.avgdl = (sum(self.doc_len) / n) if n else 0.0
+        self.idf = {
+            term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5))
+            for term, p in self.postings.items()
+        }
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def search(self, query, k=8):
+        """BM25 점수 상위 k개 [(score, chunk), ...]"""
+        if not self.chunks or not query: return []
+        # 긴 스크립트가 질의이므로 질의 측 빈도는 로그 스케일로 완화
+        q_tf = Counter(t for t in tokenize(query) if t in self.postings)
+        scores = defaultdict(float)
+        for term, q_cnt in q_tf.items():
+            idf, weight = self.idf[term], 1 + math.log(q_cnt)
+            for i, tf in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_len[i] / self.avgdl)
+                scores[i] += weight * idf * tf * (self.k1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k]
+        return [(score, self.chunks[i]) for i, score in ranked]
+
+    def select(self, query, k=8, token_budget=2000):
+        """상위 k개 중 토큰 예산 안에 들어가는 청크만 점수 순으로 선택"""
+        picked, used = [], 0
+        for score, chunk in self.search(query, k):
+            cost = estimate_tokens(chunk['text'])
+            if used + cost > token_budget: continue
+            picked.append(chunk)
+            used += cost
+        return picked
+
+
+def format_context(chunks):
+    """선택된 청크를 프롬프트용 텍스트로 변환"""
+    parts = []
+    for c in chunks:
+        label = f"{c['source']}" + (f" / {c['header']}" if c['header'] else "")
+        parts.append(f"--- [{label}] ---\n{c['text']}")
+    return "\n\n".join(parts)
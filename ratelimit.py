@@ -0,0 +1,47 @@
+"""
+토큰 버킷 속도 제한기 (스레드 안전)
+- rate: 초당 보충 토큰 수, capacity: 최대 버스트
+- acquire() 는 토큰이 생길 때까지 대기 (timeout 지정 시 초과하면 False)
+"""
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, rpm, burst=None):
+        return cls(rpm / 60.0, burst if burst is not None else max(1, rpm // 10))
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """즉시 가능하면 소비하고 0, 아니면 필요한 대기 시간(초)을 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens=1, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0: return True
+            if deadline is not None and time.monotonic() + wait > deadline: return False
+            time.sleep(min(wait, 1.0))
+
+    def available(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
@@ -0,0 +1,115 @@
+"""
+프로세스 공용 자원 (Gemini 클라이언트 / HTTP 세션)
+- 처음 사용할 때 생성 (google-genai 같은 무거운 import 도 이때) → 로그인 화면은 가볍게 유지
+- 모든 세션/스레드가 같은 객체를 공유, check_every 초마다 health check 후 실패하면 다시 생성
+- max_age 가 지나면 재생성 (오래된 keep-alive 연결 정리)
+  교체할 때 기존 객체를 닫지 않는다: 다른 스레드가 아직 쓰는 중일 수 있으므로 참조만 바꾸고 정리는 GC 에 맡김
+
+    client = resources.gemini_client(api_key)
+    session = resources.http_session("slack")
+"""
+import threading
+import time
+
+import tracing
+
+
+class LazyResource:
+    def __init__(self, name, factory, check=None, check_every=60, max_age=None):
+        self.name = name
+        self.factory = factory
+        self.check = check
+        self.check_every = check_every
+        self.max_age = max_age
+        self._value = None
+        self._created = self._checked = 0.0
+        self._lock = threading.Lock()
+        self.builds = self.failed_checks = 0
+        self.build_ms = None
+
+    def _healthy(self, now):
+        if self.max_age and now - self._created > self.max_age: return False
+        if self.check is None or now - self._checked < self.check_every: return True
+        self._checked = now
+        try: return bool(self.check(self._value))
+        except Exception: return False
+
+    def get(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._value is not None and not self._healthy(now):
+                self.failed_checks += 1
+                self._value = None
+            if self._value is None:
+                with tracing.span("resource.build", resource=self.name):
+                    started = time.perf_counter()
+                    self._value = self.factory()
+                    self.build_ms = round((time.perf_counter() - started) * 1000, 1)
+                self._created = self._checked = time.monotonic()
+                self.builds += 1
+            return self._value
+
+    def peek(self):
+        return self._value
+
+    def reset(self):
+        # 오류가 난 연결을 버리고 다음 get() 에서 새로 생성 (쓰는 중인 스레드가 있을 수 있어 닫지 않음)
+        with self._lock: self._value = None
+
+    def stats(self):
+        return {
+            'name': self.name, 'alive': self._value is not None, 'builds': self.builds,
+            'failed_checks': self.failed_checks, 'build_ms': self.build_ms,
+            'age': time.monotonic() - self._created if self._value is not None else None,
+        }
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+def resource(key, factory, **options):
+    """key 별로 한 번만 등록 (이미 있으면 기존 것을 반환)"""
+    with _registry_lock:
+        if key not in _registry:
+            _registry[key] = LazyResource(key if isinstance(key, str) else key[0], factory, **options)
+        return _registry[key]
+
+def reset(prefix=None):
+    with _registry_lock: items = list(_registry.items())
+    for key, res in items:
+        name = key if isinstance(key, str) else key[0]
+        if prefix is None or name.startswith(prefix): res.reset()
+
+def stats():
+    with _registry_lock: return [r.stats() for r in _registry.values()]
+
+
+# ==========================================
+# Gemini
+# ==========================================
+def _gemini_alive(client):
+    # 내부 httpx 클라이언트가 닫혔으면 재생성
+    http = getattr(getattr(client, '_api_client', None), '_httpx_client', None)
+    return not getattr(http, 'is_closed', False)
+
+def gemini_client(api_key):
+    def build():
+        from google import genai
+        return genai.Client(api_key=api_key)
+    return resource(("gemini", api_key), build, check=_gemini_alive).get()
+
+
+# ==========================================
+# HTTP (requests)
+# ==========================================
+def http_session(name="default", pool_size=10, max_age=30 * 60):
+    """커넥션 풀을 쓰는 requests.Session (max_age 마다 새로 생성)"""
+    def build():
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    return resource(f"http:{name}", build, max_age=max_age).get()
@@ -0,0 +1,170 @@
+"""
+LLM 응답 캐시 (내용 주소 기반)
+- 키: 완성된 프롬프트 + 모델명 + 생성 설정의 sha256
+- 1차: 메모리 LRU (항목 수/바이트 상한), 2차: SQLite 파일 (선택, 프로세스 재시작 후에도 유지)
+  SQLite 는 크기 합계를 따로 유지해 상한을 넘을 때만 오래 안 쓴 항목을 정리
+- TTL 이 지난 항목은 조회 시 무시하고 정리, 적중/미스 통계 제공
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+def make_key(model, prompt, config=None):
+    payload = json.dumps({'model': model, 'config': config or {}, 'prompt': prompt}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, max_entries=256, max_bytes=32 * 1024 * 1024, ttl=7 * 24 * 3600,
+                 db_path=None, db_max_bytes=256 * 1024 * 1024):
+        self.max_entries, self.max_bytes, self.ttl = max_entries, max_bytes, ttl
+        self.db_path, self.db_max_bytes = db_path, db_max_bytes
+        self._mem = OrderedDict()       # key -> (created, value)
+        self._bytes = 0
+        self._disk_bytes = 0            # SQLite 파일의 size 합계 (쓰기마다 전체를 다시 세지 않도록 유지)
+        self._lock = threading.RLock()
+        self._counts = {'mem_hits': 0, 'disk_hits': 0, 'misses': 0, 'puts': 0, 'evictions': 0}
+        if db_path: self._init_db()
+
+    # ------------------------------------------
+    # SQLite 계층
+    # ------------------------------------------
+    @contextmanager
+    def _db(self):
+        con = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            con.execute("PRAGMA journal_mode=WAL")
+            with con: yield con
+        finally:
+            con.close()
+
+    def _init_db(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with self._db() as con:
+            con.execute("""CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY, value TEXT NOT NULL,
+                created REAL NOT NULL, accessed REAL NOT NULL, size INTEGER NOT NULL)""")
+            con.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+            self._disk_bytes = con.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _disk_get(self, key, now):
+        try:
+            with self._db() as con:
+                row = con.execute("SELECT value, created, size FROM responses WHERE key=?", (key,)).fetchone()
+                if row is None: return None
+                if now - row[1] > self.ttl:
+                    con.execute("DELETE FROM responses WHERE key=?", (key,))
+                    with self._lock: self._disk_bytes -= row[2]
+                    return None
+                con.execute("UPDATE responses SET accessed=? WHERE key=?", (now, key))
+                return row
+        except sqlite3.Error:
+            return None
+
+    def _disk_put(self, key, value, now):
+        size = len(value.encode('utf-8'))
+        try:
+            with self._db() as con:
+                old = con.execute("SELECT size FROM responses WHERE key=?", (key,)).fetchone()
+                con.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)", (key, value, now, now, size))
+                with self._lock:
+                    self._disk_bytes += size - (old[0] if old else 0)
+                    over = self._disk_bytes > self.db_max_bytes
+                if over: self._disk_evict(con, now)
+        except sqlite3.Error:
+            pass
+
+    def _disk_evict(self, con, now, batch=64):
+        # 용량을 넘었을 때만 실행: 만료 항목 삭제 후 실제 합계로 다시 맞추고 (다른 프로세스도 같은 파일에 씀)
+        # 오래 안 쓴 항목부터 accessed 색인 순서로 필요한 만큼만 삭제
+        con.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+        total = con.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        evicted = 0
+        while total > self.db_max_bytes:
+            sizes = [r[0] for r in con.execute("SELECT size FROM responses ORDER BY accessed LIMIT ?", (batch,))]
+            if not sizes: break
+            k = 0
+            while k < len(sizes) and total > self.db_max_bytes:
+                total -= sizes[k]
+                k += 1
+            con.execute("DELETE FROM responses WHERE rowid IN (SELECT rowid FROM responses ORDER BY accessed LIMIT ?)", (k,))
+            evicted += k
+        with self._lock:
+            self._disk_bytes = total
+            self._counts['evictions'] += evicted
+
+    # ------------------------------------------
+    # 메모리 계층
+    # ------------------------------------------
+    def _mem_put(self, key, value, created):
+        old = self._mem.pop(key, None)
+        if old: self._bytes -= len(old[1])
+        self._mem[key] = (created, value)
+        self._bytes += len(value)
+        while self._mem and (len(self._mem) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, v) = self._mem.popitem(last=False)
+            self._bytes -= len(v)
+            self._counts['evictions'] += 1
+
+    # ------------------------------------------
+    # 공개 API
+    # ------------------------------------------
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None:
+                if now - hit[0] <= self.ttl:
+                    self._mem.move_to_end(key)
+                    self._counts['mem_hits'] += 1
+                    return hit[1]
+                self._bytes -= len(self._mem.pop(key)[1])
+        if self.db_path:
+            row = self._disk_get(key, now)
+            if row is not None:
+                with self._lock:
+                    self._mem_put(key, row[0], row[1])
+                    self._counts['disk_hits'] += 1
+                return row[0]
+        with self._lock: self._counts['misses'] += 1
+        return None
+
+    def put(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._mem_put(key, value, now)
+            self._counts['puts'] += 1
+        if self.db_path: self._disk_put(key, value, now)
+
+    def get_or_call(self, model, prompt, config, fn):
+        """캐시에 있으면 반환, 없으면 fn() 결과를 저장 후 반환. 반환: (value, hit)"""
+        key = make_key(model, prompt, config)
+        value = self.get(key)
+        if value is not None: return value, True
+        value = fn()
+        if value: self.put(key, value)
+        return value, False
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+            self._bytes = 0
+        if self.db_path:
+            try:
+                with self._db() as con: con.execute("DELETE FROM responses")
+                with self._lock: self._disk_bytes = 0
+            except sqlite3.Error:
+                pass
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._counts, mem_entries=len(self._mem), mem_bytes=self._bytes)
+        lookups = s['mem_hits'] + s['disk_hits'] + s['misses']
+        s['hit_rate'] = (s['mem_hits'] + s['disk_hits']) / lookups if lookups else 0.0
+        return s
@@ -0,0 +1,181 @@
+"""
+Slack Webhook 전송
+- 커넥션 풀을 쓰는 requests.Session 재사용, 연결/응답 타임아웃
+- 429/5xx 및 연결 실패는 지수 백오프로 재시도 (Retry-After 헤더 우선)
+  응답 대기 시간 초과(ReadTimeout)는 Slack 이 이미 받았을 수 있으므로 재시도하지 않음 (중복 게시 방지)
+- Webhook URL 별 대기열을 작은 워커 풀이 처리하므로 UI 는 바로 반환하고,
+  응답 없는 Webhook 하나가 다른 사용자의 전송을 막지 않는다 (같은 URL 안에서는 순서 유지)
+- Slack 길이 제한을 넘는 메시지는 줄 단위로 나눠 순서대로 전송, 메시지별 상태 조회
+"""
+import itertools
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import tracing
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+MAX_CHARS = 3900        # Slack 권장 text 길이(4000자) 이내
+MAX_TRACKED = 500
+
+
+def split_message(message, max_chars=MAX_CHARS):
+    """줄 경계 기준으로 max_chars 이하 조각으로 분할 (한 줄이 너무 길면 강제 분할)"""
+    if len(message) <= max_chars: return [message]
+    parts, buf = [], ""
+    for line in message.splitlines(keepends=True):
+        while len(line) > max_chars:
+            if buf: parts.append(buf); buf = ""
+            parts.append(line[:max_chars]); line = line[max_chars:]
+        if len(buf) + len(line) > max_chars:
+            parts.append(buf); buf = ""
+        buf += line
+    if buf.strip(): parts.append(buf)
+    return [p.rstrip("\n") for p in parts]
+
+
+class SlackDelivery:
+    def __init__(self, connect_timeout=3.05, read_timeout=10, max_retries=4,
+                 backoff=1.0, max_backoff=30, max_chars=MAX_CHARS, pool_size=10, session=None, workers=4):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries, self.backoff, self.max_backoff = max_retries, backoff, max_backoff
+        self.max_chars = max_chars
+        if callable(session):
+            # 세션 제공자 (resources.http_session 등): 풀 설정/재생성은 제공자가 담당
+            self._session = session
+        else:
+            own = session or requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            own.mount("https://", adapter)
+            own.mount("http://", adapter)
+            self._session = lambda: own
+        self._pending = {}              # url -> deque[(msg_id, parts, user)]
+        self._status = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="slack-delivery")
+
+    @property
+    def session(self):
+        return self._session()
+
+    # ------------------------------------------
+    # 동기 전송
+    # ------------------------------------------
+    def _retry_delay(self, attempt, response=None):
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try: return min(float(retry_after), self.max_backoff)
+                except ValueError: pass
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    def post(self, url, text, on_retry=None, user=None):
+        """한 조각 전송 (재시도 포함). 반환: (성공 여부, 시도 횟수, 오류 메시지)"""
+        attrs = {'user': user} if user is not None else {}
+        with tracing.span("slack.post", **attrs) as rec:
+            result = self._post(url, text, on_retry)
+            rec.update(attempts=result[1], ok=result[0])
+            if result[2]: rec['error'] = result[2]
+            tracing.annotate(bytes_out=len(text.encode('utf-8')) * result[1])
+        return result
+
+    def _post(self, url, text, on_retry=None):
+        error = ""
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = self.session.post(url, json={"text": text}, timeout=self.timeout)
+                if response.status_code < 300: return True, attempt + 1, ""
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code not in RETRY_STATUS: return False, attempt + 1, error
+            except requests.ConnectionError as e:
+                # 연결 실패 / ConnectTimeout: 요청이 전달되지 않았으므로 재시도해도 안전
+                error = f"{type(e).__name__}: {e}"
+            except requests.Timeout as e:
+                # ReadTimeout: 이미 게시됐을 수 있어 POST 를 다시 보내지 않는다
+                return False, attempt + 1, f"{type(e).__name__}: 응답 대기 시간 초과 (중복 게시 방지를 위해 재시도하지 않음)"
+            except requests.RequestException as e:
+                return False, attempt + 1, f"{type(e).__name__}: {e}"
+            if attempt < self.max_retries:
+                delay = self._retry_delay(attempt, response)
+                if on_retry: on_retry(attempt + 1, delay, error)
+                time.sleep(delay)
+        return False, self.max_retries + 1, error
+
+    def send(self, url, message):
+        """메시지 전체를 (필요 시 분할해) 동기 전송. 반환: 성공 여부"""
+        parts = split_message(message, self.max_chars)
+        for i, part in enumerate(parts, 1):
+            text = f"({i}/{len(parts)})\n{part}" if len(parts) > 1 else part
+            if not self.post(url, text)[0]: return False
+        return True
+
+    # ------------------------------------------
+    # 비동기 전송 (큐 + 워커)
+    # ------------------------------------------
+    def _set(self, msg_id, **fields):
+        with self._lock:
+            if msg_id in self._status: self._status[msg_id].update(fields, updated=time.time())
+
+    def _deliver(self, msg_id, url, parts, user):
+        try:
+            self._set(msg_id, state="sending")
+            for i, part in enumerate(parts, 1):
+                text = f"({i}/{len(parts)})\n{part}" if len(parts) > 1 else part
+                ok, attempts, error = self.post(
+                    url, text,
+                    on_retry=lambda n, delay, err: self._set(msg_id, state="retrying", error=f"{err} ({delay:.1f}초 후 재시도 {n})"),
+                    user=user,
+                )
+                with self._lock:
+                    if msg_id in self._status: self._status[msg_id]['attempts'] += attempts
+                if not ok:
+                    self._set(msg_id, state="failed", error=error)
+                    return
+                self._set(msg_id, state="sending", sent_parts=i, error="")
+            self._set(msg_id, state="sent")
+        except Exception as e:
+            self._set(msg_id, state="failed", error=str(e))
+
+    def _drain(self, url):
+        """한 Webhook 의 대기열을 순서대로 비운다 (URL 당 워커 하나만)"""
+        while True:
+            with self._lock:
+                pending = self._pending.get(url)
+                if not pending:
+                    self._pending.pop(url, None)
+                    return
+                msg_id, parts, user = pending.popleft()
+            self._deliver(msg_id, url, parts, user)
+
+    def submit(self, url, message):
+        """전송 예약 후 즉시 메시지 id 반환"""
+        parts = split_message(message, self.max_chars)
+        msg_id = next(self._ids)
+        with self._lock:
+            self._status[msg_id] = {
+                'state': "queued", 'parts': len(parts), 'sent_parts': 0,
+                'attempts': 0, 'error': "", 'created': time.time(), 'updated': time.time(),
+            }
+            while len(self._status) > MAX_TRACKED:
+                self._status.popitem(last=False)
+            # 워커 스레드에는 요청 컨텍스트가 없으므로 계측용 사용자를 함께 넘긴다
+            job = (msg_id, parts, tracing.current_user())
+            if url in self._pending:
+                self._pending[url].append(job)      # 이 URL 을 비우는 워커가 이미 있음
+                return msg_id
+            self._pending[url] = deque([job])
+        self._pool.submit(self._drain, url)
+        return msg_id
+
+    def status(self, msg_id):
+        with self._lock:
+            s = self._status.get(msg_id)
+            return dict(s) if s else None
@@ -0,0 +1,58 @@
+import pytest
+
+from archive import MinutesArchive, extract_action_items
+
+DOC = """# 📑 실사 킥오프
+### 1. 요약
+* 재무 실사 범위를 확정했다
+### 3. Action Item
+| 담당 | 할일 | 기한 |
+| :--- | :--- | :--- |
+| 김철수 | 티저 검토 | 3/10 |
+"""
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return MinutesArchive(str(tmp_path / "minutes.db"))
+
+
+def save(archive, user="kim", title="실사 킥오프", doc=DOC, script="S1: 안녕하세요", **kw):
+    return archive.save(user, {'title': title, 'date': "2026-03-05", 'attendees': ["김철수"]},
+                        "template", doc, "slack", script=script, mapping={1: "김철수"}, **kw)
+
+
+def test_extract_action_items():
+    assert extract_action_items(DOC) == [{'owner': "김철수", 'task': "티저 검토", 'due': "3/10"}]
+
+
+def test_search_by_doc_actions_and_short_terms(archive):
+    first = save(archive)
+    save(archive, title="물류 센터", doc="# 물류\n### 1. 요약\n* 창고 자동화 투자")
+    save(archive, user="lee")
+    assert [r['id'] for r in archive.search("kim", "티저 검토")[0]] == [first]
+    assert [r['id'] for r in archive.search("kim", "실사")[0]] == [first]        # 2자 검색어 (LIKE)
+    items, total = archive.search("kim", "", per_page=1)
+    assert total == 2 and len(items) == 1 and items[0]['title'] == "물류 센터"
+    assert "티저" in archive.search("kim", "티저")[0][0]['snippet']
+    assert archive.search("kim", "없는검색어")[1] == 0
+
+
+def test_update_reindexes_and_users_are_isolated(archive):
+    mid = save(archive, data={'action_items': [{'owner': "[[S1]]"}]})
+    assert archive.get(mid, "lee") is None and not archive.delete(mid, "lee")
+    assert archive.update(mid, "kim", {'title': "실사 2차"}, DOC.replace("티저", "IM"), "slack", {1: "박영희"},
+                          data={'action_items': [{'owner': "박영희"}]})
+    rec = archive.get(mid, "kim")
+    assert rec['title'] == "실사 2차" and rec['mapping'] == {1: "박영희"} and rec['data']['action_items'][0]['owner'] == "박영희"
+    assert archive.search("kim", "티저")[1] == 0 and archive.search("kim", "IM 검토")[1] == 1
+    assert archive.update(mid, "kim", {'title': "실사 3차"}, DOC, "slack")
+    assert archive.get(mid, "kim")['data']['action_items'][0]['owner'] == "박영희"        # data 생략 → 유지
+    assert archive.delete(mid, "kim") and archive.search("kim", "실사")[1] == 0
+
+
+def test_find_by_script(archive):
+    mid = save(archive, script="  S1: 안녕하세요\n")
+    assert archive.find_by_script("kim", "S1: 안녕하세요")['id'] == mid
+    assert archive.find_by_script("kim", "다른 스크립트") is None
+    assert archive.stats()['minutes'] == 1
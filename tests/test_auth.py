@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from auth import Authenticator, LoginThrottled, is_hashed
+from user_store import UserStore
+
+
+class SheetConn:
+    # 셀 단위 쓰기가 없는 연결 (읽기 / 전체 쓰기만)
+    def __init__(self):
+        self.df = pd.DataFrame({'username': ['kim', 'lee'], 'password': [1234, 5678], 'webhook': [float('nan')] * 2})
+        self.writes = 0
+
+    def read(self, worksheet=None, ttl=None):
+        return self.df.copy()
+
+    def update(self, worksheet=None, data=None):
+        self.df, self.writes = data.copy(), self.writes + 1
+
+
+def test_plaintext_numeric_password_migrated_on_login():
+    conn = SheetConn()
+    auth = Authenticator(UserStore(conn), iterations=1000)
+    user = auth.login(" kim", "1234")
+    assert user['username'] == "kim"
+    assert 'password' not in user
+    assert is_hashed(conn.df.at[0, 'password']) and conn.df.at[1, 'password'] == 5678
+    assert auth.stats()['migrated'] == 1 and auth.login("kim", "1234") is not None
+
+
+def test_full_write_rereads_sheet_first():
+    conn = SheetConn()
+    store = UserStore(conn)
+    store.get("kim")
+    conn.df.loc[2] = ['park', 1, float('nan')]        # 다른 프로세스가 추가한 행
+    assert store.update("kim", webhook="https://hooks")
+    assert list(conn.df.username) == ['kim', 'lee', 'park']
+    assert store.get("kim")['webhook'] == "https://hooks"
+
+
+def test_lockout_skips_store():
+    conn = SheetConn()
+    auth = Authenticator(UserStore(conn), iterations=1000, max_failures=3, lockout=60)
+    for _ in range(3): assert auth.login("kim", "bad") is None
+    with pytest.raises(LoginThrottled):
+        auth.login("kim", "1234")
+
+
+def test_change_password():
+    conn = SheetConn()
+    auth = Authenticator(UserStore(conn), iterations=1000)
+    assert not auth.change_password("lee", "wrong", "new1")
+    assert auth.change_password("lee", "5678", "new1")
+    assert auth.login("lee", "new1") is not None and auth.login("lee", "5678") is None
+
+
+class SlowWorksheet:
+    # 셀 단위 쓰기가 되는 연결의 Worksheet (batch_update 가 느림)
+    def __init__(self, conn, delay):
+        self.conn, self.delay, self.batches = conn, delay, []
+
+    def cell(self, row, col):
+        return type("Cell", (), {'value': self.conn.df.iat[row - 2, col - 1]})()
+
+    def batch_update(self, data):
+        time.sleep(self.delay)
+        self.batches.append([item['range'] for item in data])
+
+
+class CellConn(SheetConn):
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.ws = SlowWorksheet(self, delay)
+        self.client = self
+
+    def _select_worksheet(self, worksheet=None):
+        return self.ws
+
+
+def test_cell_update_is_one_batch():
+    conn = CellConn()
+    store = UserStore(conn)
+    assert store.update("lee", webhook="https://hooks", password="x")
+    assert conn.ws.batches == [["C3", "B3"]] and conn.writes == 0
+    assert store.get("lee")['webhook'] == "https://hooks"
+
+
+def test_get_not_blocked_by_slow_write():
+    conn = CellConn(delay=0.5)
+    store = UserStore(conn)
+    store.get("kim")
+    writer = threading.Thread(target=store.update, args=("kim",), kwargs={'webhook': "https://hooks"})
+    writer.start()
+    time.sleep(0.05)
+    started = time.monotonic()
+    assert store.get("lee")['username'] == "lee"
+    assert time.monotonic() - started < 0.1
+    writer.join()
+    assert store.get("kim")['webhook'] == "https://hooks"
@@ -0,0 +1,36 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from bench import fakes
+from user_store import UserStore
+
+
+@pytest.fixture(autouse=True)
+def fast(monkeypatch):
+    monkeypatch.setitem(fakes.CONFIG, 'sheet_latency', 0)
+    monkeypatch.setitem(fakes.CONFIG, 'llm_latency', 0)
+    monkeypatch.setitem(fakes.CONFIG, 'llm_ttft', 0)
+    fakes.reset()
+    fakes.FakeGSheetsConnection.reset_sheet(3)
+
+
+def test_fake_sheet_takes_cell_writes_without_full_write():
+    conn = fakes.FakeGSheetsConnection("gsheets")
+    store = UserStore(conn)
+    assert store.update("user1", webhook="https://hooks", prompt="형식")
+    row = conn.read().set_index('username').loc["user1"]
+    assert (row['webhook'], row['prompt']) == ("https://hooks", "형식")
+    m = fakes.snapshot()
+    assert (m['cell_writes'], m['sheet_writes']) == (2, 0)
+
+
+def test_fake_gemini_answers_by_request_shape():
+    models = fakes.FakeGenaiClient().models
+    meta = models.generate_content("m", "회의", SimpleNamespace(response_mime_type="application/json"))
+    assert json.loads(meta.text)['title'] == "벤치마크 회의"
+    structured = models.generate_content("m", "회의", SimpleNamespace(response_schema={}))
+    assert structured.text == fakes.MINUTES_JSON
+    streamed = "".join(c.text for c in models.generate_content_stream("m", "회의", None))
+    assert streamed == fakes.MINUTES_TEXT and fakes.snapshot()['llm_calls'] == 3
@@ -0,0 +1,49 @@
+import os
+
+from corpus_cache import CorpusCache
+
+DOC = "[Term] CPO (Charge Point Operator / 충전 사업자)\n- 정의: 충전소 운영 사업자\n"
+
+
+def write(path, text, mtime_ns=None):
+    path.write_text(text, encoding="utf-8")
+    if mtime_ns: os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_unchanged_files_are_not_reread(tmp_path):
+    write(tmp_path / "a.txt", DOC)
+    write(tmp_path / "b.md", "무시")
+    cache = CorpusCache()
+    chunks, files, key = cache.load_dir(str(tmp_path))
+    assert files == ["[공용] a.txt"] and chunks and chunks[0]['source'] == "공용: a.txt"
+    again = cache.load_dir(str(tmp_path))
+    assert again[2] == key and cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_changed_file_is_reloaded(tmp_path):
+    path = tmp_path / "a.txt"
+    write(path, DOC, mtime_ns=1_000_000_000)
+    cache = CorpusCache()
+    _, _, key = cache.load_dir(str(tmp_path))
+    write(path, DOC + "- 비고: 추가\n", mtime_ns=2_000_000_000)
+    chunks, _, new_key = cache.load_dir(str(tmp_path))
+    assert new_key != key and "추가" in "".join(c['text'] for c in chunks)
+    assert cache.stats()['misses'] == 2 and cache.stats()['files'] == 1
+
+
+def test_index_reused_for_same_key_and_lru_evicts_files(tmp_path):
+    for name in "abc": write(tmp_path / f"{name}.txt", DOC * 20)
+    cache = CorpusCache()
+    chunks, _, key = cache.load_dir(str(tmp_path))
+    assert cache.get_index(key, chunks) is cache.get_index(key, chunks)
+    small = CorpusCache(max_bytes=cache.stats()['bytes'] // 2)
+    small.load_dir(str(tmp_path))
+    s = small.stats()
+    assert s['evictions'] >= 1 and s['files'] < 3 and s['bytes'] <= small.max_bytes
+
+
+def test_upload_cached_by_content():
+    session = {}
+    digest, chunks = CorpusCache.load_upload("x.txt", DOC.encode("utf-8"), session)
+    assert CorpusCache.load_upload("renamed.txt", DOC.encode("utf-8"), session) == (digest, chunks)
+    assert list(session) == [digest]
@@ -0,0 +1,24 @@
+import pytest
+
+from glossary import Glossary
+from rag_index import chunk_document
+
+TERMS = """[Term] Due Diligence (DD / 듀 딜리전스 / 실사)
+- 정의: 인수 대상 기업 조사
+  - CDD (Commercial DD): 시장성 및 사업성 실사
+"""
+
+
+@pytest.fixture(scope="module")
+def glossary():
+    return Glossary(chunk_document(TERMS, "terms"))
+
+
+@pytest.mark.parametrize("text", ["실사를 진행하자", "실사에서도 문제", "다음 주 실사했다", "재무 실사(FDD)", "듀딜리전스 일정", "현장실사 일정"])
+def test_short_hangul_alias_with_particles(glossary, text):
+    assert [e['name'] for e, _ in glossary.match(text)] == ["Due Diligence"]
+
+
+@pytest.mark.parametrize("text", ["실사용자 수가 늘었다", "실사진 촬영", "ADD 버튼"])
+def test_alias_inside_other_words_ignored(glossary, text):
+    assert glossary.match(text) == []
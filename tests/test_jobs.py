@@ -0,0 +1,61 @@
+import threading
+import time
+
+import pytest
+
+import jobs
+from jobs import JobQueue, QueueFull
+
+
+def wait(q, job_id, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        s = q.status(job_id)
+        if s['state'] not in jobs.ACTIVE_STATES: return s
+        time.sleep(0.01)
+    raise AssertionError(f"작업이 끝나지 않음: {q.status(job_id)}")
+
+
+def test_fifo_order_and_position():
+    q, gate, order = JobQueue(workers=1), threading.Event(), []
+    first = q.submit(gate.wait)
+    ids = [q.submit(order.append, n) for n in range(3)]
+    time.sleep(0.05)
+    assert [q.status(j)['position'] for j in ids] == [1, 2, 3]
+    gate.set()
+    for j in ids: wait(q, j)
+    assert order == [0, 1, 2] and q.status(first)['state'] == "done"
+
+
+def test_report_updates_running_job():
+    q = JobQueue(workers=1)
+
+    def work():
+        jobs.report(phase="분석 중", partial="abc")
+        return 42
+    s = wait(q, q.submit(work))
+    assert (s['state'], s['result'], s['phase'], s['partial']) == ("done", 42, "분석 중", "abc")
+    jobs.report(phase="무시")       # 작업 밖에서는 아무 일도 없음
+
+
+def test_failure_cancel_and_backpressure():
+    q, gate = JobQueue(workers=1, max_queued=1), threading.Event()
+    q.submit(gate.wait)
+    time.sleep(0.05)
+    queued = q.submit(lambda: 1)
+    with pytest.raises(QueueFull):
+        q.submit(lambda: 2)
+    assert q.cancel(queued) and q.status(queued)['error'] == "취소됨"
+    gate.set()
+    assert "ZeroDivisionError" in wait(q, q.submit(lambda: 1 / 0))['error']
+
+
+def test_analysis_lane_not_blocked_by_generation():
+    q, gate = JobQueue(workers=1, lanes={'analysis': 1}), threading.Event()
+    gen = [q.submit(gate.wait, kind="minutes") for _ in range(2)]
+    analysis = q.submit(lambda: "meta", kind="analysis")
+    assert wait(q, analysis, timeout=0.5)['result'] == "meta"
+    assert q.status(gen[1])['position'] == 1
+    gate.set()
+    for j in gen: wait(q, j)
+    assert q.stats()['workers'] == 2
@@ -0,0 +1,24 @@
+from long_transcript import make_windows, split_turns
+from rag_index import estimate_tokens
+
+
+def test_single_long_line_split_on_sentences():
+    script = "참석자 1: " + " ".join(f"{i}번째 안건을 논의했습니다." for i in range(2000))
+    windows = make_windows(split_turns(script), max_tokens=500)
+    assert len(windows) > 1
+    assert all(estimate_tokens(w) <= 500 for w in windows)
+    # 문장 중간에서 끊지 않는다
+    assert all(w.endswith("습니다.") for w in windows)
+
+
+def test_unpunctuated_line_split_on_characters():
+    script = "참석자 1: " + "가" * 5000
+    windows = make_windows(split_turns(script), max_tokens=500)
+    assert len(windows) > 1
+    assert all(estimate_tokens(w) <= 500 for w in windows)
+    assert "".join(windows).count("가") >= 5000
+
+
+def test_short_turns_kept_whole():
+    script = "\n".join(f"참석자 {i % 2 + 1}: 발화 {i}" for i in range(10))
+    assert make_windows(split_turns(script), max_tokens=6000) == [script]
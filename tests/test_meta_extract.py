@@ -0,0 +1,36 @@
+from meta_extract import extract_metadata, find_attendees, find_title
+
+
+def test_qa_labels_are_not_attendees():
+    text = "질문: 일정은요?\n답변: 다음 주입니다.\n질문: 예산은요?\n답변: 미정입니다.\n사회자: 마치겠습니다.\n사회자: 감사합니다."
+    assert find_attendees(text) == ([], False)
+    assert 'attendees' in extract_metadata(text)['missing']
+
+
+def test_named_speakers_and_labels():
+    text = "김철수: 시작하죠\n이영희 팀장: 네\n김철수: 안건은\n이영희 팀장: 좋습니다\n참석자 3: 동의합니다"
+    assert find_attendees(text) == (["김철수", "이영희 팀장", "참석자 3"], True)
+
+
+def test_label_only_attendees_are_missing():
+    # 실명을 모르므로 LLM 에 물어보도록 missing 에 남긴다 (값은 라벨 유지)
+    meta = extract_metadata("회의명: 주간 회의\n일시: 2024-03-05\n참석자 1: 시작\n참석자 2: 네\n참석자 1: 끝")
+    assert meta['attendees'] == ["참석자 1", "참석자 2"]
+    assert meta['missing'] == ['attendees'] and meta['confidence'] < 0.8
+
+
+def test_discourse_markers_are_not_speakers():
+    lines = [f"{'김철수' if i % 2 else '이영희'}: 발언 {i}" for i in range(30)]
+    lines[3:3] = ["예를 들어: 이런 경우", "참고로: 지난번 자료", "그래서: 정리하면", "참고로: 하나 더", "그래서: 결론"]
+    names, named = find_attendees("\n".join(lines))
+    assert named and sorted(names) == ["김철수", "이영희"]
+
+
+def test_roster_line_and_date():
+    meta = extract_metadata("회의명: 주간 회의\n일시: 2024년 3월 5일\n참석자: 김철수, 이영희\n김철수: 시작")
+    assert (meta['title'], meta['date'], meta['attendees']) == ("주간 회의", "2024-03-05", ["김철수", "이영희"])
+    assert meta['missing'] == []
+
+
+def test_speaker_line_is_not_title():
+    assert find_title("참석자 1: 회의 시작하겠습니다\n주간 회의 안건") == ("주간 회의 안건", False)
@@ -0,0 +1,20 @@
+import pytest
+
+from minutes_schema import parse_partial, render_template, validate_minutes
+
+FULL = '{"summary": ["실사 일정 확정"], "decisions": [], "action_items": [{"owner": "[[S1]]", "task": "티저 검토", "due": ""}], "slack_summary": "일정 확정"}'
+
+
+def test_parse_partial_keeps_string_in_progress():
+    assert parse_partial('```json\n{"summary": ["첫 줄", "두 번') == {'summary': ["첫 줄", "두 번"]}
+
+
+def test_validate_accepts_complete_response():
+    data = validate_minutes(FULL)
+    assert "| [[S1]] | 티저 검토 |  |" in render_template(data, "# [SLACK MESSAGE]")
+
+
+@pytest.mark.parametrize("text", ['{"summary": ["a"], "decis', "회의록을 작성할 수 없습니다", ""])
+def test_validate_rejects_truncated_or_non_json(text):
+    with pytest.raises(ValueError):
+        validate_minutes(text)
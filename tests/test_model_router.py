@@ -0,0 +1,82 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import core
+from model_router import DeadlineExceeded, ModelRouter, last_route
+from response_cache import ResponseCache
+
+ROUTES = {
+    "minutes": {'model': "main", 'fallback': "backup", 'deadline': 1.0},
+    "metadata": {'model': "main", 'fallback': "", 'deadline': 0.5, 'hedge': True, 'hedge_after': 0.05},
+}
+
+
+def paths(router, task):
+    return next(r['paths'] for r in router.stats() if r['task'] == task)
+
+
+def test_primary_failure_falls_back():
+    router = ModelRouter(ROUTES)
+    calls = []
+
+    def send(model, timeout):
+        calls.append(model)
+        if model == "main": raise RuntimeError("503")
+        return "ok"
+    assert router.call("minutes", send) == "ok"
+    assert calls == ["main", "backup"] and paths(router, "minutes") == {'fallback': 1}
+    assert last_route()['primary_error'] == "RuntimeError: 503"
+
+
+def test_hedge_answers_when_primary_stalls():
+    router = ModelRouter(ROUTES)
+    first = threading.Event()
+
+    def send(model, timeout):
+        if not first.is_set():
+            first.set()
+            time.sleep(0.3)         # 첫 요청만 느림
+            return "late"
+        return "fast"
+    started = time.monotonic()
+    assert router.call("metadata", send) == "fast"
+    assert time.monotonic() - started < 0.2 and paths(router, "metadata") == {'hedge': 1}
+
+
+def test_hedge_skipped_when_not_allowed_and_deadline_enforced():
+    router = ModelRouter(ROUTES)
+    calls = []
+
+    def send(model, timeout):
+        calls.append(model)
+        time.sleep(1.0)
+    with pytest.raises(DeadlineExceeded):
+        router.call("metadata", send, try_hedge=lambda: False)
+    assert calls == ["main"] and paths(router, "metadata") == {'failed': 1}
+
+
+class FakeModels:
+    def __init__(self, replies):
+        self.replies, self.calls = replies, []
+
+    def generate_content(self, model, contents, config=None):
+        self.calls.append(model)
+        return SimpleNamespace(text=self.replies[model], usage_metadata=None)
+
+
+def test_call_model_validates_falls_back_and_caches(monkeypatch):
+    pytest.importorskip("google.genai")
+    router = ModelRouter(ROUTES)
+    models = FakeModels({"main": "잘린 응답", "backup": '{"summary": []}'})
+    monkeypatch.setattr(core, "_router", router)
+    monkeypatch.setattr(core, "_client", SimpleNamespace(models=models))
+    monkeypatch.setattr(core, "_response_cache", ResponseCache())
+
+    def validate(text):
+        if not text.startswith("{"): raise ValueError("JSON 아님")
+    assert core.call_model("p", stage="llm.minutes", validate=validate) == ('{"summary": []}', False)
+    assert core.call_model("p", stage="llm.minutes", validate=validate) == ('{"summary": []}', True)
+    assert models.calls == ["main", "backup"]
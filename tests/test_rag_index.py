@@ -0,0 +1,38 @@
+from rag_index import RagIndex, chunk_document, estimate_tokens, format_context, tokenize
+
+DOC = """# 충전 사업
+## 시장 현황
+국내 전기차 충전 시장은 CPO 중심으로 성장하고 있다.
+## 밸류에이션
+EV/EBITDA 배수 비교로 기업가치를 산정한다.
+# 물류
+창고 자동화와 풀필먼트 센터 투자가 늘고 있다.
+[Term] CPO (Charge Point Operator / 충전 사업자)
+- 정의: 충전소 운영 사업자
+"""
+
+
+def test_tokenize_adds_hangul_bigrams():
+    assert tokenize("충전소를 EV") == ["ev", "충전소를", "충전", "전소", "소를"]
+    assert estimate_tokens("") == 0 and estimate_tokens("가나다") == 2
+
+
+def test_chunks_carry_section_headers_and_glossary_is_split_out():
+    chunks = chunk_document(DOC, "공용: a.txt")
+    assert [c['header'] for c in chunks][:3] == ["충전 사업 > 시장 현황", "충전 사업 > 밸류에이션", "물류"]
+    index = RagIndex(chunks)
+    assert len(index) == 3 and [e['name'] for e in index.glossary.entries] == ["CPO"]
+
+
+def test_search_ranks_relevant_chunk_first():
+    index = RagIndex(chunk_document(DOC, "공용: a.txt"))
+    hits = index.search("물류 창고 자동화 투자 검토", k=2)
+    assert hits[0][1]['header'] == "물류"
+    assert index.search("") == [] and RagIndex([]).search("물류") == []
+
+
+def test_select_respects_token_budget():
+    index = RagIndex(chunk_document(DOC, "공용: a.txt"))
+    picked = index.select("충전 시장 밸류에이션 물류", k=3, token_budget=30)
+    assert picked and sum(estimate_tokens(c['text']) for c in picked) <= 30
+    assert format_context(picked[:1]).startswith("--- [공용: a.txt / ")
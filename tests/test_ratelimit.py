@@ -0,0 +1,42 @@
+import threading
+import time
+
+import pytest
+
+from ratelimit import TokenBucket
+
+
+def test_burst_then_wait_for_refill():
+    bucket = TokenBucket(rate=20, capacity=2)
+    assert bucket.try_acquire() == 0.0 and bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == pytest.approx(0.05, abs=0.01)
+    time.sleep(0.06)
+    assert bucket.try_acquire() == 0.0
+
+
+def test_refill_capped_at_capacity():
+    bucket = TokenBucket(rate=1000, capacity=3)
+    time.sleep(0.02)
+    assert bucket.available() == 3
+
+
+def test_acquire_timeout():
+    bucket = TokenBucket(rate=1, capacity=1)
+    assert bucket.acquire()
+    started = time.monotonic()
+    assert bucket.acquire(timeout=0.1) is False
+    assert time.monotonic() - started < 0.05       # 기다려도 안 되면 바로 포기
+
+
+def test_per_minute_defaults():
+    bucket = TokenBucket.per_minute(60)
+    assert (bucket.rate, bucket.capacity) == (1.0, 6)
+
+
+def test_concurrent_acquire_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(6)]
+    started = time.monotonic()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert time.monotonic() - started >= 0.09       # 첫 1개 이후 5개를 초당 50개로
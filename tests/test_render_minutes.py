@@ -0,0 +1,34 @@
+import pytest
+
+from core import render_data, render_minutes
+from minutes_schema import validate_minutes
+
+from test_minutes_schema import FULL
+
+
+def test_render_data_fills_owner_placeholders():
+    data = render_data(validate_minutes(FULL), {1: "김철수"})
+    assert data['action_items'][0]['owner'] == "김철수"
+    assert render_data(validate_minutes(FULL), {})['action_items'][0]['owner'] == "참석자 1"
+    assert render_data(None, {1: "김철수"}) is None
+
+
+def test_render_minutes_fills_speakers_and_header():
+    doc, slack = render_minutes("# [[TITLE]]\n[[S2]] 발언\n# [SLACK MESSAGE]\n[[DATE]]", {'title': "실사", 'date': "2026-01-01"}, {"2": "박영희"})
+    assert doc == "# 실사\n박영희 발언" and slack == "2026-01-01"
+
+
+@pytest.mark.parametrize("template, name, expected", [
+    ("[[S1]]이 검토", "김철수", "김철수가 검토"),
+    ("[[S1]]가 검토", "박영훈", "박영훈이 검토"),
+    ("[[S1]]은 [[S1]]과 [[S1]]를", "박영희", "박영희는 박영희와 박영희를"),
+    ("[[S1]]으로 확정", "김철수", "김철수로 확정"),
+    ("[[S1]]로 확정", "박영훈", "박영훈으로 확정"),
+    ("[[S1]]으로 확정", "이한결", "이한결로 확정"),
+    ("담당은 [[S1]]이고", "김철수", "담당은 김철수고"),
+    ("[[S1]]이 검토", "John", "John이 검토"),
+    ("[[S2]]가 검토", "", "참석자 2가 검토"),
+])
+def test_render_minutes_matches_particles_to_name(template, name, expected):
+    doc, _ = render_minutes(template, {}, {1: name, 2: name})
+    assert doc == expected
@@ -0,0 +1,39 @@
+import threading
+import time
+
+from resources import LazyResource
+
+
+class Conn:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_built_once_and_shared_across_threads():
+    built = []
+    res = LazyResource("t", lambda: built.append(Conn()) or built[-1])
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(res.get())) for _ in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert len(built) == 1 and all(v is built[0] for v in seen) and res.stats()['builds'] == 1
+
+
+def test_max_age_swaps_without_closing_instance_in_use():
+    res = LazyResource("t", Conn, max_age=0.05)
+    old = res.get()
+    time.sleep(0.06)
+    new = res.get()
+    assert new is not old and not old.closed and res.stats()['builds'] == 2
+
+
+def test_failed_check_rebuilds():
+    res = LazyResource("t", Conn, check=lambda c: not c.closed, check_every=0)
+    first = res.get()
+    first.closed = True
+    assert res.get() is not first and res.stats()['failed_checks'] == 1
+    res.reset()
+    assert res.peek() is None
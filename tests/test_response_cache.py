@@ -0,0 +1,47 @@
+import sqlite3
+
+from response_cache import ResponseCache, make_key
+
+
+def test_key_is_stable_and_covers_model_config_prompt():
+    key = make_key("gemini", "프롬프트", {'temperature': 0.2, 'top_p': 1})
+    assert key == make_key("gemini", "프롬프트", {'top_p': 1, 'temperature': 0.2})
+    assert len({key, make_key("other", "프롬프트", {'temperature': 0.2, 'top_p': 1}),
+                make_key("gemini", "프롬프트!", {'temperature': 0.2, 'top_p': 1}),
+                make_key("gemini", "프롬프트", {'temperature': 0.3, 'top_p': 1})}) == 4
+    assert make_key("m", "p") == make_key("m", "p", {})
+
+
+def test_memory_lru_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "1"); cache.put("b", "2")
+    assert cache.get("a") == "1"        # a 가 최근 사용
+    cache.put("c", "3")
+    assert cache.get("b") is None and cache.get("a") == "1" and cache.get("c") == "3"
+    s = cache.stats()
+    assert (s['evictions'], s['mem_entries'], s['mem_hits'], s['misses']) == (1, 2, 3, 1)
+
+
+def test_memory_byte_cap():
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", "x" * 6); cache.put("b", "y" * 6)
+    assert cache.get("a") is None and cache.stats()['mem_bytes'] == 6
+
+
+def test_disk_survives_restart_and_evicts_by_access(tmp_path):
+    db = str(tmp_path / "cache.db")
+    cache = ResponseCache(max_entries=1, db_path=db, db_max_bytes=35)
+    for k in "abc": cache.put(k, k * 10)
+    assert cache.get("a") == "a" * 10           # 디스크 적중 → a 가 최근 사용
+    cache.put("d", "d" * 10)                    # 합계 40 > 35 → 가장 오래 안 쓴 b 삭제
+    with sqlite3.connect(db) as con:
+        assert sorted(r[0] for r in con.execute("SELECT key FROM responses")) == ["a", "c", "d"]
+    reopened = ResponseCache(db_path=db, db_max_bytes=35)
+    assert reopened.get("d") == "d" * 10 and reopened.stats()['disk_hits'] == 1
+    assert reopened._disk_bytes == 30
+
+
+def test_disk_ttl_expiry(tmp_path):
+    cache = ResponseCache(db_path=str(tmp_path / "cache.db"), ttl=-1)
+    cache.put("a", "1")
+    assert cache.get("a") is None and cache._disk_bytes == 0
@@ -0,0 +1,101 @@
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from slack_delivery import SlackDelivery, split_message
+
+
+class StandIn(BaseHTTPRequestHandler):
+    # /ok 즉시 200, /slow 0.3초 후 200, /flaky 처음 두 번 503, /limited 429 + Retry-After, /hang 응답 지연
+    hits = {}
+    received = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8')
+        n = StandIn.hits[self.path] = StandIn.hits.get(self.path, 0) + 1
+        StandIn.received.append((self.path, body))
+        if self.path == "/slow": time.sleep(0.3)
+        if self.path == "/hang": time.sleep(1.5)
+        if self.path == "/flaky" and n <= 2: return self._reply(503)
+        if self.path == "/limited" and n == 1: return self._reply(429, {'Retry-After': "0.1"})
+        if self.path == "/bad": return self._reply(404)
+        self._reply(200)
+
+    def _reply(self, code, headers=None):
+        self.send_response(code)
+        for k, v in (headers or {}).items(): self.send_header(k, v)
+        self.send_header('Content-Length', "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    StandIn.hits, StandIn.received = {}, []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make(**kw):
+    return SlackDelivery(**dict({'connect_timeout': 0.5, 'read_timeout': 0.5, 'max_retries': 3, 'backoff': 0.01}, **kw))
+
+
+def wait_state(delivery, msg_id, states=("sent", "failed"), timeout=5):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        s = delivery.status(msg_id)
+        if s['state'] in states: return s
+        time.sleep(0.02)
+    return delivery.status(msg_id)
+
+
+def test_retries_5xx_and_429(server):
+    d = make()
+    assert d.post(server + "/flaky", "hi")[:2] == (True, 3)
+    assert d.post(server + "/limited", "hi")[:2] == (True, 2)
+
+
+def test_client_error_not_retried(server):
+    ok, attempts, error = make().post(server + "/bad", "hi")
+    assert (ok, attempts) == (False, 1) and error.startswith("HTTP 404")
+
+
+def test_read_timeout_not_retried(server):
+    ok, attempts, _ = make().post(server + "/hang", "hi")
+    assert (ok, attempts) == (False, 1)
+    time.sleep(1.2)
+    assert StandIn.hits["/hang"] == 1           # 중복 게시 없음
+
+
+def test_connection_refused_retried():
+    sock = socket.socket(); sock.bind(("127.0.0.1", 0)); port = sock.getsockname()[1]; sock.close()
+    assert make(max_retries=2).post(f"http://127.0.0.1:{port}/x", "hi")[:2] == (False, 3)
+
+
+def test_hung_webhook_does_not_block_others(server):
+    d = make(read_timeout=3)
+    stuck = d.submit(server + "/hang", "느린 팀")
+    time.sleep(0.1)
+    started = time.monotonic()
+    fast = d.submit(server + "/slow", "다른 팀")
+    assert wait_state(d, fast)['state'] == "sent"
+    assert time.monotonic() - started < 1.2      # /hang 응답(1.5초)을 기다리지 않음
+    assert wait_state(d, stuck)['state'] == "sent"
+
+
+def test_split_parts_sent_in_order(server):
+    d = make(max_chars=20)
+    message = "\n".join(f"line {i:02d} ........" for i in range(5))
+    msg_id = d.submit(server + "/ok", message)
+    s = wait_state(d, msg_id)
+    assert s['state'] == "sent" and s['parts'] == len(split_message(message, 20)) == s['sent_parts']
+    assert [b.split("\\n", 1)[0] for _, b in StandIn.received] == [f'{{"text": "({i}/5)' for i in range(1, 6)]
@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+import pytest
+
+import core
+from model_router import ModelRouter
+from response_cache import ResponseCache
+
+pytest.importorskip("google.genai")
+
+INFO = {'title': "실사", 'date': "2026-03-05", 'attendees': ["김철수"]}
+
+
+class FakeModels:
+    def __init__(self, fail=()):
+        self.fail, self.calls = set(fail), []
+
+    def generate_content_stream(self, model, contents, config=None):
+        self.calls.append(model)
+        if model in self.fail: raise RuntimeError(f"{model} down")
+        for piece in ("# 회의록\n", "본문", "\n# [SLACK MESSAGE]\n요약"):
+            yield SimpleNamespace(text=piece, usage_metadata=None)
+
+
+@pytest.fixture
+def models(monkeypatch):
+    fake = FakeModels()
+    monkeypatch.setattr(core, "_router", ModelRouter({"minutes": {'model': "main", 'fallback': "backup"}}))
+    monkeypatch.setattr(core, "_client", SimpleNamespace(models=fake))
+    monkeypatch.setattr(core, "_response_cache", ResponseCache())
+    monkeypatch.setitem(core.SETTINGS, "STRUCTURED_MINUTES", False)
+    return fake
+
+
+def test_stream_yields_pieces_then_serves_cache(models):
+    pieces = list(core.stream_minutes(INFO, "S1: 시작", ""))
+    assert pieces == ["# 회의록\n", "본문", "\n# [SLACK MESSAGE]\n요약"]
+    assert core.split_minutes("".join(pieces)) == ("# 회의록\n본문", "요약")
+    assert list(core.stream_minutes(INFO, "S1: 시작", "")) == ["".join(pieces)] and models.calls == ["main"]
+
+
+def test_stream_falls_back_before_first_piece(models):
+    models.fail.add("main")
+    assert "".join(core.stream_minutes(INFO, "S1: 시작", "")).startswith("# 회의록")
+    assert models.calls == ["main", "backup"]
+
+
+def test_stream_reports_error_when_all_models_fail(models):
+    models.fail.update({"main", "backup"})
+    out = "".join(core.stream_minutes(INFO, "S1: 시작", ""))
+    assert out.startswith(core.ERROR_MARK) and "backup down" in out
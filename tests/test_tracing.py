@@ -0,0 +1,25 @@
+import threading
+
+from tracing import Tracer, load_jsonl, summarize
+
+
+def test_span_records_and_writes_jsonl(tmp_path):
+    path = str(tmp_path / "logs" / "trace.jsonl")
+    tracer = Tracer(path=path)
+    with tracer.span("outer", user_note="x"):
+        with tracer.span("inner") as rec:
+            rec['prompt_tokens'] = 10
+    tracer.flush()
+    rows = load_jsonl(path)
+    assert [r['stage'] for r in rows] == ["inner", "outer"] and rows[0]['parent'] == "outer"
+    assert {r['stage']: r['n'] for r in summarize(rows)} == {"inner": 1, "outer": 1}
+
+
+def test_concurrent_emits_all_written(tmp_path):
+    path = str(tmp_path / "trace.jsonl")
+    tracer = Tracer(path=path)
+    threads = [threading.Thread(target=lambda: [tracer.emit({'stage': "s", 'ms': 1.0}) for _ in range(200)]) for _ in range(4)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    tracer.flush()
+    assert len(tracer.snapshot()) == 800 and len(load_jsonl(path)) == 800
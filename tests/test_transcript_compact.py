@@ -0,0 +1,35 @@
+from transcript_compact import compact_transcript, parse_turns
+
+
+def test_label_with_leading_timestamp():
+    text = "[00:00:01] 참석자 1: 안녕하세요\n[00:00:05] 참석자 2: 반갑습니다\n[00:00:09] 참석자 1: 시작하죠"
+    assert parse_turns(text) == [(1, "안녕하세요"), (2, "반갑습니다"), (1, "시작하죠")]
+    assert compact_transcript(text)[1]['turns'] == 3
+
+
+def test_header_line_without_colon():
+    text = "참석자 1 00:00\n안녕하세요\n참석자 2 00:05\n반갑습니다\n오늘 안건은\n참석자 1 00:12\n시작하죠"
+    assert parse_turns(text) == [(1, "안녕하세요"), (2, "반갑습니다 오늘 안건은"), (1, "시작하죠")]
+    compacted, stats = compact_transcript(text)
+    assert stats['turns'] == 3
+    assert compacted.splitlines()[1:] == ["S1: 안녕하세요", "S2: 반갑습니다 오늘 안건은", "S1: 시작하죠"]
+
+
+def test_named_header_line():
+    text = "김철수 00:01\n안녕하세요\n이영희 00:03\n반가워요"
+    assert parse_turns(text) == [("김철수", "안녕하세요"), ("이영희", "반가워요")]
+
+
+def test_srt_numbers_and_times_dropped():
+    text = "1\n00:00:01,000 --> 00:00:02,000\n참석자 1: 하이\n\n2\n00:00:03,000 --> 00:00:04,000\n참석자 2: 헬로"
+    assert parse_turns(text) == [(1, "하이"), (2, "헬로")]
+
+
+def test_times_in_dialogue_kept():
+    compacted, _ = compact_transcript("참석자 1: 내일 9:00 출근하고 14:30에 회의합니다")
+    assert compacted.endswith("S1: 내일 9:00 출근하고 14:30에 회의합니다")
+
+
+def test_fillers_removed_but_words_kept():
+    compacted, _ = compact_transcript("참석자 1: 음, 저기 있는 자료 어 보시면 네 네 네 됩니다")
+    assert compacted.endswith("S1: 저기 있는 자료 보시면 네 됩니다")
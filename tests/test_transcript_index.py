@@ -0,0 +1,54 @@
+import io
+
+from core import detect_speaker_count
+from transcript_index import TranscriptIndex, build_index
+
+
+def test_header_lines_open_turns():
+    text = "참석자 1 00:00\n안녕하세요\n참석자 2 00:05\n반갑습니다\n오늘 안건은\n참석자 1 00:12\n시작하죠"
+    index = TranscriptIndex.from_text(text)
+    assert index.speaker_turns() == {1: 2, 2: 1}
+    assert [t['time'] for t in index.page()] == ["00:00", "00:05", "00:12"]
+    assert index.turn(1)['text'] == "반갑습니다 오늘 안건은"
+    assert detect_speaker_count(index) == detect_speaker_count(text) == 2
+
+
+def test_pasted_text_counts_any_label():
+    # 붙여넣은 스크립트는 본문 어디든 나오는 '참석자 N' 의 최대 번호
+    assert detect_speaker_count("회의 시작\n참석자 3 님이 발표") == 3
+    assert detect_speaker_count("라벨 없음") == 0
+
+
+def test_srt_upload_cp949():
+    srt = "1\n00:00:01,000 --> 00:00:02,000\n참석자 1: 하이\n\n2\n00:00:03,500 --> 00:00:04,000\n참석자 2: 헬로\n"
+    index = build_index(io.BytesIO(srt.encode('cp949')), name="a.srt")
+    assert index.format == "srt"
+    assert [(t['time'], t['speaker'], t['text']) for t in index.page()] == [
+        ("00:01", "참석자 1", "하이"), ("00:03", "참석자 2", "헬로")]
+
+
+def test_vtt_voice_tags():
+    vtt = "WEBVTT\n\nNOTE 메모\n무시\n\ncue-1\n00:00.000 --> 00:02.000\n<v 김철수>안녕하세요</v>\n"
+    index = TranscriptIndex.from_text(vtt)
+    assert index.format == "vtt"
+    assert index.text == "김철수: 안녕하세요\n"
+
+
+def test_vtt_without_cue_ids():
+    vtt = "WEBVTT\n\n00:00.000 --> 00:02.000\n<v 김철수>안녕하세요\n\n00:02.500 --> 00:04.000\n<v 이영희>반갑습니다\n"
+    index = TranscriptIndex.from_text(vtt)
+    assert index.text == "김철수: 안녕하세요\n이영희: 반갑습니다\n"
+    assert [t['time'] for t in index.page()] == ["00:00", "00:02"]
+
+
+def test_vtt_cue_after_note_block():
+    vtt = "WEBVTT\n\nNOTE 회의 녹취\n두 줄짜리 메모\n\n00:01.000 --> 00:02.000\n<v 참석자 2>시작합니다\n"
+    index = TranscriptIndex.from_text(vtt)
+    assert index.text == "참석자 2: 시작합니다\n"
+    assert index.speaker_turns() == {2: 1}
+
+
+def test_numeric_subtitle_text_kept():
+    srt = "1\n00:00:01,000 --> 00:00:02,000\n참석자 1: 몇 개 필요해요?\n\n2\n00:00:03,000 --> 00:00:04,000\n12\n"
+    index = TranscriptIndex.from_text(srt)
+    assert index.text == "참석자 1: 몇 개 필요해요? 12\n"
@@ -0,0 +1,177 @@
+"""
+단계별 계측 (실행 시간 / 토큰 / 전송 바이트)
+- with span("llm.generate"): ... 또는 @traced("rag.load") 로 감싸면 레코드 1건 생성
+- 실행 중 annotate(prompt_tokens=..., bytes_in=...) 로 현재 span 에 값 누적
+- 레코드는 메모리 링버퍼(관리자 패널)와 JSONL 파일(선택)에 기록 (파일은 기록 스레드 하나가 모아서 씀)
+- summarize() 로 단계별 / 사용자별 p50·p95 집계
+
+    python tracing.py logs/trace.jsonl      # JSONL 로그 집계 출력
+"""
+import contextvars
+import functools
+import json
+import atexit
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+NUMERIC_FIELDS = ('prompt_tokens', 'response_tokens', 'bytes_in', 'bytes_out')
+
+_current = contextvars.ContextVar("trace_span", default=None)
+_user = contextvars.ContextVar("trace_user", default="")
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    if not values: return 0.0
+    pos = (len(values) - 1) * q
+    lo, hi = int(pos), min(int(pos) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+
+class Tracer:
+    def __init__(self, path=None, keep=5000):
+        self.path = path
+        self.enabled = True
+        self.records = deque(maxlen=keep)
+        self._lock = threading.Lock()
+        self._lines = queue.Queue()     # (경로, JSON 줄) → 기록 스레드 하나가 모아서 파일에 쓴다
+        self._writer = None
+
+    @contextmanager
+    def span(self, stage, **attrs):
+        if not self.enabled:
+            yield {}
+            return
+        record = {'ts': time.time(), 'stage': stage, 'user': _user.get(), **attrs}
+        parent = _current.get()
+        if parent is not None: record['parent'] = parent['stage']
+        token = _current.set(record)
+        started = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record['ms'] = round((time.perf_counter() - started) * 1000, 2)
+            _current.reset(token)
+            self.emit(record)
+
+    def emit(self, record):
+        # 잠금은 링버퍼에만: 파일 쓰기는 기록 스레드가 하므로 요청 스레드가 디스크 I/O 를 기다리지 않는다
+        path = self.path
+        with self._lock:
+            self.records.append(record)
+            if path and (self._writer is None or not self._writer.is_alive()):
+                self._writer = threading.Thread(target=self._write_loop, daemon=True, name="trace-writer")
+                self._writer.start()
+        if path: self._lines.put((path, json.dumps(record, ensure_ascii=False, default=str) + "\n"))
+
+    def _write_loop(self):
+        while True:
+            batch = [self._lines.get()]
+            while True:
+                try: batch.append(self._lines.get_nowait())
+                except queue.Empty: break
+            by_path = {}
+            for path, line in batch: by_path.setdefault(path, []).append(line)
+            for path, lines in by_path.items():
+                try:
+                    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                    with open(path, 'a', encoding='utf-8') as f: f.write("".join(lines))
+                except OSError:
+                    pass
+            for _ in batch: self._lines.task_done()
+
+    def flush(self, timeout=5.0):
+        """대기 중인 줄이 파일에 다 기록될 때까지 (최대 timeout 초) 대기"""
+        deadline = time.monotonic() + timeout
+        while self._lines.unfinished_tasks and time.monotonic() < deadline: time.sleep(0.01)
+
+    def snapshot(self):
+        with self._lock: return list(self.records)
+
+
+_tracer = Tracer()
+atexit.register(_tracer.flush)      # 종료 직전 남은 줄 기록 (기록 스레드는 daemon)
+
+def configure(path=None, enabled=True, keep=None):
+    _tracer.path = path or None
+    _tracer.enabled = enabled
+    if keep: _tracer.records = deque(_tracer.records, maxlen=keep)
+
+def get_tracer():
+    return _tracer
+
+def set_user(user):
+    _user.set(str(user or ""))
+
+def current_user():
+    return _user.get()
+
+def span(stage, **attrs):
+    return _tracer.span(stage, **attrs)
+
+def traced(stage):
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _tracer.span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+def annotate(**values):
+    """현재 span 에 값 기록 (숫자 항목은 누적)"""
+    record = _current.get()
+    if record is None: return
+    for k, v in values.items():
+        if v is None: continue
+        if k in NUMERIC_FIELDS: record[k] = record.get(k, 0) + v
+        else: record[k] = v
+
+def annotate_usage(usage):
+    """Gemini usage_metadata 에서 토큰 수 기록"""
+    if usage is None: return
+    annotate(prompt_tokens=getattr(usage, 'prompt_token_count', None) or 0,
+             response_tokens=getattr(usage, 'candidates_token_count', None) or 0)
+
+
+# ==========================================
+# 집계
+# ==========================================
+def summarize(records=None, by=("stage",)):
+    """by 키별 n / p50 / p95 / mean(ms) 와 토큰·바이트 합계"""
+    groups = {}
+    for r in records if records is not None else _tracer.snapshot():
+        groups.setdefault(tuple(r.get(k, "") for k in by), []).append(r)
+    rows = []
+    for key, recs in sorted(groups.items()):
+        ms = [r['ms'] for r in recs]
+        row = dict(zip(by, key))
+        row.update(n=len(recs), p50_ms=round(_percentile(ms, 0.5), 1), p95_ms=round(_percentile(ms, 0.95), 1),
+                   mean_ms=round(sum(ms) / len(ms), 1), errors=sum(1 for r in recs if r.get('error')))
+        for f in NUMERIC_FIELDS: row[f] = sum(r.get(f, 0) for r in recs)
+        rows.append(row)
+    return rows
+
+def load_jsonl(path):
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try: records.append(json.loads(line))
+            except ValueError: continue
+    return records
+
+
+if __name__ == "__main__":
+    recs = load_jsonl(sys.argv[1] if len(sys.argv) > 1 else os.path.join("logs", "trace.jsonl"))
+    for by in (("stage",), ("user", "stage")):
+        print(f"\n== {' / '.join(by)} ==")
+        for row in summarize(recs, by):
+            print("  ".join(f"{k}={v}" for k, v in row.items()))
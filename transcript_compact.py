@@ -0,0 +1,94 @@
+"""
+스크립트 압축 (프롬프트 조립 전 전처리)
+- 화자 표기 통일: '참석자1', '[참석자 1]', '화자 1', 'Speaker 1' -> 짧은 별칭 (기본 'S1')
+  · '[00:00:01] 참석자 1: 내용' (줄머리 시각), '참석자 1 00:00' + 다음 줄 내용 (콜론 없는 화자 머리줄) 도 인식
+- 화자 매칭을 로컬에서 적용 (매칭된 화자는 실명으로 치환)
+- 줄머리/화자 옆 타임스탬프 (본문 속 시각 '9:00 출근' 은 유지) / SRT 번호·시간 줄 / 추임새(음, 어, 그...) / 연속 중복 줄 제거
+- 같은 화자의 연속 발화 병합
+"""
+import re
+
+from meta_extract import NOT_NAMES, SPEAKER_RE as NAMED_SPEAKER_RE
+from rag_index import estimate_tokens
+
+TS = r'\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d{1,3})?'
+LABEL_PREFIX = r'^\s*\[?(?:참석자|화자|speaker)[\s_]?(\d+)\]?\s*(?:[\[(]?(' + TS + r')[\])]?)?\s*'
+LABEL_RE = re.compile(LABEL_PREFIX + r'[:：]\s*', re.IGNORECASE)
+# 콜론 없이 화자(+ 시각)만 있는 머리줄: 발화 내용은 다음 줄부터
+HEADER_RE = re.compile(LABEL_PREFIX + r'$', re.IGNORECASE)
+NAMED_HEADER_RE = re.compile(r'^\s*([가-힣]{2,4}|[A-Z][a-zA-Z]{1,15}(?: [A-Z][a-zA-Z]{1,15})?)\s+[\[(]?(' + TS + r')[\])]?\s*$')
+# 줄머리 시각: '[00:01]참석자 1', '00:00:01 내용' (괄호 없이 쓰면 뒤에 공백)
+LEAD_TS_RE = re.compile(r'^\s*[\[(]?(' + TS + r')[\])]?(?:(?<=[\])])\s*|\s+|$)')
+LABEL_TS_RE = re.compile(r'^\s*[\[(]' + TS + r'[\])]\s*')      # '참석자 1: [00:01] 내용'
+SRT_INDEX_RE = re.compile(r'^\s*\d+\s*$')
+SRT_TIME_RE = re.compile(r'^\s*' + TS + r'\s*-->\s*' + TS + r'.*$')
+# 단독으로 쓰인 추임새만 제거 ('그 회사' 의 '그' 는 유지, '그, 그러니까' 의 '그,' 는 제거)
+FILLER_RE = re.compile(
+    r'(?<![가-힣A-Za-z0-9])(?:으?음+|어+|아+|uh+|um+|hmm+)(?:[,.…~]+|(?=\s)|$)'
+    r'|(?<![가-힣])그(?:[,…]+|\.{2,})(?=\s|$)'
+    r'|(?<![가-힣])(그|네|예)(?:\s+\1)+(?![가-힣])',
+    re.IGNORECASE,
+)
+SPACES_RE = re.compile(r'[ \t]{2,}')
+
+
+def _strip_fillers(text):
+    def repl(m):
+        # '네 네 네' 처럼 반복된 맞장구는 한 번만 남긴다
+        return m.group(1) if m.group(1) else ''
+    text = FILLER_RE.sub(repl, text)
+    text = SPACES_RE.sub(' ', text)
+    return re.sub(r'\s+([,.?!])', r'\1', text).strip(' ,')
+
+def parse_turns(text):
+    """줄 단위로 발화 분리. 반환: [(speaker_key, content)]
+    speaker_key: 번호 라벨이면 int, 실명 화자면 str, 화자 없는 줄은 None
+    """
+    turns = []
+    for raw in text.splitlines():
+        if SRT_INDEX_RE.match(raw) or SRT_TIME_RE.match(raw): continue
+        line = LEAD_TS_RE.sub('', raw.strip(), count=1)
+        if not line: continue
+        m = HEADER_RE.match(line) or LABEL_RE.match(line)
+        if m:
+            turns.append((int(m.group(1)), LABEL_TS_RE.sub('', line[m.end():], count=1)))
+            continue
+        m = NAMED_HEADER_RE.match(line) or NAMED_SPEAKER_RE.match(line)
+        if m and m.group(1).strip() not in NOT_NAMES:
+            turns.append((m.group(1).strip(), LABEL_TS_RE.sub('', line[m.end():], count=1)))
+            continue
+        if turns and turns[-1][0] is not None:
+            # 라벨 없는 줄은 직전 화자의 발화가 이어지는 것으로 본다 (머리줄 다음 줄 포함)
+            turns[-1] = (turns[-1][0], f"{turns[-1][1]} {line}".strip())
+        else:
+            turns.append((None, line))
+    return turns
+
+def compact_transcript(text, mapping=None, alias="S{n}", strip_fillers=True):
+    """mapping: {번호: 이름}. 반환: (압축된 스크립트, {'before', 'after', 'turns'})"""
+    mapping = {int(k): v for k, v in (mapping or {}).items() if v}
+    out, used_aliases = [], {}
+    for speaker, content in parse_turns(text):
+        if strip_fillers: content = _strip_fillers(content)
+        content = SPACES_RE.sub(' ', content).strip()
+        if not content: continue
+        if isinstance(speaker, int):
+            if speaker in mapping: name = mapping[speaker]
+            else:
+                name = alias.format(n=speaker)
+                used_aliases[name] = f"참석자 {speaker}"
+        else:
+            name = speaker
+        if out and out[-1][0] == name:
+            # 같은 화자 연속 발화 병합 (STT 중복 문장은 생략)
+            if content != out[-1][1] and not out[-1][1].endswith(content):
+                out[-1] = (name, f"{out[-1][1]} {content}")
+            continue
+        out.append((name, content))
+
+    lines = [f"{name}: {content}" if name else content for name, content in out]
+    legend = {a: label for a, label in used_aliases.items() if a != label}
+    if legend:
+        lines.insert(0, "[화자 표기] " + ", ".join(f"{a}={label}" for a, label in sorted(legend.items())))
+    compacted = "\n".join(lines)
+    return compacted, {'before': estimate_tokens(text), 'after': estimate_tokens(compacted), 'turns': len(out)}
@@ -0,0 +1,219 @@
+"""
+녹취 파일 색인 (txt / SRT / VTT)
+- 파일을 64KB 씩 읽어 줄 단위로 처리 (전체 원문을 한 번에 메모리에 올리지 않음, UTF-8 이 아니면 CP949)
+- 발화(화자 턴) 단위 색인: 턴마다 본문 내 시작 위치(offset), 화자 id, 시작 시각(ms) 만 array 로 보관
+  · SRT/VTT 의 자막 번호·시간 줄, VTT 헤더/NOTE 블록/태그는 버리고 시각만 남김
+  · 같은 화자의 연속 자막(cue)과 화자 표기가 없는 줄은 한 턴으로 병합
+  · '참석자 1 00:00' 처럼 콜론 없는 화자 머리줄은 다음 줄부터를 그 화자의 발화로
+- 본문(text)은 '참석자 N: 내용' / '이름: 내용' 줄로 정규화 → 기존 압축/분석/생성 로직에 그대로 사용
+- 화자 수, 화자별 발화 수, 페이지 단위 미리보기를 본문 재검색 없이 색인으로 계산
+
+    index = build_index(uploaded_file, name="meeting.srt")
+    index.speaker_count(); index.page(1, 50); index.text
+"""
+import codecs
+import re
+from array import array
+
+import tracing
+from meta_extract import NOT_NAMES, SPEAKER_RE as NAMED_SPEAKER_RE
+from transcript_compact import HEADER_RE, LABEL_RE, LEAD_TS_RE, NAMED_HEADER_RE, TS
+
+CHUNK_SIZE = 1 << 16
+CUE_TIME_RE = re.compile(r'^\s*(' + TS + r')\s*-->\s*(' + TS + r')')
+INDEX_LINE_RE = re.compile(r'^\s*\d+\s*$')
+VOICE_RE = re.compile(r'^<v(?:\.[^\s>]*)?\s+([^>]+)>')
+TAG_RE = re.compile(r'</?(?:v|c|i|b|u|lang|ruby|rt)(?:[.\s][^>]*)?>|<\d{1,2}:\d{2}[^>]*>')
+VTT_BLOCKS = ("NOTE", "STYLE", "REGION")
+NUMBERED_RE = re.compile(r'^(?:참석자|화자|speaker)[\s_]?(\d+)$', re.IGNORECASE)
+MAX_SPEAKERS = 30
+
+
+def parse_ts(value):
+    """'01:02:03,456' / '02:03.4' → ms"""
+    main, _, frac = value.replace(",", ".").partition(".")
+    seconds = 0
+    for part in main.split(":"): seconds = seconds * 60 + int(part)
+    return seconds * 1000 + int((frac + "00")[:3] if frac else 0)
+
+def format_ts(ms):
+    if ms < 0: return ""
+    s = ms // 1000
+    return f"{s // 3600:d}:{s // 60 % 60:02d}:{s % 60:02d}" if s >= 3600 else f"{s // 60:02d}:{s % 60:02d}"
+
+def iter_lines(stream, chunk_size=CHUNK_SIZE):
+    """바이너리 스트림 → 줄 (UTF-8(BOM 허용), 첫 조각이 UTF-8 이 아니면 CP949)"""
+    first = stream.read(chunk_size)
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(first, final=False)
+        encoding = 'utf-8-sig'
+    except UnicodeDecodeError:
+        encoding = 'cp949'
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    rest, chunk = "", first
+    while chunk:
+        lines = (rest + decoder.decode(chunk)).splitlines(keepends=True)
+        rest = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        for line in lines: yield line.rstrip("\r\n")
+        chunk = stream.read(chunk_size)
+    rest += decoder.decode(b"", final=True)
+    if rest: yield rest
+
+
+class TranscriptIndex:
+    def __init__(self, name=""):
+        self.name = name
+        self.format = "txt"
+        self.offsets = array('q')        # 턴 시작 위치 (text 기준)
+        self.speaker_ids = array('i')    # 턴 화자 (-1: 화자 없음)
+        self.starts = array('q')         # 턴 시작 시각 ms (-1: 없음)
+        self.speakers = []               # id -> 화자 키 (번호 int 또는 이름 str)
+        self.turn_counts = []            # id -> 발화 수
+        self.lines_read = 0
+        self._ids = {}
+        self._parts, self._size, self._pending = [], 0, None
+        self.text = ""
+
+    @classmethod
+    def from_text(cls, text, name=""):
+        index = cls(name)
+        index.feed(text.splitlines())
+        return index
+
+    def __len__(self):
+        return len(self.offsets)
+
+    # ------------------------------------------
+    # 구성
+    # ------------------------------------------
+    def _speaker(self, label):
+        """줄머리 화자 표기 → (화자 키, 나머지). 표기가 없으면 (None, 줄)"""
+        m = LABEL_RE.match(label)
+        if m: return int(m.group(1)), label[m.end():]
+        m = NAMED_SPEAKER_RE.match(label)
+        if m and m.group(1).strip() not in NOT_NAMES: return m.group(1).strip(), label[m.end():]
+        return None, label
+
+    def _add(self, speaker, content, start):
+        content = content.strip()
+        if not content: return
+        if self._pending and (speaker is None or speaker == self._pending[0]):
+            # 화자 표기가 없는 줄 / 같은 화자의 다음 자막은 직전 턴에 이어 붙인다
+            self._pending[2].append(content)
+            return
+        self._flush()
+        self._pending = (speaker, start, [content])
+
+    def _flush(self):
+        if not self._pending: return
+        speaker, start, contents = self._pending
+        self._pending = None
+        if not contents: return                         # 내용 없는 머리줄
+        if speaker is None: sid, label = -1, ""
+        else:
+            sid = self._ids.get(speaker)
+            if sid is None:
+                sid = self._ids[speaker] = len(self.speakers)
+                self.speakers.append(speaker)
+                self.turn_counts.append(0)
+            self.turn_counts[sid] += 1
+            label = f"참석자 {speaker}: " if isinstance(speaker, int) else f"{speaker}: "
+        line = label + " ".join(contents) + "\n"
+        self.offsets.append(self._size)
+        self.speaker_ids.append(sid)
+        self.starts.append(start)
+        self._parts.append(line)
+        self._size += len(line)
+
+    def feed(self, lines):
+        """줄 이터레이터를 읽어 색인 (한 번만 호출)"""
+        held, cue_start, skipping = None, -1, False
+        for line in lines:
+            self.lines_read += 1
+            # 한 줄 늦게 처리: 다음 줄이 시간 줄이면 지금 줄은 자막 번호(SRT) / cue 식별자(VTT)
+            # 빈 줄은 식별자가 아님 (헤더/NOTE 블록의 끝이므로 항상 _line 으로)
+            if held is not None and not (held.strip() and CUE_TIME_RE.match(line)
+                                         and (INDEX_LINE_RE.match(held) or self.format == "vtt")):
+                cue_start, skipping = self._line(held, cue_start, skipping)
+            held = line
+        if held is not None: self._line(held, cue_start, skipping)
+        self._flush()
+        self.text, self._parts = "".join(self._parts), []
+        return self
+
+    def _line(self, line, cue_start, skipping):
+        s = line.strip()
+        if not s: return cue_start, False              # 빈 줄: VTT NOTE/STYLE 블록 끝
+        if skipping: return cue_start, True
+        if s.startswith("WEBVTT") and not len(self.offsets) and not self._pending:
+            self.format = "vtt"
+            return cue_start, True                      # 헤더 블록
+        if self.format == "vtt" and s.startswith(VTT_BLOCKS): return cue_start, True
+        m = CUE_TIME_RE.match(s)
+        if m:
+            if self.format == "txt": self.format = "srt"
+            return parse_ts(m.group(1)), False
+        start, speaker = -1, None
+        m = VOICE_RE.match(s)
+        if m:
+            # VTT <v 화자> 태그
+            name, s = m.group(1).strip(), s[m.end():]
+            num = NUMBERED_RE.match(name)
+            speaker = int(num.group(1)) if num else name
+        if self.format != "txt": s = TAG_RE.sub("", s)
+        m = LEAD_TS_RE.match(s)
+        if m: start, s = parse_ts(m.group(1)), s[m.end():]
+        if speaker is None:
+            m = HEADER_RE.match(s) or NAMED_HEADER_RE.match(s)
+            if m and m.group(1) not in NOT_NAMES:
+                # 화자 머리줄: 턴만 열어 두고 내용은 다음 줄에서
+                if m.group(2): start = parse_ts(m.group(2))
+                key = int(m.group(1)) if m.group(1).isdigit() else m.group(1)
+                if not (self._pending and self._pending[0] == key):
+                    self._flush()
+                    self._pending = (key, start if start >= 0 else cue_start, [])
+                return -1, False
+        if speaker is None: speaker, s = self._speaker(s)
+        self._add(speaker, s, start if start >= 0 else cue_start)
+        # 자막 시각은 cue 의 첫 줄에만
+        return -1, False
+
+    # ------------------------------------------
+    # 조회
+    # ------------------------------------------
+    def speaker_count(self):
+        """'참석자 N' 번호 화자가 있으면 가장 큰 번호, 없으면 실명 화자 수 (최대 30)"""
+        numbered = [s for s in self.speakers if isinstance(s, int)]
+        return min(max(numbered) if numbered else len(self.speakers), MAX_SPEAKERS)
+
+    def speaker_turns(self):
+        """{화자 키: 발화 수}"""
+        return dict(zip(self.speakers, self.turn_counts))
+
+    def turn(self, i):
+        end = self.offsets[i + 1] if i + 1 < len(self.offsets) else len(self.text)
+        line = self.text[self.offsets[i]:end].rstrip("\n")
+        sid = self.speaker_ids[i]
+        speaker = self.speakers[sid] if sid >= 0 else None
+        if speaker is not None: line = line.split(": ", 1)[1]
+        label = "" if speaker is None else (f"참석자 {speaker}" if isinstance(speaker, int) else speaker)
+        return {'no': i + 1, 'time': format_ts(self.starts[i]), 'speaker': label, 'text': line}
+
+    def page(self, page=1, per_page=50):
+        start = max(0, (page - 1) * per_page)
+        return [self.turn(i) for i in range(start, min(len(self), start + per_page))]
+
+    def stats(self):
+        return {'name': self.name, 'format': self.format, 'turns': len(self), 'speakers': len(self.speakers),
+                'lines': self.lines_read, 'chars': len(self.text)}
+
+
+@tracing.traced("transcript.index")
+def build_index(stream, name=""):
+    """업로드 파일(바이너리 스트림) → TranscriptIndex"""
+    index = TranscriptIndex(name)
+    if name.lower().endswith(".vtt"): index.format = "vtt"
+    elif name.lower().endswith(".srt"): index.format = "srt"
+    index.feed(iter_lines(stream))
+    tracing.annotate(bytes_in=getattr(stream, 'size', 0) or 0, turns=len(index), speakers=len(index.speakers))
+    return index
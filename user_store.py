@@ -0,0 +1,164 @@
+"""
+사용자 저장소 (Google Sheets 앞단 메모리 캐시)
+- username -> 레코드 인덱스를 메모리에 두고 TTL 이 지나면 백그라운드에서 갱신 (갱신 중에는 기존 값 제공)
+- 수정은 해당 행/열 셀만 한 번에(batch_update) 기록하고 그 사용자 항목만 갱신 (전체 시트 다운로드/캐시 초기화 없음)
+  셀 단위 쓰기를 못 하는 연결이면 직전에 시트를 다시 읽어 그 위에 기록 (다른 프로세스의 수정을 덮어쓰지 않도록)
+"""
+import threading
+import time
+
+from tracing import annotate, traced
+
+WRITABLE_COLUMNS = ('webhook', 'prompt', 'prompt_slot1', 'prompt_slot2', 'password')
+
+
+def _clean(value):
+    # None / NaN / NaT → "" (NaN 은 자기 자신과 같지 않음, pandas 를 import 하지 않기 위해 직접 비교)
+    if value is None: return ""
+    try:
+        if value != value: return ""
+    except (TypeError, ValueError):
+        pass
+    return value
+
+
+def _a1(row, col):
+    """(행, 열) 번호(1부터) → 'B3' 형식"""
+    name = ""
+    while col:
+        col, rem = divmod(col - 1, 26)
+        name = chr(65 + rem) + name
+    return f"{name}{row}"
+
+
+class UserStore:
+    def __init__(self, conn, worksheet="Sheet1", ttl=60):
+        self.conn = conn
+        self.worksheet = worksheet
+        self.ttl = ttl
+        self._df = None
+        self._index = {}            # username -> (df index, record dict)
+        self._loaded_at = 0.0
+        self._refreshing = False
+        self._ws = None             # gspread Worksheet (셀 단위 쓰기용, 없으면 None)
+        self._lock = threading.RLock()
+        self.reads = self.cell_writes = self.sheet_writes = 0
+
+    # ------------------------------------------
+    # 읽기
+    # ------------------------------------------
+    @traced("users.load")
+    def _load(self):
+        df = self.conn.read(worksheet=self.worksheet, ttl=0)
+        annotate(bytes_in=int(df.memory_usage(deep=True).sum()), rows=len(df))
+        index = {}
+        for idx, row in df.iterrows():
+            name = str(row.get('username', '')).strip()
+            if name: index[name] = (idx, {k: _clean(v) for k, v in row.to_dict().items()})
+        with self._lock:
+            self._df, self._index = df, index
+            self._loaded_at = time.monotonic()
+            self.reads += 1
+
+    def _refresh_async(self):
+        with self._lock:
+            if self._refreshing: return
+            self._refreshing = True
+
+        def run():
+            try: self._load()
+            except Exception: pass
+            finally:
+                with self._lock: self._refreshing = False
+
+        threading.Thread(target=run, daemon=True, name="user-store-refresh").start()
+
+    def _ensure(self):
+        if self._df is None:
+            self._load()
+        elif time.monotonic() - self._loaded_at > self.ttl:
+            self._refresh_async()
+
+    def get(self, username):
+        """사용자 레코드 사본 (없으면 None)"""
+        username = str(username).strip()
+        self._ensure()
+        with self._lock:
+            hit = self._index.get(username)
+            return dict(hit[1]) if hit else None
+
+    # ------------------------------------------
+    # 쓰기
+    # ------------------------------------------
+    def _worksheet(self):
+        """가능하면 gspread Worksheet 핸들을 얻어 셀 단위로 기록 (서비스 계정 연결일 때)"""
+        if self._ws is None:
+            try:
+                client = getattr(self.conn, "client", None) or getattr(self.conn, "_instance", None)
+                handle = client._select_worksheet(worksheet=self.worksheet)
+                self._ws = handle if hasattr(handle, "batch_update") else False
+            except Exception:
+                self._ws = False
+        return self._ws or None
+
+    def _write_cells(self, sheet_row, columns, username, fields):
+        """행 확인 1회 + 해당 셀들을 batch_update 한 번으로 기록 (잠금 밖에서 호출)"""
+        ws = self._worksheet()
+        if ws is None or any(c not in columns for c in fields): return False
+        try:
+            # 행 위치가 어긋난 경우(시트가 외부에서 수정됨) 전체 쓰기로 대체
+            if str(ws.cell(sheet_row, columns.index('username') + 1).value).strip() != username:
+                return False
+            ws.batch_update([{'range': _a1(sheet_row, columns.index(col) + 1), 'values': [[value]]}
+                             for col, value in fields.items()])
+        except Exception:
+            return False
+        with self._lock: self.cell_writes += len(fields)
+        return True
+
+    def _write_sheet(self, username, fields):
+        """시트를 다시 읽고 그 위에 기록 (캐시된 프레임을 그대로 쓰면 그 사이 다른 수정이 사라진다)"""
+        self._load()
+        with self._lock:
+            hit = self._index.get(username)
+            if hit is None: return False
+            df = self._df.copy()
+        for col, value in fields.items():
+            # 빈 열(float NaN) / 숫자 열에 문자열을 넣을 수 있도록 object 로
+            df[col] = df[col].astype(object) if col in df.columns else ""
+            df.at[hit[0], col] = value
+        self.conn.update(worksheet=self.worksheet, data=df)
+        with self._lock:
+            self._df = df
+            self.sheet_writes += 1
+        annotate(bytes_out=int(df.memory_usage(deep=True).sum()), mode="sheet")
+        return True
+
+    @traced("users.update")
+    def update(self, username, **fields):
+        """사용자 한 명의 지정 열만 수정. 사용자가 없으면 False.
+        잠금은 행 위치를 찾을 때와 캐시를 고칠 때만 잡는다 (시트 기록 중에도 get 은 바로 응답)"""
+        bad = [c for c in fields if c not in WRITABLE_COLUMNS]
+        if bad: raise ValueError(f"수정할 수 없는 항목: {bad}")
+        username = str(username).strip()
+        self._ensure()
+        with self._lock:
+            hit = self._index.get(username)
+            if hit is not None:
+                sheet_row = self._df.index.get_loc(hit[0]) + 2     # 1행은 헤더
+                columns = list(self._df.columns)
+        if hit is not None and self._write_cells(sheet_row, columns, username, fields):
+            annotate(bytes_out=sum(len(str(v).encode('utf-8')) for v in fields.values()), mode="cell")
+        elif not self._write_sheet(username, fields):
+            return False
+        with self._lock:
+            hit = self._index.get(username)
+            if hit is not None: hit[1].update(fields)
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                'users': len(self._index), 'age': time.monotonic() - self._loaded_at if self._loaded_at else None,
+                'reads': self.reads, 'cell_writes': self.cell_writes, 'sheet_writes': self.sheet_writes,
+            }